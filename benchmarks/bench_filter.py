@@ -0,0 +1,192 @@
+"""Benchmarks for the filter and test hot paths.
+
+Run with `pytest benchmarks/bench_filter.py --no-cov`.
+
+Each benchmark validates data with a warm cache, i.e. a compiled validator and
+retrieved schema files, or with a cold cache which is cleared before each call.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pytest
+from jsonschema import Draft202012Validator
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+    from jinja2 import Environment
+    from tests.conftest import HTTPServerFactory
+
+    from benchmarks.conftest import Benchmark
+
+SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "minLength": 1, "maxLength": 64},
+                    "count": {"type": "integer", "minimum": 0},
+                    "tags": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["name"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["items"],
+}
+
+INSTANCES = {
+    size: {
+        "items": [
+            {"name": f"item{i}", "count": i, "tags": ["a", "b"]} for i in range(size)
+        ],
+    }
+    for size in (1, 1000)
+}
+
+REF_CHAIN_DEPTH = 32
+
+# More distinct regular expressions than the `re` module caches.
+PATTERN_COUNT = 1000
+
+PATTERN_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "properties": {
+        f"field{i}": {"type": "string", "pattern": f"^value{i}-[a-z]+$"}
+        for i in range(PATTERN_COUNT)
+    },
+    "patternProperties": {f"^x{i}-": {"type": "string"} for i in range(100)},
+}
+
+PATTERN_INSTANCE = {
+    **{f"field{i}": f"value{i}-abc" for i in range(PATTERN_COUNT)},
+    **{f"x{i}-tag": "tag" for i in range(100)},
+}
+
+
+@pytest.mark.parametrize("cache", ["warm", "cold"])
+@pytest.mark.parametrize("size", list(INSTANCES))
+@pytest.mark.parametrize("source", ["inline", "json", "yaml", "remote"])
+def test_filter(
+    tmp_path: Path,
+    http_server_factory: HTTPServerFactory,
+    benchmark: Benchmark,
+    source: str,
+    size: int,
+    cache: str,
+) -> None:
+    """Benchmark the filter with schemas from different sources."""
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize(SCHEMA, "json"),
+            (tmp_path / "schema.yaml"): serialize(SCHEMA, "yaml"),
+        },
+    )
+    schema: Any = {
+        "inline": SCHEMA,
+        "json": "schema.json",
+        "yaml": "schema.yaml",
+        "remote": f"{http_server_factory(tmp_path)}/schema.json"
+        if source == "remote"
+        else None,
+    }[source]
+    run(benchmark, create_env(tmp_path), INSTANCES[size], schema, cache=cache)
+
+
+@pytest.mark.parametrize("cache", ["warm", "cold"])
+def test_ref_chain(tmp_path: Path, benchmark: Benchmark, cache: str) -> None:
+    """Benchmark the filter with a deep chain of schema files."""
+    build_file_tree(
+        {
+            **{
+                (tmp_path / f"schema{i}.json"): serialize(
+                    {"$ref": f"schema{i + 1}.json"},
+                    "json",
+                )
+                for i in range(REF_CHAIN_DEPTH)
+            },
+            (tmp_path / f"schema{REF_CHAIN_DEPTH}.json"): serialize(SCHEMA, "json"),
+        },
+    )
+    run(benchmark, create_env(tmp_path), INSTANCES[1], "schema0.json", cache=cache)
+
+
+@pytest.mark.parametrize("cache", ["warm", "cold"])
+def test_test(tmp_path: Path, benchmark: Benchmark, cache: str) -> None:
+    """Benchmark the test with a local schema file."""
+    build_file_tree({(tmp_path / "schema.json"): serialize(SCHEMA, "json")})
+    env = create_env(tmp_path)
+    extension = get_extension(env)
+    jsonschema_filter = extension._filter
+    data = INSTANCES[1]
+    assert jsonschema_filter.is_valid(data, "schema.json")
+
+    def validate() -> None:
+        if cache == "cold":
+            extension.clear_cache()
+        jsonschema_filter.is_valid(data, "schema.json")
+
+    benchmark(validate)
+
+
+@pytest.mark.parametrize("implementation", ["extension", "jsonschema"])
+def test_patterns(benchmark: Benchmark, implementation: str) -> None:
+    """Benchmark a schema with many patterns against plain `jsonschema`.
+
+    The extension looks up compiled patterns in its pattern cache, whereas plain
+    `jsonschema` relies on the cache of the `re` module, which the patterns exceed.
+    """
+    if implementation == "jsonschema":
+        validator = Draft202012Validator(PATTERN_SCHEMA)
+        assert validator.is_valid(PATTERN_INSTANCE)
+        benchmark(lambda: validator.is_valid(PATTERN_INSTANCE))
+    else:
+        run(benchmark, create_env(), PATTERN_INSTANCE, PATTERN_SCHEMA, cache="warm")
+
+
+def run(
+    benchmark: Benchmark,
+    env: Environment,
+    data: object,
+    schema: str | Mapping[str, Any],
+    *,
+    cache: str,
+) -> None:
+    """Benchmark the filter.
+
+    Args:
+        benchmark:
+            The timer.
+        env:
+            The Jinja2 environment.
+        data:
+            The data to validate.
+        schema:
+            The schema object or an URI of the schema.
+        cache:
+            Whether to validate with a `"warm"` or `"cold"` cache.
+    """
+    extension = get_extension(env)
+    jsonschema_filter = extension._filter
+    assert jsonschema_filter(data, schema) == ""
+
+    def validate() -> None:
+        if cache == "cold":
+            extension.clear_cache()
+        jsonschema_filter(data, schema)
+
+    benchmark(validate)
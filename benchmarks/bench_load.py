@@ -0,0 +1,93 @@
+"""Benchmark for parsing large schema files.
+
+Run with `python -m benchmarks.bench_load`.
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from argparse import ArgumentParser
+from typing import TYPE_CHECKING
+from typing import Any
+
+import yaml
+
+from jinja2_jsonschema.extension import _JsonSchemaFilter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def make_schema(size: int) -> dict[str, Any]:
+    """Create a large schema document.
+
+    Args:
+        size:
+            The number of object definitions in the schema.
+
+    Returns:
+        The schema document.
+    """
+    return {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "$defs": {
+            f"object{i}": {
+                "type": "object",
+                "description": f"Object number {i}.",
+                "properties": {
+                    "name": {"type": "string", "minLength": 1, "maxLength": 64},
+                    "count": {"type": "integer", "minimum": 0},
+                    "tags": {"type": "array", "items": {"type": "string"}},
+                    "next": {"$ref": f"#/$defs/object{(i + 1) % size}"},
+                },
+                "required": ["name"],
+                "additionalProperties": False,
+            }
+            for i in range(size)
+        },
+        "$ref": "#/$defs/object0",
+    }
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    schema = make_schema(args.size)
+    raw_json = json.dumps(schema, indent=2)
+    raw_yaml = yaml.safe_dump(schema)
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    cases: dict[str, Callable[[], object]] = {
+        "JSON via yaml.SafeLoader (before)": lambda: yaml.load(
+            raw_json,
+            Loader=yaml.SafeLoader,
+        ),
+        f"JSON via {loader.__name__}": lambda: yaml.load(raw_json, Loader=loader),  # noqa: S506
+        "JSON via json.loads": lambda: json.loads(raw_json),
+        "JSON via _load": lambda: _JsonSchemaFilter._load(
+            raw_json,
+            "file:///schema.json",
+        ),
+        "YAML via yaml.SafeLoader (before)": lambda: yaml.load(
+            raw_yaml,
+            Loader=yaml.SafeLoader,
+        ),
+        "YAML via _load": lambda: _JsonSchemaFilter._load(
+            raw_yaml,
+            "file:///schema.yaml",
+        ),
+    }
+
+    print(f"JSON: {len(raw_json):,} bytes, YAML: {len(raw_yaml):,} bytes")
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"{name:<40} {seconds * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Benchmark configuration.
+
+Benchmarks are run with pytest, e.g. `pytest benchmarks/bench_filter.py --no-cov`.
+Results can be saved as a baseline with `--benchmark-save=PATH` and compared
+against a baseline with `--benchmark-compare=PATH`, in which case the run fails if
+any benchmark is slower than the baseline by more than `--benchmark-threshold`.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import timeit
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pytest
+from tests.conftest import http_server_factory  # noqa: F401
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_RESULTS = pytest.StashKey[dict[str, dict[str, float]]]()
+_REPORT = pytest.StashKey[list[str]]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-repeat",
+        type=int,
+        default=5,
+        help="number of timing runs per benchmark (default: 5)",
+    )
+    group.addoption(
+        "--benchmark-save",
+        type=Path,
+        help="save the results as a JSON baseline",
+    )
+    group.addoption(
+        "--benchmark-compare",
+        type=Path,
+        help="compare the results against a JSON baseline",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=0.1,
+        help="maximum relative slowdown against the baseline (default: 0.1)",
+    )
+
+
+class Benchmark:
+    """Timer for a benchmarked function."""
+
+    def __init__(
+        self, results: dict[str, dict[str, float]], name: str, repeat: int
+    ) -> None:
+        self._results = results
+        self._name = name
+        self._repeat = repeat
+
+    def __call__(self, func: Callable[[], object]) -> None:
+        """Time a function and record the result.
+
+        The function is called as often as needed for a timing run to take at least
+        0.2 seconds. The fastest and the median time per call of all timing runs
+        are recorded.
+
+        Args:
+            func:
+                The function to time.
+        """
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        times = [
+            seconds / number
+            for seconds in timer.repeat(repeat=self._repeat, number=number)
+        ]
+        self._results[self._name] = {
+            "min": min(times),
+            "median": statistics.median(times),
+        }
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest) -> Benchmark:
+    """A pytest fixture for timing a function.
+
+    Returns:
+        The timer.
+    """
+    return Benchmark(
+        request.config.stash.setdefault(_RESULTS, {}),
+        request.node.name,
+        request.config.getoption("benchmark_repeat"),
+    )
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Save the results and compare them against the baseline."""
+    config = session.config
+    results = config.stash.get(_RESULTS, {})
+    if not results:
+        return
+
+    save_path: Path | None = config.getoption("benchmark_save", None)
+    if save_path is not None:
+        save_path.write_text(json.dumps(_metadata(results), indent=2) + "\n")
+
+    compare_path: Path | None = config.getoption("benchmark_compare", None)
+    baseline: dict[str, dict[str, float]] = {}
+    if compare_path is not None:
+        baseline = json.loads(compare_path.read_text())["results"]
+    threshold: float = config.getoption("benchmark_threshold", 0.1)
+
+    report = [f"{'benchmark':<48} {'min':>12} {'median':>12} {'baseline':>12}"]
+    regressions = 0
+    for name, result in results.items():
+        line = (
+            f"{name:<48} {_format(result['min']):>12} {_format(result['median']):>12}"
+        )
+        if name in baseline:
+            ratio = result["min"] / baseline[name]["min"]
+            regressed = ratio > 1 + threshold
+            regressions += regressed
+            line += (
+                f" {_format(baseline[name]['min']):>12} {ratio:6.2f}x"
+                f"{'  REGRESSION' if regressed else ''}"
+            )
+        report.append(line)
+    if baseline:
+        report.append(f"{regressions} regression(s) beyond {threshold:.0%}")
+    config.stash[_REPORT] = report
+
+    if regressions and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter,
+    config: pytest.Config,
+) -> None:
+    """Print the results."""
+    report = config.stash.get(_REPORT, [])
+    if report:
+        terminalreporter.section("benchmarks")
+        for line in report:
+            terminalreporter.write_line(line)
+
+
+def _metadata(results: dict[str, dict[str, float]]) -> dict[str, Any]:
+    return {
+        "version": version("jinja2-jsonschema"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def _format(seconds: float) -> str:
+    return f"{seconds * 1e6:,.1f} us"
@@ -0,0 +1,126 @@
+"""Command-line interface."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from jinja2 import Environment
+from jinja2 import FileSystemLoader
+
+from . import bundle
+from .archive import DEFAULT_PATTERNS
+from .archive import build_archive
+from .errors import JsonSchemaExtensionError
+from .extension import JsonSchemaExtension
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command-line interface.
+
+    Args:
+        argv:
+            The command-line arguments without the program name.
+
+    Returns:
+        The exit code.
+    """
+    parser = argparse.ArgumentParser(prog="python -m jinja2_jsonschema")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bundle_parser = subparsers.add_parser(
+        "bundle",
+        help="bundle a schema file with all schema files it references",
+    )
+    bundle_parser.add_argument(
+        "schema",
+        help="the path of the root schema file relative to the root directory or "
+        "its URL",
+    )
+    bundle_parser.add_argument(
+        "-r",
+        "--root",
+        type=Path,
+        default=Path(),
+        help="the root directory of local schema files, i.e. the search path of the "
+        "Jinja2 loader (default: the current directory)",
+    )
+    bundle_parser.add_argument(
+        "-f",
+        "--format",
+        choices=["json", "marshal"],
+        default="json",
+        help='the serialization format, where "marshal" loads faster but only with '
+        "the same Python version (default: json)",
+    )
+    bundle_parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="the output file (default: standard output)",
+    )
+
+    archive_parser = subparsers.add_parser(
+        "archive",
+        help="build a memory-mapped archive of the schema files in a directory",
+    )
+    archive_parser.add_argument(
+        "root",
+        type=Path,
+        help="the root directory of local schema files, i.e. the search path of the "
+        "Jinja2 loader",
+    )
+    archive_parser.add_argument(
+        "-p",
+        "--pattern",
+        action="append",
+        dest="patterns",
+        help="a glob pattern of the schema files to include, which may be given "
+        f"multiple times (default: {', '.join(DEFAULT_PATTERNS)})",
+    )
+    archive_parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        required=True,
+        help="the output file",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "archive":
+        try:
+            count = build_archive(
+                args.root,
+                args.output,
+                args.patterns or DEFAULT_PATTERNS,
+            )
+        except OSError as exc:
+            parser.exit(1, f"error: {exc}\n")
+        sys.stderr.write(f"Archived {count} schema files\n")
+        return 0
+
+    env = Environment(  # noqa: S701
+        loader=FileSystemLoader(args.root),
+        extensions=[JsonSchemaExtension],
+    )
+    extension = env.extensions[JsonSchemaExtension.identifier]
+    assert isinstance(extension, JsonSchemaExtension)  # noqa: S101
+    try:
+        data = bundle.dumps(extension.bundle(args.schema), args.format)
+    except (JsonSchemaExtensionError, OSError, ValueError) as exc:
+        parser.exit(1, f"error: {exc}\n")
+
+    if args.output is None:
+        sys.stdout.buffer.write(data)
+    else:
+        args.output.write_bytes(data)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Memory-mapped archives of schema files.
+
+An archive consists of a header, an index mapping the names of the schema files
+to the offsets and lengths of their contents, and the concatenated contents of the
+schema files. It is memory-mapped when opened, so reading a schema file slices the
+mapped archive without copying it and without any system calls.
+
+Archives are built from a directory via `build_archive()` or
+`python -m jinja2_jsonschema archive`, and used for local schema files via
+`JsonSchemaExtension.configure(schema_archive=...)`.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .errors import InvalidArchiveError
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+__all__ = ["DEFAULT_PATTERNS", "SchemaArchive", "build_archive"]
+
+DEFAULT_PATTERNS = ("*.json", "*.yaml", "*.yml")
+"""The default glob patterns of the schema files included in archives."""
+
+_MAGIC = b"JSSCHEMA"
+_VERSION = 1
+# The magic bytes, the format version and the length of the index.
+_HEADER = struct.Struct("<8sII")
+
+
+def build_archive(
+    directory: str | os.PathLike[str],
+    output: str | os.PathLike[str],
+    patterns: Iterable[str] = DEFAULT_PATTERNS,
+) -> int:
+    """Build an archive of the schema files in a directory, recursively.
+
+    The schema files are named by their POSIX paths relative to the directory, like
+    the templates of a `jinja2.FileSystemLoader` with the directory as its search
+    path.
+
+    Args:
+        directory:
+            The directory of the schema files.
+        output:
+            The path of the archive.
+        patterns:
+            The glob patterns of the schema files to include.
+
+    Returns:
+        The number of schema files in the archive.
+    """
+    root = Path(directory)
+    paths = sorted({path for pattern in patterns for path in root.rglob(pattern)})
+    index: dict[str, tuple[int, int]] = {}
+    contents: list[bytes] = []
+    offset = 0
+    for path in paths:
+        if not path.is_file():
+            continue
+        data = path.read_bytes()
+        index[path.relative_to(root).as_posix()] = (offset, len(data))
+        contents.append(data)
+        offset += len(data)
+
+    encoded_index = json.dumps(index, separators=(",", ":")).encode()
+    with Path(output).open("wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(encoded_index)))
+        f.write(encoded_index)
+        f.writelines(contents)
+    return len(index)
+
+
+class SchemaArchive:
+    """Memory-mapped archive of schema files.
+
+    The archive is mapped until it is closed. It is safe to read from many threads.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open an archive.
+
+        Args:
+            path:
+                The path of the archive.
+
+        Raises:
+            InvalidArchiveError:
+                The file is not a valid archive.
+        """
+        with Path(path).open("rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                msg = "empty file"
+                raise InvalidArchiveError(msg) from None
+        try:
+            self._index, self._start = self._read_index()
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def _read_index(self) -> tuple[dict[str, tuple[int, int]], int]:
+        if len(self._mmap) < _HEADER.size:
+            msg = "truncated header"
+            raise InvalidArchiveError(msg)
+        magic, version, index_length = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC:
+            msg = "not a schema archive"
+            raise InvalidArchiveError(msg)
+        if version != _VERSION:
+            msg = f"unsupported version {version}"
+            raise InvalidArchiveError(msg)
+        start = _HEADER.size + index_length
+        try:
+            index = json.loads(self._mmap[_HEADER.size : start])
+        except ValueError:
+            msg = "invalid index"
+            raise InvalidArchiveError(msg) from None
+        size = len(self._mmap) - start
+        if not isinstance(index, dict) or not all(
+            isinstance(entry, list)
+            and len(entry) == 2  # noqa: PLR2004
+            and all(isinstance(value, int) and value >= 0 for value in entry)
+            and entry[0] + entry[1] <= size
+            for entry in index.values()
+        ):
+            msg = "invalid index"
+            raise InvalidArchiveError(msg)
+        return {
+            name: (offset, length) for name, (offset, length) in index.items()
+        }, start
+
+    def read(self, name: str) -> memoryview | None:
+        """Read a schema file without copying it.
+
+        The returned view must be released before the archive is closed.
+
+        Args:
+            name:
+                The name of the schema file, i.e. its path relative to the
+                directory the archive was built from.
+
+        Returns:
+            A view of the contents of the schema file, or `None` if the archive
+            does not contain it.
+        """
+        entry = self._index.get(name)
+        if entry is None:
+            return None
+        offset, length = entry
+        offset += self._start
+        with memoryview(self._mmap) as view:
+            return view[offset : offset + length]
+
+    def __contains__(self, name: object) -> bool:
+        """Check whether the archive contains a schema file."""
+        return name in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of the schema files."""
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        """Return the number of schema files."""
+        return len(self._index)
+
+    def close(self) -> None:
+        """Unmap the archive."""
+        self._mmap.close()
@@ -0,0 +1,141 @@
+"""Bundling of schema files into a single self-contained schema document.
+
+A bundle is a JSON Schema document (draft 2020-12) which embeds the root schema
+file and all schema files it references, transitively, under `$defs` keyed by their
+URIs. Each embedded schema document is identified by its URI via `$id`, so that the
+bundle is a valid compound schema document, and the bundle refers to the root
+schema file via `$ref`.
+
+Bundles are serialized either as JSON or in a `marshal`-based form which loads
+faster but can only be read by the Python version which wrote it.
+"""
+
+from __future__ import annotations
+
+import json
+import marshal
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Literal
+
+from .cache import thaw
+from .errors import InvalidBundleError
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+__all__ = ["BundleFormat", "create", "dumps", "loads", "split"]
+
+BundleFormat = Literal["json", "marshal"]
+
+_DIALECT = "https://json-schema.org/draft/2020-12/schema"
+_MARSHAL_MAGIC = b"JSONSCHEMA-BUNDLE-MARSHAL"
+
+
+def create(root: str, documents: Mapping[str, Any]) -> dict[str, Any]:
+    """Create a bundle.
+
+    Args:
+        root:
+            The URI of the root schema file.
+        documents:
+            A mapping from URIs to schema documents, including the root schema file.
+
+    Returns:
+        The bundled schema document.
+    """
+    return {
+        "$schema": _DIALECT,
+        "$ref": root,
+        "$defs": {uri: _embed(uri, contents) for uri, contents in documents.items()},
+    }
+
+
+def split(bundle: Mapping[str, Any]) -> tuple[str, dict[str, Any]]:
+    """Split a bundle into the URI of its root schema file and its schema documents.
+
+    Args:
+        bundle:
+            The bundled schema document.
+
+    Returns:
+        A pair of the URI of the root schema file and a mapping from URIs to schema
+        documents.
+
+    Raises:
+        InvalidBundleError:
+            The document is not a bundle.
+    """
+    root = bundle.get("$ref")
+    documents = bundle.get("$defs")
+    if not isinstance(root, str) or not isinstance(documents, dict):
+        msg = 'missing "$ref" or "$defs"'
+        raise InvalidBundleError(msg)
+    if root not in documents:
+        msg = f'root schema file "{root}" not embedded'
+        raise InvalidBundleError(msg)
+    return root, dict(documents)
+
+
+def dumps(bundle: Mapping[str, Any], bundle_format: BundleFormat = "json") -> bytes:
+    """Serialize a bundle.
+
+    Args:
+        bundle:
+            The bundled schema document.
+        bundle_format:
+            The serialization format.
+
+    Returns:
+        The serialized bundle.
+    """
+    if bundle_format == "marshal":
+        # `marshal` only supports plain objects and arrays, not frozen ones.
+        return (
+            _MARSHAL_MAGIC
+            + bytes([marshal.version])
+            + marshal.dumps(thaw(bundle), marshal.version)
+        )
+    return f"{json.dumps(bundle, ensure_ascii=False, indent=2)}\n".encode()
+
+
+def loads(data: bytes) -> dict[str, Any]:
+    """Deserialize a bundle.
+
+    The serialization format is detected automatically.
+
+    Args:
+        data:
+            The serialized bundle.
+
+    Returns:
+        The bundled schema document.
+
+    Raises:
+        InvalidBundleError:
+            The data is not a serialized bundle.
+    """
+    if data.startswith(_MARSHAL_MAGIC):
+        version = data[len(_MARSHAL_MAGIC) : len(_MARSHAL_MAGIC) + 1]
+        if version != bytes([marshal.version]):
+            msg = "marshal format version mismatch, rebuild the bundle"
+            raise InvalidBundleError(msg)
+        try:
+            bundle = marshal.loads(data[len(_MARSHAL_MAGIC) + 1 :])  # noqa: S302
+        except (EOFError, ValueError, TypeError) as exc:
+            raise InvalidBundleError(str(exc)) from exc
+    else:
+        try:
+            bundle = json.loads(data)
+        except ValueError as exc:
+            raise InvalidBundleError(str(exc)) from exc
+    if not isinstance(bundle, dict):
+        msg = "not a schema document"
+        raise InvalidBundleError(msg)
+    return bundle
+
+
+def _embed(uri: str, contents: Any) -> Any:  # noqa: ANN401
+    if isinstance(contents, dict) and "$id" not in contents and "id" not in contents:
+        return {"$id": uri, **contents}
+    return contents
@@ -0,0 +1,624 @@
+"""Caching utilities."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Generic
+from typing import NoReturn
+from typing import TypeVar
+from typing import overload
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable
+
+__all__ = [
+    "CachedResponse",
+    "FrozenDict",
+    "FrozenList",
+    "HTTPCache",
+    "LRUCache",
+    "ParsedSchemaCache",
+    "PatternCache",
+    "freeze",
+    "thaw",
+]
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+_T = TypeVar("_T")
+
+
+class LRUCache(Generic[_K, _V]):
+    """Thread-safe mapping-like cache which evicts the least recently used entries."""
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 0:
+            msg = "maxsize must not be negative"
+            raise ValueError(msg)
+        self._maxsize = maxsize
+        self._data: OrderedDict[_K, _V] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def maxsize(self) -> int:
+        """The maximum number of entries kept in the cache."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int) -> None:
+        if value < 0:
+            msg = "maxsize must not be negative"
+            raise ValueError(msg)
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether a key is cached without marking it as used."""
+        with self._lock:
+            return key in self._data
+
+    @overload
+    def get(self, key: _K) -> _V | None: ...
+
+    @overload
+    def get(self, key: _K, default: _T) -> _V | _T: ...
+
+    def get(self, key: _K, default: object = None) -> object:
+        """Get an entry and mark it as most recently used.
+
+        Args:
+            key:
+                The cache key.
+            default:
+                The value to return if the key is not cached.
+
+        Returns:
+            The cached value or the default value.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: _K, value: _V) -> None:
+        """Add or replace an entry and mark it as most recently used.
+
+        Args:
+            key:
+                The cache key.
+            value:
+                The value to cache.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def pop(self, key: _K) -> _V | None:
+        """Remove an entry.
+
+        Args:
+            key:
+                The cache key.
+
+        Returns:
+            The removed value or `None` if the key was not cached.
+        """
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self) -> None:
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+
+class PatternCache:
+    """Thread-safe cache of compiled regular expressions of schemas.
+
+    Unlike the cache of the `re` module, it can be sized for schemas with many
+    `pattern` and `patternProperties` keywords. Looking up a cached pattern takes
+    no lock. When the maximum size is exceeded, the least recently compiled
+    patterns are evicted.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """Create a new pattern cache.
+
+        Args:
+            maxsize:
+                The maximum number of compiled patterns to keep in the cache.
+
+        Raises:
+            ValueError:
+                The maximum size is negative.
+        """
+        if maxsize < 0:
+            msg = "maxsize must not be negative"
+            raise ValueError(msg)
+        self._maxsize = maxsize
+        self._data: dict[str, re.Pattern[str]] = {}
+        self._lock = Lock()
+
+    @property
+    def maxsize(self) -> int:
+        """The maximum number of compiled patterns to keep in the cache."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int) -> None:
+        if value < 0:
+            msg = "maxsize must not be negative"
+            raise ValueError(msg)
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def __len__(self) -> int:
+        """Return the number of cached patterns."""
+        return len(self._data)
+
+    def __contains__(self, pattern: object) -> bool:
+        """Return whether a pattern is cached."""
+        return pattern in self._data
+
+    def compile(self, pattern: str) -> re.Pattern[str]:
+        """Get a compiled pattern or compile and cache it.
+
+        Args:
+            pattern:
+                The regular expression.
+
+        Returns:
+            The compiled regular expression.
+        """
+        compiled = self._data.get(pattern)
+        if compiled is None:
+            compiled = re.compile(pattern)
+            with self._lock:
+                self._data[pattern] = compiled
+                self._evict()
+        return compiled
+
+    def clear(self) -> None:
+        """Remove all compiled patterns."""
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self) -> None:
+        while len(self._data) > self._maxsize:
+            del self._data[next(iter(self._data))]
+
+
+def _immutable(self: object, *_args: object, **_kwargs: object) -> NoReturn:
+    msg = f"{type(self).__name__} is immutable"
+    raise TypeError(msg)
+
+
+class FrozenDict(dict[str, Any]):
+    """Immutable `dict` of a parsed schema document.
+
+    It is a `dict` subclass, unlike `types.MappingProxyType`, because `jsonschema`
+    compares `enum` and `const` values by their type.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self) -> tuple[type[FrozenDict], tuple[dict[str, Any]]]:
+        """Support pickling and copying, which would add items one by one."""
+        return (type(self), (dict(self),))
+
+
+class FrozenList(list[Any]):
+    """Immutable `list` of a parsed schema document."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = clear = extend = insert = pop = remove = reverse = sort = _immutable
+
+    def __reduce__(self) -> tuple[type[FrozenList], tuple[list[Any]]]:
+        """Support pickling and copying, which would add items one by one."""
+        return (type(self), (list(self),))
+
+
+def freeze(value: object) -> Any:  # noqa: ANN401
+    """Recursively convert the objects and arrays of a JSON value to immutable ones.
+
+    Args:
+        value:
+            The JSON value.
+
+    Returns:
+        The JSON value with `FrozenDict` objects and `FrozenList` arrays.
+    """
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList([freeze(item) for item in value])
+    return value
+
+
+def thaw(value: object) -> Any:  # noqa: ANN401
+    """Recursively convert the objects and arrays of a JSON value to plain ones.
+
+    Args:
+        value:
+            The JSON value.
+
+    Returns:
+        The JSON value with plain `dict` objects and `list` arrays.
+    """
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+class ParsedSchemaCache:
+    """Thread-safe cache of parsed schema documents keyed by their source text.
+
+    An instance can be shared by many Jinja2 environments, so that schema files
+    with the same contents are parsed once and stored once per process. The parsed
+    documents are frozen, so sharing them is safe. When the total size of the
+    source texts of the cached documents exceeds the maximum size, the least
+    recently used ones are evicted.
+    """
+
+    def __init__(self, max_size: int = 64 * 1024 * 1024) -> None:
+        """Create a new parsed schema cache.
+
+        Args:
+            max_size:
+                The maximum total size of the source texts of the cached documents
+                in characters, which approximates their memory footprint.
+
+        Raises:
+            ValueError:
+                The maximum size is negative.
+        """
+        if max_size < 0:
+            msg = "max_size must not be negative"
+            raise ValueError(msg)
+        self._max_size = max_size
+        self._size = 0
+        self._data: OrderedDict[bytes, tuple[Any, int]] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def max_size(self) -> int:
+        """The maximum total size of the source texts of the cached documents."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value: int) -> None:
+        if value < 0:
+            msg = "max_size must not be negative"
+            raise ValueError(msg)
+        with self._lock:
+            self._max_size = value
+            self._evict()
+
+    @property
+    def size(self) -> int:
+        """The total size of the source texts of the cached documents."""
+        with self._lock:
+            return self._size
+
+    def __len__(self) -> int:
+        """Return the number of cached documents."""
+        with self._lock:
+            return len(self._data)
+
+    def get_or_parse(
+        self,
+        source: str,
+        parse: Callable[[str], object],
+        *,
+        namespace: str = "",
+    ) -> Any:  # noqa: ANN401
+        """Get a cached document or parse, freeze and cache it.
+
+        Args:
+            source:
+                The source text of the document.
+            parse:
+                The function for parsing the source text.
+            namespace:
+                A namespace for the cache key, e.g. the format of the document,
+                because the same source text may be parsed differently.
+
+        Returns:
+            The frozen parsed document.
+        """
+        key = hashlib.sha256(f"{namespace}\0{source}".encode()).digest()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                return entry[0]
+
+        document = freeze(parse(source))
+        with self._lock:
+            # Another thread may have cached the same document in the meantime.
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                return entry[0]
+            if len(source) <= self._max_size:
+                self._data[key] = (document, len(source))
+                self._size += len(source)
+                self._evict()
+        return document
+
+    def clear(self) -> None:
+        """Remove all cached documents."""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def _evict(self) -> None:
+        while self._size > self._max_size:
+            _, (_, size) = self._data.popitem(last=False)
+            self._size -= size
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """HTTP response body stored in an `HTTPCache` along with its validators."""
+
+    body: bytes
+    """The raw response body."""
+
+    etag: str | None
+    """The value of the `ETag` response header."""
+
+    last_modified: str | None
+    """The value of the `Last-Modified` response header."""
+
+    content_type: str | None
+    """The value of the `Content-Type` response header."""
+
+    stored_at: float
+    """The time when the response was stored or last revalidated."""
+
+    @property
+    def revalidation_headers(self) -> dict[str, str]:
+        """Request headers for revalidating the response conditionally."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """On-disk cache for remote schema files.
+
+    Cached responses are served without a request while they are fresher than the
+    TTL. Afterwards, they are revalidated with a conditional request using their
+    `ETag` and `Last-Modified` validators. When the total size of the cached
+    responses exceeds the maximum size, the least recently used ones are evicted.
+    """
+
+    _METADATA_SUFFIX = ".json"
+    _BODY_SUFFIX = ".body"
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        ttl: float = 3600,
+        max_size: int = 100 * 1024 * 1024,
+        offline: bool = False,
+    ) -> None:
+        """Create a new HTTP cache.
+
+        Args:
+            directory:
+                The cache directory which is created if it does not exist.
+            ttl:
+                The number of seconds for which a cached response is served without
+                revalidation.
+            max_size:
+                The maximum total size of the cached response bodies in bytes.
+            offline:
+                Whether to serve responses only from the cache, regardless of their
+                age, and never make a request.
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.offline = offline
+
+    def get(self, uri: str) -> CachedResponse | None:
+        """Get a cached response and mark it as most recently used.
+
+        Args:
+            uri:
+                The URI of the response.
+
+        Returns:
+            The cached response or `None` if the URI is not cached.
+        """
+        metadata_path, body_path = self._paths(uri)
+        try:
+            metadata = json.loads(metadata_path.read_text("utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if metadata.get("uri") != uri:
+            return None
+        body_path.touch()
+        return CachedResponse(
+            body=body,
+            etag=metadata["etag"],
+            last_modified=metadata["last_modified"],
+            content_type=metadata["content_type"],
+            stored_at=metadata["stored_at"],
+        )
+
+    def put(
+        self,
+        uri: str,
+        body: bytes,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        content_type: str | None = None,
+    ) -> CachedResponse:
+        """Store a response.
+
+        Args:
+            uri:
+                The URI of the response.
+            body:
+                The raw response body.
+            etag:
+                The value of the `ETag` response header.
+            last_modified:
+                The value of the `Last-Modified` response header.
+            content_type:
+                The value of the `Content-Type` response header.
+
+        Returns:
+            The cached response.
+        """
+        response = CachedResponse(
+            body=body,
+            etag=etag,
+            last_modified=last_modified,
+            content_type=content_type,
+            stored_at=time.time(),
+        )
+        metadata_path, body_path = self._paths(uri)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write(body_path, body)
+        self._write_metadata(metadata_path, uri, response)
+        self._evict()
+        return response
+
+    def refresh(self, uri: str, cached: CachedResponse) -> CachedResponse:
+        """Mark a cached response as fresh after a successful revalidation.
+
+        Args:
+            uri:
+                The URI of the response.
+            cached:
+                The revalidated response.
+
+        Returns:
+            The refreshed response.
+        """
+        response = CachedResponse(
+            body=cached.body,
+            etag=cached.etag,
+            last_modified=cached.last_modified,
+            content_type=cached.content_type,
+            stored_at=time.time(),
+        )
+        metadata_path, _ = self._paths(uri)
+        self._write_metadata(metadata_path, uri, response)
+        return response
+
+    def is_fresh(self, cached: CachedResponse) -> bool:
+        """Check whether a cached response can be served without revalidation.
+
+        Args:
+            cached:
+                The cached response.
+
+        Returns:
+            Whether the cached response is fresh.
+        """
+        return time.time() - cached.stored_at < self.ttl
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        for path in self._files():
+            path.unlink(missing_ok=True)
+
+    def _paths(self, uri: str) -> tuple[Path, Path]:
+        name = hashlib.sha256(uri.encode()).hexdigest()
+        return (
+            self.directory / f"{name}{self._METADATA_SUFFIX}",
+            self.directory / f"{name}{self._BODY_SUFFIX}",
+        )
+
+    def _files(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        return [
+            path
+            for path in self.directory.iterdir()
+            if path.suffix in (self._METADATA_SUFFIX, self._BODY_SUFFIX)
+        ]
+
+    def _write_metadata(
+        self,
+        path: Path,
+        uri: str,
+        response: CachedResponse,
+    ) -> None:
+        metadata = {
+            "uri": uri,
+            "etag": response.etag,
+            "last_modified": response.last_modified,
+            "content_type": response.content_type,
+            "stored_at": response.stored_at,
+        }
+        self._write(path, json.dumps(metadata).encode())
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        with NamedTemporaryFile(dir=path.parent, delete=False) as f:
+            f.write(data)
+        Path(f.name).replace(path)
+
+    def _evict(self) -> None:
+        bodies = []
+        for path in self._files():
+            if path.suffix != self._BODY_SUFFIX:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            bodies.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(body_size for _, body_size, _ in bodies)
+        for _, body_size, path in sorted(bodies):
+            if size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            path.with_suffix(self._METADATA_SUFFIX).unlink(missing_ok=True)
+            size -= body_size
@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 __all__ = [
+    "InvalidArchiveError",
+    "InvalidBundleError",
+    "InvalidStreamError",
     "JsonSchemaExtensionError",
     "LoaderNotFoundError",
     "SchemaFileNotFoundError",
+    "SchemaNotCachedError",
 ]
 
 
@@ -25,3 +29,32 @@ class SchemaFileNotFoundError(JsonSchemaExtensionError, FileNotFoundError):
 
     def __init__(self, schema_file: str) -> None:
         super().__init__(f'Schema file "{schema_file}" not found')
+
+
+class SchemaNotCachedError(JsonSchemaExtensionError):
+    """Remote JSON Schema file is not cached in offline mode."""
+
+    def __init__(self, schema_file: str) -> None:
+        super().__init__(f'Schema file "{schema_file}" not cached in offline mode')
+
+
+class InvalidBundleError(JsonSchemaExtensionError, ValueError):
+    """Schema bundle is invalid."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"Invalid schema bundle: {reason}")
+
+
+class InvalidArchiveError(JsonSchemaExtensionError, ValueError):
+    """Schema archive is invalid."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"Invalid schema archive: {reason}")
+
+
+class InvalidStreamError(JsonSchemaExtensionError, ValueError):
+    """Streamed JSON document is invalid."""
+
+    def __init__(self, reason: str, position: int) -> None:
+        super().__init__(f"Invalid JSON document: {reason} at position {position}")
+        self.position = position
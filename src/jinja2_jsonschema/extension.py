@@ -2,38 +2,124 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import os
+import pickle
+from collections import deque
+from collections.abc import Iterable
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from contextlib import contextmanager
+from email.message import Message
+from fnmatch import fnmatchcase
+from functools import cache
+from functools import partial
+from functools import wraps
 from http import HTTPStatus
+from http.client import responses
+from pathlib import Path
+from pathlib import PurePosixPath
+from threading import Lock
+from time import perf_counter
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Literal
+from typing import ParamSpec
+from typing import TypeVar
+from typing import cast
 from urllib.error import HTTPError
+from urllib.parse import urldefrag
+from urllib.parse import urljoin
 from urllib.parse import urlparse
-from urllib.request import urlopen
+from urllib.parse import uses_netloc
+from urllib.parse import uses_relative
+from uuid import uuid4
 from warnings import warn
 
+import attrs
 import jsonschema
 from jinja2 import TemplateNotFound
 from jinja2.ext import Extension
+from jinja2.lexer import TOKEN_BLOCK_END
+from jinja2.lexer import TOKEN_COMMA
+from jinja2.lexer import TOKEN_LPAREN
+from jinja2.lexer import TOKEN_NAME
+from jinja2.lexer import TOKEN_PIPE
+from jinja2.lexer import TOKEN_RBRACKET
+from jinja2.lexer import TOKEN_RPAREN
+from jinja2.lexer import TOKEN_STRING
+from jinja2.lexer import TOKEN_VARIABLE_END
+from jsonschema_specifications import (  # type: ignore[import-untyped]
+    REGISTRY as SPECIFICATIONS,
+)
 from referencing import Registry
 from referencing import Resource
 from referencing import Specification
 from referencing.exceptions import Unresolvable
+from referencing.jsonschema import specification_with
 
+from . import bundle
+from . import stream
+from .cache import LRUCache
+from .cache import PatternCache
 from .errors import JsonSchemaExtensionError
 from .errors import LoaderNotFoundError
 from .errors import SchemaFileNotFoundError
+from .errors import SchemaNotCachedError
+from .observer import CacheEvent
+from .observer import PhaseEvent
+from .preload import PreloadedSchema
+from .preload import PreloadReport
+from .result import CompactError
+from .transport import PooledTransport
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Awaitable
+    from collections.abc import Callable
+    from collections.abc import Iterator
+    from concurrent.futures import Executor
 
     from jinja2 import Environment
+    from jinja2.lexer import Token
+    from jinja2.lexer import TokenStream
+    from jsonschema import TypeChecker
+    from jsonschema.protocols import Validator
+
+    from .archive import SchemaArchive
+    from .cache import HTTPCache
+    from .cache import ParsedSchemaCache
+    from .observer import Cache
+    from .observer import Observer
+    from .observer import Phase
+    from .result import ErrorFormat
+    from .sources import SchemaSource
+    from .transport import Response
+    from .transport import Transport
 
 __all__ = ["JsonSchemaExtension"]
 
+# Tokens which may follow the argument of a test without parentheses.
+_EXPRESSION_END = frozenset(
+    {TOKEN_VARIABLE_END, TOKEN_BLOCK_END, TOKEN_RPAREN, TOKEN_COMMA, TOKEN_RBRACKET},
+)
+_KEYWORD_END = ("name:and", "name:or", "name:if", "name:else")
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
 
 if TYPE_CHECKING:
     _Schema = Mapping[str, Any]
+    _Result = jsonschema.ValidationError | CompactError | Literal[""]
+    _Mode = Literal["best", "first"]
+    _CheckSchema = Literal["once", "always", "never"]
+    # The local schema files a validator depends on and their retrieved resources.
+    _Dependencies = tuple[tuple[str, Resource[Any]], ...]
 
 
 class JsonSchemaExtension(Extension):
@@ -42,41 +128,613 @@ class JsonSchemaExtension(Extension):
     def __init__(self, environment: Environment) -> None:
         super().__init__(environment)
 
-        jsonschema_filter = _JsonSchemaFilter(environment)
+        jsonschema_filter = self._filter = _JsonSchemaFilter(environment)
+        async_filter = _AsyncJsonSchemaFilter(jsonschema_filter)
 
-        if "jsonschema" in environment.filters:
-            warn(
-                'A filter named "jsonschema" already exists in the Jinja2 environment',
-                category=RuntimeWarning,
-                stacklevel=2,
-            )
-        else:
-            environment.filters["jsonschema"] = jsonschema_filter
+        # Async mode is enabled only after the extensions have been loaded.
+        self._filters: dict[str, Callable[..., Any]] = {
+            "jsonschema": _dispatch(environment, jsonschema_filter, async_filter),
+            "jsonschema_all": _dispatch(
+                environment,
+                jsonschema_filter.validate_all,
+                async_filter.validate_all,
+            ),
+            "jsonschema_stream": _dispatch(
+                environment,
+                jsonschema_filter.validate_stream,
+                async_filter.validate_stream,
+            ),
+            "jsonschema_errors": _dispatch(
+                environment,
+                jsonschema_filter.collect_errors,
+                async_filter.collect_errors,
+            ),
+        }
+        self._tests: dict[str, Callable[..., Any]] = {
+            "jsonschema": _dispatch(
+                environment,
+                jsonschema_filter.is_valid,
+                async_filter.is_valid,
+            ),
+        }
+        for name, func in self._filters.items():
+            _register(environment.filters, "filter", name, func)
+        for name, func in self._tests.items():
+            _register(environment.tests, "test", name, func)
 
-        def jsonschema_test(data: Any, schema: str | _Schema) -> bool:  # noqa: ANN401
-            return not jsonschema_filter(data, schema)
+    def filter_stream(self, stream: TokenStream) -> Iterable[Token]:
+        """Precompile schemas given as string literals when a template is compiled.
 
-        if "jsonschema" in environment.tests:
-            warn(
-                'A test named "jsonschema" already exists in the Jinja2 environment',
-                category=RuntimeWarning,
-                stacklevel=2,
-            )
+        Schema files passed as string literals to the filters and the test, e.g.
+        `{{ data | jsonschema('schema.json') }}`, are resolved and compiled along
+        with the template, so that rendering it needs no schema setup. Errors are
+        ignored as they are raised when the template is rendered.
+
+        Args:
+            stream:
+                The token stream of the template.
+
+        Returns:
+            The unchanged token stream.
+        """
+        if not self._filter.precompile_literals:
+            return stream
+        return self._precompile_literals(stream)
+
+    def _precompile_literals(self, stream: TokenStream) -> Iterator[Token]:
+        window: deque[Token] = deque(maxlen=6)
+        for token in stream:
+            window.append(token)
+            schema = self._literal_schema(list(window))
+            if schema is not None:
+                self._filter.precompile(schema)
+            yield token
+
+    def _literal_schema(self, tokens: list[Token]) -> str | None:
+        """Get the schema literal of a filter or test call ending with the tokens."""
+        if len(tokens) < 3 or tokens[-2].type != TOKEN_STRING:  # noqa: PLR2004
+            return None
+        *head, literal, end = tokens
+        call = head[-1].type == TOKEN_LPAREN
+        if call:
+            head.pop()
+            complete = end.type in (TOKEN_RPAREN, TOKEN_COMMA)
         else:
-            environment.tests["jsonschema"] = jsonschema_test
+            complete = end.type in _EXPRESSION_END or end.test_any(*_KEYWORD_END)
+        if complete and self._is_own_call(head, call=call):
+            return str(literal.value)
+        return None
+
+    def _is_own_call(self, head: list[Token], *, call: bool) -> bool:
+        """Check whether the tokens end with a filter or test of this extension."""
+        if not head or head[-1].type != TOKEN_NAME:
+            return False
+        name = head[-1].value
+        before = head[:-1]
+        if call and before and before[-1].type == TOKEN_PIPE:
+            func = self._filters.get(name)
+            return func is not None and self.environment.filters.get(name) is func
+        if before and (
+            before[-1].test("name:is")
+            or (
+                len(before) > 1
+                and before[-1].test("name:not")
+                and before[-2].test("name:is")
+            )
+        ):
+            func = self._tests.get(name)
+            return func is not None and self.environment.tests.get(name) is func
+        return False
+
+    def configure(  # noqa: C901, PLR0912, PLR0913
+        self,
+        *,
+        cache_size: int | None = None,
+        http_cache: HTTPCache | None = None,
+        transport: Transport | None = None,
+        prefetch_concurrency: int | None = None,
+        check_schema: _CheckSchema | None = None,
+        validate_in_executor: bool | None = None,
+        precompile_literals: bool | None = None,
+        observer: Observer | None = None,
+        parsed_schema_cache: ParsedSchemaCache | None = None,
+        process_pool: Executor | None = None,
+        offload_threshold: int | None = None,
+        format_checker: jsonschema.FormatChecker | None = None,
+        pattern_cache: PatternCache | None = None,
+        error_format: ErrorFormat | None = None,
+        error_max_length: int | None = None,
+        schema_archive: SchemaArchive | None = None,
+    ) -> None:
+        """Configure the extension.
+
+        Args:
+            cache_size:
+                The maximum number of compiled validators to keep in the cache.
+            http_cache:
+                An on-disk cache for remote schema files.
+            transport:
+                The HTTP transport for retrieving remote schema files, which
+                defaults to a `PooledTransport` keeping persistent connections.
+            prefetch_concurrency:
+                The maximum number of schema files to retrieve concurrently when
+                retrieving all schema files referenced by a schema before compiling
+                it, or `0` to retrieve them one at a time (default).
+            check_schema:
+                When to check schemas against their meta-schema: `"once"` per
+                inline schema or per schema file until it changes (default),
+                `"always"` before every validation, or `"never"` for trusted
+                schemas. For schema URIs, the schema file is checked against the
+                meta-schema of its own dialect, but the schema files it references
+                are not checked.
+            validate_in_executor:
+                Whether to compile schemas and validate data in the default executor
+                of the event loop instead of on the event loop itself when the
+                Jinja2 environment has async mode enabled, e.g. for CPU-heavy
+                schemas.
+            precompile_literals:
+                Whether to resolve and compile schemas given as string literals
+                when a template is compiled instead of when it is rendered
+                (default). Compiling templates then retrieves remote schema files.
+            observer:
+                An observer which is notified about the phases of schema resolution
+                and validation and about cache lookups, e.g. a
+                `jinja2_jsonschema.observer.StatsCollector`.
+            parsed_schema_cache:
+                A cache of parsed schema files keyed by their contents, which can be
+                shared by many Jinja2 environments in a process so that the same
+                schema file is parsed and stored only once.
+            process_pool:
+                A `concurrent.futures.ProcessPoolExecutor` for validating large data
+                in worker processes, which keep compiled validators, so that
+                CPU-heavy validations do not block other rendering threads.
+            offload_threshold:
+                The number of JSON values, i.e. objects, arrays and scalars, which
+                data must exceed to be validated in the process pool (default:
+                10000).
+            format_checker:
+                A format checker for validating the `format` keyword, e.g.
+                `jsonschema.FormatChecker()` or the `FORMAT_CHECKER` of a validator
+                class. By default, formats are not validated.
+            pattern_cache:
+                A cache of the compiled regular expressions of the `pattern` and
+                `patternProperties` keywords, which can be shared by many Jinja2
+                environments. By default, each Jinja2 environment has its own.
+            error_format:
+                How the filters return validation errors: as
+                `jsonschema.ValidationError` objects (`"full"`, default), which
+                render with the whole invalid data and schema, or as
+                `jinja2_jsonschema.result.CompactError` objects (`"compact"`), which
+                render as a short, truncated message with the error locations.
+            error_max_length:
+                The maximum length of rendered compact errors (default: 1000).
+            schema_archive:
+                A memory-mapped archive of local schema files, which are read from
+                the archive instead of via the Jinja2 loader. Schema files which
+                the archive does not contain are still read via the loader.
+
+        Raises:
+            ValueError:
+                An invalid option value was given.
+        """
+        if cache_size is not None:
+            self._filter.cache_size = cache_size
+        if http_cache is not None:
+            self._filter.http_cache = http_cache
+        if transport is not None:
+            self._filter.transport = transport
+        if prefetch_concurrency is not None:
+            self._filter.prefetch_concurrency = prefetch_concurrency
+        if check_schema is not None:
+            if check_schema not in ("once", "always", "never"):
+                msg = (
+                    f'Invalid check_schema "{check_schema}", '
+                    'expected "once", "always" or "never"'
+                )
+                raise ValueError(msg)
+            self._filter.check_schema = check_schema
+        if validate_in_executor is not None:
+            self._filter.validate_in_executor = validate_in_executor
+        if precompile_literals is not None:
+            self._filter.precompile_literals = precompile_literals
+        if observer is not None:
+            self._filter.observer = observer
+        if parsed_schema_cache is not None:
+            self._filter.parsed_schema_cache = parsed_schema_cache
+        if process_pool is not None:
+            self._filter.process_pool = process_pool
+        if offload_threshold is not None:
+            self._filter.offload_threshold = offload_threshold
+        if format_checker is not None:
+            self._filter.format_checker = format_checker
+        if pattern_cache is not None:
+            self._filter.pattern_cache = pattern_cache
+        if error_format is not None:
+            if error_format not in ("full", "compact"):
+                msg = (
+                    f'Invalid error_format "{error_format}", '
+                    'expected "full" or "compact"'
+                )
+                raise ValueError(msg)
+            self._filter.error_format = error_format
+        if error_max_length is not None:
+            self._filter.error_max_length = error_max_length
+        if schema_archive is not None:
+            self._filter.schema_archive = schema_archive
+
+    def clear_cache(self) -> None:
+        """Clear all caches of the extension.
+
+        Seeded schemas are retained.
+        """
+        self._filter.clear_cache()
+
+    def validate_all(
+        self,
+        data: Iterable[Any],
+        schema: str | _Schema,
+        *,
+        lazy: bool = False,
+        fail_fast: bool = False,
+        mode: _Mode = "best",
+    ) -> list[_Result] | Iterator[_Result]:
+        """Validate many data items against one JSON Schema document.
+
+        The schema is resolved and compiled only once for all items.
+
+        Args:
+            data:
+                The data items to validate.
+            schema:
+                The schema object or an URI of the schema.
+            lazy:
+                Whether to return an iterator instead of a list of results.
+            fail_fast:
+                Whether to stop after the first item which fails validation.
+            mode:
+                Which error to report per item, see the `mode` argument of the
+                `jsonschema` filter.
+
+        Returns:
+            For each data item, an empty string if the validation was successful, or
+            an error object if the validation failed.
+        """
+        return self._filter.validate_all(
+            data,
+            schema,
+            lazy=lazy,
+            fail_fast=fail_fast,
+            mode=mode,
+        )
+
+    def validate_stream(
+        self,
+        source: Any,  # noqa: ANN401
+        schema: str | _Schema,
+        mode: _Mode = "best",
+    ) -> _Result:
+        """Validate the items of a large JSON array or object incrementally.
+
+        See the `jsonschema_stream` filter.
+
+        Args:
+            source:
+                A text or binary file object or an `os.PathLike` path, e.g. a
+                `pathlib.Path`, of a JSON document whose top-level array items or
+                object members are parsed one at a time, or an iterable of data
+                items or a mapping of data members. Paths given as `str` are not
+                supported.
+            schema:
+                The schema object or an URI of the schema for each item or member.
+            mode:
+                Which error to report, see the `mode` argument of the `jsonschema`
+                filter.
+
+        Returns:
+            An empty string if all items are valid, or an error object for the
+            first invalid item whose path starts with the index or member name.
+        """
+        return self._filter.validate_stream(source, schema, mode)
+
+    def collect_errors(
+        self,
+        data: Any,  # noqa: ANN401
+        schema: str | _Schema,
+        *,
+        max_errors: int = 100,
+        unique_paths: bool = False,
+    ) -> list[CompactError]:
+        """Collect all validation errors up to a maximum number.
+
+        See the `jsonschema_errors` filter.
+
+        Args:
+            data:
+                The data to validate.
+            schema:
+                The schema object or an URI of the schema.
+            max_errors:
+                The maximum number of errors to collect.
+            unique_paths:
+                Whether to collect only the first error per location in the data.
+
+        Returns:
+            The compact validation errors in the order they were found, which is
+            empty if the validation was successful.
+        """
+        return self._filter.collect_errors(
+            data,
+            schema,
+            max_errors=max_errors,
+            unique_paths=unique_paths,
+        )
+
+    def seed(self, schemas: Mapping[str, _Schema]) -> None:
+        """Seed the schema registry with schema documents.
+
+        Seeded schemas are used instead of loading the documents at the given URIs,
+        both for schemas passed to the filter and test and for schema references.
+
+        Args:
+            schemas:
+                A mapping from schema URIs to schema documents. Relative URIs are
+                treated like local schema file paths.
+        """
+        self._filter.seed(schemas)
+
+    def register_source(self, scheme: str, source: SchemaSource) -> None:
+        """Register a source of schema files for a URI scheme.
+
+        Schemas passed to the filters and the test and schema references with URIs
+        of the scheme are then read from the source, e.g. via a
+        `jinja2_jsonschema.sources.PackageSource` for `pkg://` URIs. Relative
+        references within schema files of the source are resolved against their
+        URIs.
+
+        Note that the scheme is registered process-wide as a scheme supporting
+        relative URIs with `urllib.parse` (in `uses_relative` and `uses_netloc`),
+        because `referencing` resolves references with `urllib.parse.urljoin()`.
+        This changes how `urljoin()` handles URIs of the scheme for all Jinja2
+        environments and libraries in the process. Registered schemes should
+        therefore not clash with schemes used otherwise.
+
+        Args:
+            scheme:
+                The URI scheme, e.g. `"pkg"`.
+            source:
+                The source of schema files.
+        """
+        self._filter.register_source(scheme, source)
+
+    def preload(
+        self,
+        schemas: str | Iterable[str],
+        concurrency: int = 8,
+    ) -> PreloadReport:
+        """Resolve, check and compile schemas ahead of validation, e.g. at startup.
+
+        Schemas and the schema files they reference, transitively, are retrieved
+        concurrently into the schema registry and the schemas are compiled into
+        the cache of validators, so that the first validation against them does
+        not pay for it. Errors are collected in the report instead of being
+        raised.
+
+        Args:
+            schemas:
+                An URI of a schema, a glob pattern of local schema files like
+                `"schemas/*.json"`, which is matched against the templates of the
+                Jinja2 loader and the schema files of the schema archive, or many
+                of them.
+            concurrency:
+                The maximum number of schema files to retrieve and schemas to
+                compile concurrently.
+
+        Returns:
+            The report of what was preloaded and how long it took.
+
+        Raises:
+            ValueError:
+                The concurrency is not positive.
+        """
+        return self._filter.preload(schemas, concurrency)
+
+    def bundle(self, schema: str) -> dict[str, Any]:
+        """Bundle a schema file with all schema files it references, transitively.
+
+        See `jinja2_jsonschema.bundle` for the structure of bundles.
+
+        Args:
+            schema:
+                The URI of the root schema file.
+
+        Returns:
+            The bundled schema document.
+        """
+        return self._filter.bundle(schema)
+
+    def load_bundle(self, path: str | os.PathLike[str]) -> str:
+        """Seed the schema registry with the schema documents of a bundle.
+
+        Schemas passed to the filter and test which are embedded in the bundle are
+        then never loaded from their URIs. Bundles are created with
+        `python -m jinja2_jsonschema bundle`.
+
+        Args:
+            path:
+                The path of the serialized bundle.
+
+        Returns:
+            The URI of the root schema file of the bundle.
+        """
+        root, documents = bundle.split(bundle.loads(Path(path).read_bytes()))
+        self._filter.seed(documents)
+        return root
 
 
 class _JsonSchemaFilter:
     """Jinja2 filter for validating data against a JSON Schema document."""
 
+    DEFAULT_CACHE_SIZE = 128
+    DEFAULT_CHECKED_CACHE_SIZE = 4096
+    DEFAULT_OFFLOAD_THRESHOLD = 10_000
+    DEFAULT_ERROR_MAX_LENGTH = 1000
+
     def __init__(self, environment: Environment) -> None:
         self._environment = environment
+        # The compiled validators and the local schema files they depend on.
+        self._validators: LRUCache[str, tuple[Validator, _Dependencies]] = LRUCache(
+            self.DEFAULT_CACHE_SIZE,
+        )
+        self.http_cache: HTTPCache | None = None
+        self.transport: Transport = PooledTransport()
+        self.prefetch_concurrency = 0
+        self.check_schema: _CheckSchema = "once"
+        self.validate_in_executor = False
+        self.precompile_literals = True
+        self.observer: Observer | None = None
+        self.parsed_schema_cache: ParsedSchemaCache | None = None
+        self.schema_archive: SchemaArchive | None = None
+        self.process_pool: Executor | None = None
+        self.offload_threshold = self.DEFAULT_OFFLOAD_THRESHOLD
+        # The tokens identifying validators in the worker processes of the process
+        # pool and their pickled arguments for compiling them, keyed by the ID of
+        # the validator they belong to.
+        self._offloaded: LRUCache[int, tuple[Validator, str, bytes]] = LRUCache(
+            self.DEFAULT_CACHE_SIZE,
+        )
+        self.error_format: ErrorFormat = "full"
+        self.error_max_length = self.DEFAULT_ERROR_MAX_LENGTH
+        self._format_checker: jsonschema.FormatChecker | None = None
+        self._pattern_cache = PatternCache()
+        self._sources: dict[str, SchemaSource] = {}
+        # The validator classes using the pattern cache, keyed by their base class.
+        self._validator_classes: dict[type[Validator], type[Validator]] = {}
+        self._checked: LRUCache[str, None] = LRUCache(self.DEFAULT_CHECKED_CACHE_SIZE)
+        self._seeded: dict[str, Resource[Any]] = {}
+        self._resources: dict[str, Resource[Any]] = {}
+        self._registry: Registry[Any] = Registry(retrieve=self._retrieve)  # type: ignore[call-arg]
+        # Guards the retrieved schemas, the registry and in-flight retrievals.
+        self._lock = Lock()
+        self._in_flight: dict[str, Future[Resource[Any]]] = {}
+        # The loader callbacks telling whether retrieved local schema files are
+        # unchanged, used like for templates if `auto_reload` is enabled.
+        self._uptodate: dict[str, Callable[[], bool]] = {}
+
+    @property
+    def cache_size(self) -> int:
+        """The maximum number of compiled validators to keep in the cache."""
+        return self._validators.maxsize
+
+    @cache_size.setter
+    def cache_size(self, value: int) -> None:
+        self._validators.maxsize = value
+
+    @property
+    def format_checker(self) -> jsonschema.FormatChecker | None:
+        """The format checker for validating the `format` keyword."""
+        return self._format_checker
+
+    @format_checker.setter
+    def format_checker(self, value: jsonschema.FormatChecker | None) -> None:
+        self._format_checker = value
+        self._validators.clear()
+
+    @property
+    def pattern_cache(self) -> PatternCache:
+        """The cache of compiled regular expressions."""
+        return self._pattern_cache
+
+    @pattern_cache.setter
+    def pattern_cache(self, value: PatternCache) -> None:
+        self._pattern_cache = value
+        self._validator_classes = {}
+        self._validators.clear()
+
+    def clear_cache(self) -> None:
+        """Clear the compiled validator cache and all retrieved schemas."""
+        self._validators.clear()
+        self._checked.clear()
+        with self._lock:
+            self._resources = dict(self._seeded)
+            self._uptodate.clear()
+            self._registry = (
+                Registry(retrieve=self._retrieve)  # type: ignore[call-arg]
+                .with_resources(self._seeded.items())
+                .crawl()
+            )
+
+    def seed(self, schemas: Mapping[str, _Schema]) -> None:
+        """Seed the schema registry with schema documents.
+
+        Args:
+            schemas:
+                A mapping from schema URIs to schema documents.
+        """
+        resources = {
+            self._normalize_uri(uri): Resource.from_contents(
+                schema,
+                default_specification=Specification.OPAQUE,
+            )
+            for uri, schema in schemas.items()
+        }
+        with self._lock:
+            self._seeded.update(resources)
+            self._resources.update(resources)
+            for uri in resources:
+                self._uptodate.pop(uri, None)
+            self._registry = self._registry.with_resources(resources.items()).crawl()
+
+    def register_source(self, scheme: str, source: SchemaSource) -> None:
+        """Register a source of schema files for a URI scheme.
+
+        Args:
+            scheme:
+                The URI scheme.
+            source:
+                The source of schema files.
+        """
+        scheme = scheme.lower()
+        # `urljoin`, which `referencing` uses for resolving references, resolves
+        # relative references only for schemes registered with `urllib.parse`.
+        for schemes in (uses_relative, uses_netloc):
+            if scheme not in schemes:
+                schemes.append(scheme)
+        self._sources[scheme] = source
+
+    def bundle(self, schema: str) -> dict[str, Any]:
+        """Bundle a schema file with all schema files it references, transitively.
+
+        Args:
+            schema:
+                The URI of the root schema file.
+
+        Returns:
+            The bundled schema document.
+        """
+        root = self._normalize_uri(schema)
+        documents: dict[str, Any] = {}
+        pending = [root]
+        while pending:
+            uri = pending.pop()
+            if (
+                uri in documents
+                or uri in SPECIFICATIONS
+                # Schema resources embedded in retrieved schema files are bundled
+                # along with them.
+                or (uri not in self._resources and uri in self._registry)
+            ):
+                continue
+            resource = self._retrieve(uri)
+            documents[uri] = resource.contents
+            pending.extend(_iter_refs(resource.contents, uri))
+        return bundle.create(root, documents)
 
     def __call__(
         self,
         data: Any,  # noqa: ANN401
         schema: str | _Schema,
-    ) -> jsonschema.ValidationError | Literal[""]:
+        mode: _Mode = "best",
+    ) -> _Result:
         """Validate data against a JSON Schema document.
 
         Args:
@@ -84,38 +742,632 @@ class _JsonSchemaFilter:
                 The data to validate.
             schema:
                 The schema object or an URI of the schema.
+            mode:
+                Which error to return if the validation failed: `"best"` for the
+                most relevant error among all errors, or `"first"` for the first
+                error found, which avoids a full traversal of invalid data.
 
         Returns:
             An empty string if the validation was successful, or an error object
-            if the validation failed.
+            if the validation failed, which is a `CompactError` if the error format
+            is `"compact"`.
         """
-        if isinstance(schema, str):
-            if schema.startswith(("http://", "https://")):
-                schema = {"$ref": schema}
-            else:
-                if not schema.startswith("/"):
-                    schema = f"/{schema}"
-                schema = {"$ref": f"file://{schema}"}
-
-        try:
-            jsonschema.validate(
+        return self._output(
+            self._validate(
+                self._get_validator(schema),
                 data,
-                schema,
-                registry=Registry(retrieve=self._resolve_schema),  # type: ignore[call-arg]
-            )
-        except Unresolvable as exc:
-            _exc: BaseException = exc
-            while _exc.__context__:
-                if isinstance(_exc.__context__, JsonSchemaExtensionError):
-                    raise _exc.__context__ from None
-                _exc = _exc.__context__
-            raise
-        except jsonschema.ValidationError as exc:
-            return exc
+                mode,
+                self._schema_uri(schema),
+            ),
+        )
+
+    def is_valid(
+        self,
+        data: Any,  # noqa: ANN401
+        schema: str | _Schema,
+    ) -> bool:
+        """Check whether data is valid against a JSON Schema document.
+
+        Validation stops at the first error.
+
+        Args:
+            data:
+                The data to validate.
+            schema:
+                The schema object or an URI of the schema.
+
+        Returns:
+            Whether the validation was successful.
+        """
+        validator = self._get_validator(schema)
+        if self._offloads(data):
+            uri = self._schema_uri(schema)
+            return not self._validate_in_process(validator, data, "first", uri)
+        start = perf_counter()
+        with _reraise_extension_errors():
+            valid = validator.is_valid(data)
+        self._observe_phase("validate", start, self._schema_uri(schema))
+        return valid
+
+    def validate_all(
+        self,
+        data: Iterable[Any],
+        schema: str | _Schema,
+        *,
+        lazy: bool = False,
+        fail_fast: bool = False,
+        mode: _Mode = "best",
+    ) -> list[_Result] | Iterator[_Result]:
+        """Validate many data items against one JSON Schema document.
+
+        Args:
+            data:
+                The data items to validate.
+            schema:
+                The schema object or an URI of the schema.
+            lazy:
+                Whether to return an iterator instead of a list of results.
+            fail_fast:
+                Whether to stop after the first item which fails validation.
+            mode:
+                Which error to return per item, see `__call__`.
+
+        Returns:
+            For each data item, an empty string if the validation was successful, or
+            an error object if the validation failed.
+        """
+        validator = self._get_validator(schema)
+        uri = self._schema_uri(schema)
+
+        def iter_results() -> Iterator[_Result]:
+            for item in data:
+                result = self._output(self._validate(validator, item, mode, uri))
+                yield result
+                if result and fail_fast:
+                    return
+
+        results = iter_results()
+        return results if lazy else list(results)
+
+    def validate_stream(
+        self,
+        source: Any,  # noqa: ANN401
+        schema: str | _Schema,
+        mode: _Mode = "best",
+    ) -> _Result:
+        """Validate the items of a large JSON array or object incrementally.
+
+        Items are parsed and validated one at a time, so that memory is bounded by
+        the largest item instead of the whole document. Validation stops at the
+        first invalid item.
+
+        Args:
+            source:
+                A text or binary file object or an `os.PathLike` path of a JSON
+                document, or an iterable of data items or a mapping of data
+                members. Paths given as `str` are not supported.
+            schema:
+                The schema object or an URI of the schema for each item.
+            mode:
+                Which error to return, see `__call__`.
+
+        Returns:
+            An empty string if all items are valid, or an error object for the
+            first invalid item whose path starts with the index or member name.
 
+        Raises:
+            InvalidStreamError:
+                The JSON document is invalid.
+        """
+        validator = self._get_validator(schema)
+        uri = self._schema_uri(schema)
+        with _iter_stream(source) as items:
+            for key, item in items:
+                error = self._validate(validator, item, mode, uri)
+                if error:
+                    error.path.appendleft(key)
+                    return self._output(error)
         return ""
 
+    def collect_errors(
+        self,
+        data: Any,  # noqa: ANN401
+        schema: str | _Schema,
+        *,
+        max_errors: int = 100,
+        unique_paths: bool = False,
+    ) -> list[CompactError]:
+        """Collect all validation errors up to a maximum number.
+
+        Errors are collected while the data is traversed, which stops as soon as
+        the maximum number of errors is reached, so memory is bounded by it.
+
+        Args:
+            data:
+                The data to validate.
+            schema:
+                The schema object or an URI of the schema.
+            max_errors:
+                The maximum number of errors to collect.
+            unique_paths:
+                Whether to collect only the first error per location in the data.
+
+        Returns:
+            The compact validation errors in the order they were found.
+
+        Raises:
+            ValueError:
+                The maximum number of errors is negative.
+        """
+        if max_errors < 0:
+            msg = "max_errors must not be negative"
+            raise ValueError(msg)
+        validator = self._get_validator(schema)
+
+        errors: list[CompactError] = []
+        seen: set[tuple[str | int, ...]] = set()
+        start = perf_counter()
+        with _reraise_extension_errors():
+            for error in validator.iter_errors(data) if max_errors else ():
+                if unique_paths:
+                    path = tuple(error.absolute_path)
+                    if path in seen:
+                        continue
+                    seen.add(path)
+                errors.append(CompactError(error, self.error_max_length))
+                if len(errors) >= max_errors:
+                    break
+        self._observe_phase("validate", start, self._schema_uri(schema))
+        return errors
+
+    def _validate(
+        self,
+        validator: Validator,
+        data: Any,  # noqa: ANN401
+        mode: _Mode,
+        uri: str | None,
+    ) -> jsonschema.ValidationError | Literal[""]:
+        if mode not in ("best", "first"):
+            msg = f'Invalid mode "{mode}", expected "best" or "first"'
+            raise ValueError(msg)
+
+        if self._offloads(data):
+            return self._validate_in_process(validator, data, mode, uri)
+
+        start = perf_counter()
+        with _reraise_extension_errors():
+            error = _find_error(validator, data, mode)
+        self._observe_phase("validate", start, uri)
+
+        return "" if error is None else error
+
+    def _output(self, result: jsonschema.ValidationError | Literal[""]) -> _Result:
+        if result and self.error_format == "compact":
+            return CompactError(result, self.error_max_length)
+        return result
+
+    def _offloads(self, data: object) -> bool:
+        """Check whether data is validated in the process pool."""
+        return self.process_pool is not None and _exceeds(data, self.offload_threshold)
+
+    def _validate_in_process(
+        self,
+        validator: Validator,
+        data: Any,  # noqa: ANN401
+        mode: _Mode,
+        uri: str | None,
+    ) -> jsonschema.ValidationError | Literal[""]:
+        process_pool = cast("Executor", self.process_pool)
+        entry = self._offloaded.get(id(validator))
+        if entry is None or entry[0] is not validator:
+            # The validator is sent along with all schema files it references, so
+            # that any worker process can compile it. They are serialized only
+            # once, as the data is sent in the same task.
+            self._prefetch(validator.schema, max(self.prefetch_concurrency, 1))
+            compile_args = pickle.dumps(
+                (
+                    validator.schema,
+                    self._documents(validator.schema),
+                    self._format_checker,
+                ),
+                pickle.HIGHEST_PROTOCOL,
+            )
+            entry = (validator, uuid4().hex, compile_args)
+            self._offloaded.set(id(validator), entry)
+        _, token, compile_args = entry
+
+        start = perf_counter()
+        state = process_pool.submit(
+            _validate_in_worker,
+            token,
+            data,
+            mode,
+            compile_args,
+        ).result()
+        self._observe_phase("validate", start, uri)
+        if not state:
+            return ""
+        return _error_from_state(state, validator.TYPE_CHECKER)
+
+    def _documents(self, schema: object) -> dict[str, Any]:
+        """Get all retrieved schema files referenced by a schema, transitively."""
+        documents: dict[str, Any] = {}
+        pending = list(_iter_refs(schema, ""))
+        while pending:
+            uri = pending.pop()
+            resource = self._resources.get(uri)
+            if uri in documents or resource is None:
+                continue
+            documents[uri] = resource.contents
+            pending.extend(_iter_refs(resource.contents, uri))
+        return documents
+
+    def _get_validator(self, schema: str | _Schema) -> Validator:
+        uri = self._schema_uri(schema)
+        key, schema = self._key(schema)
+        entry = self._validators.get(key)
+        if (
+            entry is not None
+            and self._environment.auto_reload
+            and self._reload_changed(entry[1])
+        ):
+            entry = None
+            self._checked.pop(key)
+        self._observe_cache("validator", key, hit=entry is not None)
+        if entry is not None:
+            validator = entry[0]
+            if self.check_schema == "always":
+                self._check(schema, uri)
+            return validator
+
+        # The validator keeps a snapshot of the registry, so all schema files it
+        # references are retrieved before compiling it.
+        if self.prefetch_concurrency > 0:
+            outcomes = self._prefetch(schema, self.prefetch_concurrency)
+            retrieved = not any(
+                isinstance(outcome, Exception) for outcome in outcomes.values()
+            )
+        else:
+            retrieved = self._resolve_closure(schema)
+        cls = jsonschema.validators.validator_for(schema)
+        if self.check_schema == "always" or (
+            self.check_schema == "once" and key not in self._checked
+        ):
+            self._check(schema, uri)
+            self._checked.set(key, None)
+        validator = self._validator_class(cls)(
+            schema,
+            registry=self._registry,
+            format_checker=self._format_checker,
+        )
+        # Validators missing schema files retry retrieving them during validation,
+        # so they are compiled again until all schema files are retrieved.
+        if retrieved:
+            dependencies = tuple(
+                (uri, self._resources[uri])
+                for uri in self._documents(schema)
+                if uri in self._uptodate
+            )
+            self._validators.set(key, (validator, dependencies))
+        return validator
+
+    def _validator_class(self, cls: type[Validator]) -> type[Validator]:
+        return _pattern_cache_class(cls, self._pattern_cache, self._validator_classes)
+
+    def _check(self, schema: _Schema, uri: str | None) -> None:
+        """Check a schema against the meta-schema of its dialect.
+
+        For URI schemas, the schema file is checked instead of the reference to it.
+        """
+        if uri is not None:
+            resource = self._registry.get(urldefrag(uri)[0])
+            if resource is None:
+                # The retrieval error is raised during validation.
+                return
+            schema = resource.contents
+        start = perf_counter()
+        jsonschema.validators.validator_for(schema).check_schema(schema)  # type: ignore[arg-type]
+        self._observe_phase("check", start, uri)
+
+    def _observe_phase(
+        self,
+        phase: Phase,
+        start: float,
+        uri: str | None,
+        size: int | None = None,
+    ) -> None:
+        observer = self.observer
+        if observer is not None:
+            observer.on_phase(PhaseEvent(phase, uri, perf_counter() - start, size))
+
+    def _observe_cache(self, cache: Cache, key: str, *, hit: bool) -> None:
+        observer = self.observer
+        if observer is not None:
+            observer.on_cache(CacheEvent(cache, key, hit))
+
+    def precompile(self, schema: str) -> None:
+        """Resolve and compile a schema ahead of validation.
+
+        All schema files the schema references are retrieved concurrently before
+        it is compiled, so that the compiled schema never resolves them again.
+        Errors are ignored as they are raised during validation.
+
+        Args:
+            schema:
+                An URI of the schema.
+        """
+        self._prefetch(
+            {"$ref": self._normalize_uri(schema)},
+            max(self.prefetch_concurrency, 1),
+        )
+        try:
+            self._get_validator(schema)
+        except Exception:  # noqa: BLE001
+            return
+
+    def preload(
+        self,
+        schemas: str | Iterable[str],
+        concurrency: int,
+    ) -> PreloadReport:
+        """Resolve, check and compile schemas and the schema files they reference.
+
+        Args:
+            schemas:
+                An URI or a glob pattern of local schema files, or many of them.
+            concurrency:
+                The maximum number of schema files to retrieve concurrently.
+
+        Returns:
+            The report of the preloaded schemas.
+        """
+        if concurrency < 1:
+            msg = "concurrency must be positive"
+            raise ValueError(msg)
+        start = perf_counter()
+        uris = self._expand(schemas)
+        outcomes = self._prefetch(
+            {"allOf": [{"$ref": uri} for uri in uris]},
+            concurrency,
+        )
+        errors = {
+            uri: outcome
+            for uri, outcome in outcomes.items()
+            if isinstance(outcome, Exception)
+        }
+
+        def compile_schema(uri: str) -> PreloadedSchema | Exception:
+            compile_start = perf_counter()
+            try:
+                self._get_validator(uri)
+            except Exception as exc:  # noqa: BLE001
+                return exc
+            return PreloadedSchema(
+                uri,
+                perf_counter() - compile_start,
+                tuple(sorted(self._documents({"$ref": uri}))),
+            )
+
+        preloaded: list[PreloadedSchema] = []
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            candidates = [uri for uri in uris if uri not in errors]
+            for uri, result in zip(
+                candidates,
+                executor.map(compile_schema, candidates),
+                strict=True,
+            ):
+                if isinstance(result, Exception):
+                    errors[uri] = result
+                else:
+                    preloaded.append(result)
+        return PreloadReport(
+            tuple(preloaded),
+            {
+                uri: outcome
+                for uri, outcome in outcomes.items()
+                if not isinstance(outcome, Exception)
+            },
+            errors,
+            perf_counter() - start,
+        )
+
+    def _reload_changed(self, dependencies: _Dependencies) -> bool:
+        """Forget the local schema files of a validator which have changed since.
+
+        Like Jinja2 does for templates, only the schema files the validator depends
+        on are checked, not all retrieved ones.
+
+        Returns:
+            Whether the validator is outdated, i.e. any schema file it depends on
+            has changed or has been reloaded since it was compiled.
+        """
+        changed = set()
+        outdated = False
+        for uri, resource in dependencies:
+            uptodate = self._uptodate.get(uri)
+            if self._resources.get(uri) is not resource or uptodate is None:
+                outdated = True
+            elif not uptodate():
+                changed.add(uri)
+        if not changed:
+            return outdated
+        with self._lock:
+            for uri in changed:
+                self._uptodate.pop(uri, None)
+                self._resources.pop(uri, None)
+            self._registry = (
+                Registry(retrieve=self._retrieve)  # type: ignore[call-arg]
+                .with_resources(self._resources.items())
+                .crawl()
+            )
+        return True
+
+    def _schema_uri(self, schema: str | _Schema) -> str | None:
+        return self._normalize_uri(schema) if isinstance(schema, str) else None
+
+    def _key(self, schema: str | _Schema) -> tuple[str, _Schema]:
+        """Get the cache key of a schema and the schema object to compile."""
+        if isinstance(schema, str):
+            key = self._normalize_uri(schema)
+            return key, {"$ref": key}
+        return self._fingerprint(schema), schema
+
+    def _retrieve(self, uri: str) -> Resource[Any]:
+        # Schema files which could not be retrieved before compiling a validator
+        # are retried when the validator resolves a reference to them.
+        return self._resolve_schema(uri)
+
+    def _is_retrieved(self, uri: str) -> bool:
+        # Meta-schemas are bundled with `jsonschema`, and schema resources
+        # embedded in retrieved schema files are registered along with them.
+        return uri in SPECIFICATIONS or uri in self._registry
+
+    def _resolve_closure(self, schema: object) -> bool:
+        """Retrieve all schema files referenced by a schema one at a time.
+
+        Retrieval errors are ignored here as they are raised during validation if
+        the reference is actually resolved.
+
+        Returns:
+            Whether all schema files were retrieved.
+        """
+        pending = [uri for uri in _iter_refs(schema, "") if not self._is_retrieved(uri)]
+        seen = set(pending)
+        retrieved = True
+        while pending:
+            uri = pending.pop()
+            try:
+                resource = self._resolve_schema(uri)
+            except Exception:  # noqa: BLE001
+                retrieved = False
+                continue
+            for ref in _iter_refs(resource.contents, uri):
+                if ref not in seen and not self._is_retrieved(ref):
+                    seen.add(ref)
+                    pending.append(ref)
+        return retrieved
+
+    def _prefetch(
+        self,
+        schema: object,
+        max_workers: int,
+    ) -> dict[str, float | Exception]:
+        """Retrieve the closure of all schema files referenced by a schema.
+
+        Referenced schema files are retrieved concurrently, transitively following
+        their own references. Retrieval errors are ignored here as they are raised
+        during validation if the reference is actually resolved.
+
+        Returns:
+            The durations of retrieving the schema files which were not retrieved
+            before in seconds, or the retrieval errors, keyed by their URIs.
+        """
+        outcomes: dict[str, float | Exception] = {}
+        seen = {uri for uri in _iter_refs(schema, "") if not self._is_retrieved(uri)}
+        if not seen:
+            return outcomes
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {executor.submit(self._timed_resolve, uri): uri for uri in seen}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    uri = pending.pop(future)
+                    exc = future.exception()
+                    if exc is not None:
+                        if isinstance(exc, Exception):
+                            outcomes[uri] = exc
+                        continue
+                    resource, outcomes[uri] = future.result()
+                    for ref in _iter_refs(resource.contents, uri):
+                        if ref not in seen and not self._is_retrieved(ref):
+                            seen.add(ref)
+                            pending[executor.submit(self._timed_resolve, ref)] = ref
+        return outcomes
+
+    def _timed_resolve(self, uri: str) -> tuple[Resource[Any], float]:
+        start = perf_counter()
+        resource = self._resolve_schema(uri)
+        return resource, perf_counter() - start
+
+    def _expand(self, schemas: str | Iterable[str]) -> list[str]:
+        """Expand glob patterns of local schema files and normalize the URIs."""
+        if isinstance(schemas, str):
+            schemas = [schemas]
+        uris: dict[str, None] = {}
+        for schema in schemas:
+            if "://" in schema or not _GLOB_CHARS.intersection(schema):
+                uris[self._normalize_uri(schema)] = None
+                continue
+            pattern = schema.lstrip("/")
+            names = (
+                set(self._environment.list_templates())
+                if self._environment.loader
+                else set()
+            )
+            if self.schema_archive is not None:
+                names.update(self.schema_archive)
+            for name in sorted(names):
+                if fnmatchcase(name, pattern):
+                    uris[self._normalize_uri(name)] = None
+        return list(uris)
+
+    def _normalize_uri(self, uri: str) -> str:
+        if (
+            uri.startswith(("http://", "https://", "file://"))
+            or urlparse(uri).scheme in self._sources
+        ):
+            return uri
+        if not uri.startswith("/"):
+            uri = f"/{uri}"
+        return f"file://{uri}"
+
+    @staticmethod
+    def _fingerprint(schema: _Schema) -> str:
+        serialized = json.dumps(
+            schema,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=repr,
+        )
+        return f"sha256:{hashlib.sha256(serialized.encode()).hexdigest()}"
+
     def _resolve_schema(self, uri: str) -> Resource[Any]:
+        """Retrieve a schema file once.
+
+        Retrieved schema files are remembered. Concurrent retrievals of the same
+        schema file wait for the first one instead of retrieving it again.
+        """
+        with self._lock:
+            resource = self._resources.get(uri)
+            future = self._in_flight.get(uri)
+            owner = resource is None and future is None
+            if owner:
+                future = self._in_flight[uri] = Future()
+        self._observe_cache("schema", uri, hit=not owner)
+        if resource is not None:
+            return resource
+        future = cast("Future[Resource[Any]]", future)
+        if not owner:
+            return future.result()
+
+        try:
+            resource = self._load_schema(uri)
+        except BaseException as exc:
+            with self._lock:
+                del self._in_flight[uri]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._resources[uri] = resource
+            self._registry = self._registry.with_resource(uri, resource).crawl()
+            del self._in_flight[uri]
+        future.set_result(resource)
+        return resource
+
+    def _load_schema(self, uri: str) -> Resource[Any]:
+        source = self._sources.get(urlparse(uri).scheme)
+        if source is not None:
+            return self._resolve_schema_from_source(uri, source)
         if uri.startswith(("http://", "https://")):
             return self._resolve_schema_from_remote(uri)
         if uri.startswith("file://"):
@@ -123,40 +1375,720 @@ class _JsonSchemaFilter:
         raise SchemaFileNotFoundError(uri)
 
     def _resolve_schema_from_local(self, uri: str) -> Resource[Any]:
+        schema_file = urlparse(uri).path
+        if self.schema_archive is not None:
+            resource = self._resolve_schema_from_archive(
+                uri,
+                schema_file.lstrip("/"),
+                self.schema_archive,
+            )
+            if resource is not None:
+                return resource
+
         if not self._environment.loader:
             raise LoaderNotFoundError
 
-        schema_file = urlparse(uri).path
+        start = perf_counter()
         try:
-            raw_schema, *_ = self._environment.loader.get_source(
+            raw_schema, _, uptodate = self._environment.loader.get_source(
                 self._environment,
                 schema_file,
             )
         except TemplateNotFound as exc:
             raise SchemaFileNotFoundError(schema_file) from exc
+        size = len(raw_schema.encode()) if self.observer is not None else None
+        self._observe_phase("read", start, uri, size)
 
-        return self._load(raw_schema)
+        start = perf_counter()
+        resource = self._load(raw_schema, uri, parsed_cache=self.parsed_schema_cache)
+        self._observe_phase("parse", start, uri, size)
+        if uptodate is not None:
+            self._uptodate[uri] = uptodate
+        return resource
+
+    def _resolve_schema_from_archive(
+        self,
+        uri: str,
+        name: str,
+        archive: SchemaArchive,
+    ) -> Resource[Any] | None:
+        start = perf_counter()
+        view = archive.read(name)
+        if view is None:
+            return None
+        with view:
+            size = view.nbytes
+            raw_schema = str(view, "utf-8")
+        self._observe_phase("read", start, uri, size)
+
+        start = perf_counter()
+        resource = self._load(raw_schema, uri, parsed_cache=self.parsed_schema_cache)
+        self._observe_phase("parse", start, uri, size)
+        return resource
+
+    def _resolve_schema_from_source(
+        self,
+        uri: str,
+        source: SchemaSource,
+    ) -> Resource[Any]:
+        start = perf_counter()
+        raw_schema = source.read(uri)
+        if isinstance(raw_schema, Mapping):
+            self._observe_phase("read", start, uri)
+            return Resource.from_contents(
+                raw_schema,
+                default_specification=Specification.OPAQUE,
+            )
+        size = len(raw_schema.encode() if isinstance(raw_schema, str) else raw_schema)
+        self._observe_phase("read", start, uri, size)
+
+        start = perf_counter()
+        if isinstance(raw_schema, bytes):
+            raw_schema = raw_schema.decode("utf-8")
+        resource = self._load(raw_schema, uri, parsed_cache=self.parsed_schema_cache)
+        self._observe_phase("parse", start, uri, size)
+        return resource
 
     def _resolve_schema_from_remote(self, uri: str) -> Resource[Any]:
+        start = perf_counter()
+        if self.http_cache is None:
+            raw_schema, content_type = self._download(uri)
+        else:
+            raw_schema, content_type = self._download_cached(uri, self.http_cache)
+        self._observe_phase("fetch", start, uri, len(raw_schema))
+
+        start = perf_counter()
+        resource = self._load(
+            raw_schema.decode("utf-8"),
+            uri,
+            content_type,
+            self.parsed_schema_cache,
+        )
+        self._observe_phase("parse", start, uri, len(raw_schema))
+        return resource
+
+    def _download(self, uri: str) -> tuple[bytes, str | None]:
+        response = self.transport.fetch(uri, {})
+        self._raise_for_status(uri, response)
+        return response.body, response.headers.get("content-type")
+
+    def _download_cached(
+        self,
+        uri: str,
+        cache: HTTPCache,
+    ) -> tuple[bytes, str | None]:
+        cached = cache.get(uri)
+        if cached is None and cache.offline:
+            raise SchemaNotCachedError(uri)
+        if cached is not None and (cache.offline or cache.is_fresh(cached)):
+            self._observe_cache("http", uri, hit=True)
+            return cached.body, cached.content_type
+
         try:
-            with urlopen(uri) as response:  # noqa: S310
-                raw_schema = response.read().decode("utf-8")
-        except HTTPError as exc:
-            if exc.code == HTTPStatus.NOT_FOUND:
-                raise SchemaFileNotFoundError(uri) from exc
-            raise
-        return self._load(raw_schema)
+            response = self.transport.fetch(
+                uri,
+                {} if cached is None else cached.revalidation_headers,
+            )
+        except OSError:
+            # Serve a stale response if the server is unreachable.
+            if cached is None:
+                raise
+            self._observe_cache("http", uri, hit=True)
+            return cached.body, cached.content_type
+
+        if response.status == HTTPStatus.NOT_MODIFIED and cached is not None:
+            cache.refresh(uri, cached)
+            self._observe_cache("http", uri, hit=True)
+            return cached.body, cached.content_type
+        self._observe_cache("http", uri, hit=False)
+        self._raise_for_status(uri, response)
+        cached = cache.put(
+            uri,
+            response.body,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            content_type=response.headers.get("content-type"),
+        )
+        return cached.body, cached.content_type
 
     @staticmethod
-    def _load(raw_schema: str) -> Resource[Any]:
+    def _raise_for_status(uri: str, response: Response) -> None:
+        if response.status == HTTPStatus.NOT_FOUND:
+            raise SchemaFileNotFoundError(uri)
+        if response.status >= HTTPStatus.BAD_REQUEST:
+            headers = Message()
+            for name, value in response.headers.items():
+                headers[name] = value
+            raise HTTPError(
+                uri,
+                int(response.status),
+                responses.get(response.status, ""),
+                headers,
+                None,
+            )
+
+    @staticmethod
+    def _load(
+        raw_schema: str,
+        uri: str,
+        content_type: str | None = None,
+        parsed_cache: ParsedSchemaCache | None = None,
+    ) -> Resource[Any]:
+        schema_format = _detect_format(uri, content_type)
+        if schema_format is None:
+            schema_format = "json" if raw_schema.lstrip()[:1] in ("{", "[") else "yaml"
+
         schema: _Schema
-        try:
-            import yaml  # noqa: PLC0415
-        except ImportError:
-            schema = json.loads(raw_schema)
+        if parsed_cache is None:
+            schema = _parse(raw_schema, schema_format)
         else:
-            schema = yaml.safe_load(raw_schema)
+            schema = parsed_cache.get_or_parse(
+                raw_schema,
+                partial(_parse, schema_format=schema_format),
+                namespace=schema_format,
+            )
         return Resource.from_contents(
             schema,
             default_specification=Specification.OPAQUE,
         )
+
+
+def _parse(raw_schema: str, schema_format: str) -> Any:  # noqa: ANN401
+    yaml_loader = _yaml_loader()
+    if schema_format == "yaml" and yaml_loader is not None:
+        return yaml_loader(raw_schema)
+    try:
+        return json.loads(raw_schema)
+    except ValueError:
+        # YAML is mostly a superset of JSON, so JSON-like documents which are not
+        # strictly valid JSON may still be valid YAML.
+        if yaml_loader is None:
+            raise
+        return yaml_loader(raw_schema)
+
+
+@cache
+def _yaml_loader() -> Callable[[str], Any] | None:
+    """Get a function for parsing YAML documents if PyYAML is installed.
+
+    The function uses the fast libyaml-based loader if available.
+    """
+    try:
+        import yaml  # noqa: PLC0415
+    except ImportError:
+        return None
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return partial(yaml.load, Loader=loader)
+
+
+def _detect_format(
+    uri: str, content_type: str | None
+) -> Literal["json", "yaml"] | None:
+    """Detect the format of a schema file from its media type or file extension."""
+    if content_type:
+        media_type = content_type.partition(";")[0].strip().lower()
+        if media_type == "application/json" or media_type.endswith("+json"):
+            return "json"
+        if "yaml" in media_type:
+            return "yaml"
+    suffix = PurePosixPath(urlparse(uri).path).suffix.lower()
+    if suffix == ".json":
+        return "json"
+    if suffix in (".yaml", ".yml"):
+        return "yaml"
+    return None
+
+
+class _AsyncJsonSchemaFilter:
+    """Jinja2 filter for validating data in Jinja2 environments with async mode.
+
+    Before a schema is compiled, all schema files it references are retrieved
+    concurrently without blocking the event loop. Concurrent retrievals of the same
+    schema file are deduplicated.
+    """
+
+    def __init__(self, jsonschema_filter: _JsonSchemaFilter) -> None:
+        self._filter = jsonschema_filter
+        self._pending: dict[str, asyncio.Future[bool]] = {}
+
+    async def __call__(
+        self,
+        data: Any,  # noqa: ANN401
+        schema: str | _Schema,
+        mode: _Mode = "best",
+    ) -> _Result:
+        """Validate data against a JSON Schema document.
+
+        See `_JsonSchemaFilter.__call__`.
+        """
+        retrieved = await self._prefetch(schema)
+        return await self._run(
+            partial(self._filter, data, schema, mode),
+            blocking=not retrieved,
+        )
+
+    async def is_valid(
+        self,
+        data: Any,  # noqa: ANN401
+        schema: str | _Schema,
+    ) -> bool:
+        """Check whether data is valid against a JSON Schema document.
+
+        See `_JsonSchemaFilter.is_valid`.
+        """
+        retrieved = await self._prefetch(schema)
+        return await self._run(
+            partial(self._filter.is_valid, data, schema),
+            blocking=not retrieved,
+        )
+
+    async def validate_all(
+        self,
+        data: Iterable[Any],
+        schema: str | _Schema,
+        *,
+        lazy: bool = False,
+        fail_fast: bool = False,
+        mode: _Mode = "best",
+    ) -> list[_Result] | Iterator[_Result]:
+        """Validate many data items against one JSON Schema document.
+
+        See `_JsonSchemaFilter.validate_all`.
+        """
+        retrieved = await self._prefetch(schema)
+        return await self._run(
+            partial(
+                self._filter.validate_all,
+                data,
+                schema,
+                lazy=lazy,
+                fail_fast=fail_fast,
+                mode=mode,
+            ),
+            blocking=not retrieved,
+        )
+
+    async def validate_stream(
+        self,
+        source: Any,  # noqa: ANN401
+        schema: str | _Schema,
+        mode: _Mode = "best",
+    ) -> _Result:
+        """Validate the items of a large JSON array or object incrementally.
+
+        See `_JsonSchemaFilter.validate_stream`. The source is always read in the
+        default executor of the event loop.
+        """
+        await self._prefetch(schema)
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            partial(self._filter.validate_stream, source, schema, mode),
+        )
+
+    async def collect_errors(
+        self,
+        data: Any,  # noqa: ANN401
+        schema: str | _Schema,
+        *,
+        max_errors: int = 100,
+        unique_paths: bool = False,
+    ) -> list[CompactError]:
+        """Collect all validation errors up to a maximum number.
+
+        See `_JsonSchemaFilter.collect_errors`.
+        """
+        retrieved = await self._prefetch(schema)
+        return await self._run(
+            partial(
+                self._filter.collect_errors,
+                data,
+                schema,
+                max_errors=max_errors,
+                unique_paths=unique_paths,
+            ),
+            blocking=not retrieved,
+        )
+
+    async def _run(self, func: Callable[[], _T], *, blocking: bool = False) -> _T:
+        """Run a function of the synchronous filter.
+
+        Functions which may retrieve schema files, i.e. `blocking` ones, are always
+        run in the default executor of the event loop.
+        """
+        if not (blocking or self._filter.validate_in_executor):
+            return func()
+        return await asyncio.get_running_loop().run_in_executor(None, func)
+
+    async def _prefetch(self, schema: str | _Schema) -> bool:
+        """Retrieve the closure of all schema files referenced by a schema.
+
+        Returns:
+            Whether all schema files were retrieved. Otherwise, they are retrieved
+            again during validation, which then raises the error.
+        """
+        key, schema = self._filter._key(schema)  # noqa: SLF001
+        if key in self._filter._validators:  # noqa: SLF001
+            return True
+        return await self._retrieve_all(_iter_refs(schema, ""))
+
+    async def _retrieve_all(self, uris: Iterable[str]) -> bool:
+        retrieved = await asyncio.gather(
+            *(
+                self._retrieve(uri)
+                for uri in set(uris)
+                if uri not in self._filter._resources  # noqa: SLF001
+            ),
+        )
+        return all(retrieved)
+
+    async def _retrieve(self, uri: str) -> bool:
+        future = self._pending.get(uri)
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            future = self._pending[uri] = asyncio.ensure_future(self._load(uri))
+            future.add_done_callback(lambda _: self._pending.pop(uri, None))
+        return await future
+
+    async def _load(self, uri: str) -> bool:
+        try:
+            resource = await asyncio.get_running_loop().run_in_executor(
+                None,
+                self._filter._resolve_schema,  # noqa: SLF001
+                uri,
+            )
+        except Exception:  # noqa: BLE001
+            # The error is raised during validation if the reference is resolved.
+            return False
+        return await self._retrieve_all(_iter_refs(resource.contents, uri))
+
+
+# The validators compiled in a worker process of a process pool, keyed by tokens
+# identifying them across processes, and their regular expressions.
+_worker_validators: LRUCache[str, Validator] = LRUCache(
+    _JsonSchemaFilter.DEFAULT_CACHE_SIZE,
+)
+_worker_patterns = PatternCache()
+_worker_validator_classes: dict[type[Validator], type[Validator]] = {}
+
+
+def _validate_in_worker(
+    token: str,
+    data: Any,  # noqa: ANN401
+    mode: _Mode,
+    compile_args: bytes,
+) -> dict[str, Any] | Literal[""]:
+    """Validate data in a worker process of a process pool.
+
+    The validator is compiled from the pickled schema, the schema files it
+    references and the format checker unless the worker process has compiled it
+    before. Errors are returned as their state because they hold unpicklable type
+    checkers.
+    """
+    validator = _worker_validators.get(token)
+    if validator is None:
+        schema, documents, format_checker = pickle.loads(compile_args)  # noqa: S301
+        registry: Registry[Any] = Registry().with_resources(
+            (
+                uri,
+                Resource.from_contents(
+                    contents,
+                    default_specification=Specification.OPAQUE,
+                ),
+            )
+            for uri, contents in documents.items()
+        )
+        cls = _pattern_cache_class(
+            jsonschema.validators.validator_for(schema),
+            _worker_patterns,
+            _worker_validator_classes,
+        )
+        validator = cls(
+            schema,
+            registry=registry.crawl(),
+            format_checker=format_checker,
+        )
+        _worker_validators.set(token, validator)
+    error = _find_error(validator, data, mode)
+    return "" if error is None else _error_state(error)
+
+
+def _error_state(error: jsonschema.ValidationError) -> dict[str, Any]:
+    """Get the picklable state of a validation error and its context."""
+    cause = error.cause
+    try:
+        pickle.dumps(cause)
+    except Exception:  # noqa: BLE001
+        cause = None
+    return {
+        "message": error.message,
+        "validator": error.validator,
+        "path": list(error.relative_path),
+        "cause": cause,
+        "context": [_error_state(suberror) for suberror in error.context or ()],
+        "validator_value": error.validator_value,
+        "instance": error.instance,
+        "schema": error.schema,
+        "schema_path": list(error.relative_schema_path),
+    }
+
+
+def _error_from_state(
+    state: dict[str, Any],
+    type_checker: TypeChecker,
+) -> jsonschema.ValidationError:
+    """Recreate a validation error from its state."""
+    return jsonschema.ValidationError(
+        **{
+            **state,
+            "context": [
+                _error_from_state(substate, type_checker)
+                for substate in state["context"]
+            ],
+        },
+        type_checker=type_checker,
+    )
+
+
+def _pattern_cache_class(
+    cls: type[Validator],
+    patterns: PatternCache,
+    classes: dict[type[Validator], type[Validator]],
+) -> type[Validator]:
+    """Get the extension of a validator class which uses a pattern cache.
+
+    The extended classes are memoized in a mapping from validator classes, including
+    the extended classes themselves, to extended classes.
+    """
+    extended = classes.get(cls)
+    if extended is None:
+        extended = _use_pattern_cache(cls, patterns, classes)
+        classes[cls] = classes[extended] = extended
+    return extended
+
+
+def _use_pattern_cache(
+    cls: type[Validator],
+    patterns: PatternCache,
+    classes: dict[type[Validator], type[Validator]],
+) -> type[Validator]:
+    """Extend a validator class to look up regular expressions in a pattern cache.
+
+    The `re` module only caches a few hundred compiled regular expressions, which
+    schemas with many `pattern` and `patternProperties` keywords exceed.
+    """
+
+    def pattern(
+        validator: Validator,
+        regex: str,
+        instance: Any,  # noqa: ANN401
+        schema: _Schema,  # noqa: ARG001
+    ) -> Iterator[jsonschema.ValidationError]:
+        if validator.is_type(instance, "string") and not patterns.compile(
+            regex,
+        ).search(instance):
+            yield jsonschema.ValidationError(f"{instance!r} does not match {regex!r}")
+
+    def pattern_properties(
+        validator: Validator,
+        pattern_properties: Mapping[str, Any],
+        instance: Any,  # noqa: ANN401
+        schema: _Schema,  # noqa: ARG001
+    ) -> Iterator[jsonschema.ValidationError]:
+        if not validator.is_type(instance, "object"):
+            return
+        for regex, subschema in pattern_properties.items():
+            compiled = patterns.compile(regex)
+            for key, value in instance.items():
+                if compiled.search(key):
+                    yield from validator.descend(  # type: ignore[attr-defined]
+                        value,
+                        subschema,
+                        path=key,
+                        schema_path=regex,
+                    )
+
+    keywords = {"pattern": pattern, "patternProperties": pattern_properties}
+    extended = cast(
+        "type[Validator]",
+        jsonschema.validators.extend(  # type: ignore[no-untyped-call]
+            cls,
+            validators={
+                keyword: func
+                for keyword, func in keywords.items()
+                if keyword in cls.VALIDATORS
+            },
+        ),
+    )
+    extended.evolve = _evolve_with_pattern_cache(  # type: ignore[method-assign]
+        patterns,
+        classes,
+    )
+    return extended
+
+
+def _evolve_with_pattern_cache(
+    patterns: PatternCache,
+    classes: dict[type[Validator], type[Validator]],
+) -> Callable[..., Validator]:
+    """Create the `evolve` method of validator classes which use a pattern cache.
+
+    `jsonschema` evolves validators into the stock validator class of the dialect
+    of subschemas declaring `$schema`, e.g. the roots of referenced schema files,
+    which would bypass the pattern cache.
+    """
+
+    def evolve(validator: Validator, **changes: Any) -> Validator:  # noqa: ANN401
+        schema = changes.setdefault("schema", validator.schema)
+        cls = type(validator)
+        new_cls = _pattern_cache_class(
+            jsonschema.validators.validator_for(schema, default=cls),
+            patterns,
+            classes,
+        )
+        for field in attrs.fields(cast("type[attrs.AttrsInstance]", cls)):
+            if field.init and field.alias not in changes:
+                changes[field.alias] = getattr(validator, field.name)
+        return new_cls(**changes)
+
+    return evolve
+
+
+def _find_error(
+    validator: Validator,
+    data: Any,  # noqa: ANN401
+    mode: _Mode,
+) -> jsonschema.ValidationError | None:
+    errors = validator.iter_errors(data)
+    error: jsonschema.ValidationError | None
+    if mode == "best":
+        error = jsonschema.exceptions.best_match(errors)
+    else:
+        error = next(errors, None)
+    return error
+
+
+def _exceeds(data: object, threshold: int) -> bool:
+    """Check whether data consists of more JSON values than the threshold."""
+    count = 0
+    pending = [data]
+    while pending:
+        count += 1
+        if count > threshold:
+            return True
+        value = pending.pop()
+        if isinstance(value, Mapping):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+def _dispatch(
+    environment: Environment,
+    func: Callable[_P, _T],
+    async_func: Callable[_P, Awaitable[_T]],
+) -> Callable[_P, _T | Awaitable[_T]]:
+    """Create a function which calls the async variant in async environments."""
+
+    @wraps(func)
+    def dispatch(*args: _P.args, **kwargs: _P.kwargs) -> _T | Awaitable[_T]:
+        if environment.is_async:
+            return async_func(*args, **kwargs)
+        return func(*args, **kwargs)
+
+    # Prevent Jinja2 from evaluating the function at compile time in async mode,
+    # like its own filters created with `jinja2.async_utils.async_variant`.
+    dispatch.jinja_async_variant = True  # type: ignore[attr-defined]
+    return dispatch
+
+
+@contextmanager
+def _iter_stream(source: object) -> Iterator[Iterator[tuple[int | str, Any]]]:
+    """Iterate over the keys and values of the items of a streamed document."""
+    if hasattr(source, "read"):
+        yield stream.iter_items(stream.iter_chunks(source))
+    elif isinstance(source, os.PathLike):
+        with Path(source).open("rb") as f:
+            yield stream.iter_items(stream.iter_chunks(f))
+    elif isinstance(source, Mapping):
+        yield iter(source.items())
+    elif isinstance(source, Iterable) and not isinstance(source, (str, bytes)):
+        yield enumerate(source)
+    else:
+        msg = f"Cannot stream data of type {type(source).__name__}"
+        raise TypeError(msg)
+
+
+@contextmanager
+def _reraise_extension_errors() -> Iterator[None]:
+    """Re-raise extension errors which caused unresolvable schema references."""
+    try:
+        yield
+    except Unresolvable as exc:
+        _exc: BaseException = exc
+        while _exc.__context__:
+            if isinstance(_exc.__context__, JsonSchemaExtensionError):
+                raise _exc.__context__ from None
+            _exc = _exc.__context__
+        raise
+
+
+def _register(
+    registry: dict[str, Any],
+    kind: str,
+    name: str,
+    func: Callable[..., Any],
+) -> None:
+    """Register a filter or test unless the name is already taken."""
+    if name in registry:
+        warn(
+            f'A {kind} named "{name}" already exists in the Jinja2 environment',
+            category=RuntimeWarning,
+            stacklevel=3,
+        )
+    else:
+        registry[name] = func
+
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+# The specification of the default dialect of schemas without a `$schema` keyword.
+_DEFAULT_SPECIFICATION = specification_with(
+    jsonschema.validators.validator_for({}).META_SCHEMA["$schema"],
+)
+
+
+def _iter_refs(contents: object, base_uri: str) -> Iterator[str]:
+    """Iterate over the URIs of all schema files referenced by a schema document.
+
+    Only subschemas are searched, so references within instance data like `const`
+    or `examples` are skipped. The URIs are resolved against the base URI, which is
+    updated by the identifier keyword of the dialect (`$id` or `id`), and stripped
+    of their fragments. References within the document itself are skipped.
+    """
+    if isinstance(contents, Mapping):
+        resource = Resource.from_contents(
+            contents,
+            default_specification=_DEFAULT_SPECIFICATION,
+        )
+        yield from _iter_resource_refs(resource, base_uri)
+
+
+def _iter_resource_refs(resource: Resource[Any], base_uri: str) -> Iterator[str]:
+    try:
+        schema_id = resource.id()
+        subresources = list(resource.subresources())
+    except (AttributeError, TypeError):
+        # Malformed schemas are reported when they are checked.
+        return
+    if isinstance(schema_id, str):
+        base_uri = urljoin(base_uri, schema_id)
+    for keyword in ("$ref", "$dynamicRef"):
+        ref = resource.contents.get(keyword)
+        if isinstance(ref, str):
+            uri, _ = urldefrag(urljoin(base_uri, ref))
+            if uri and uri != urldefrag(base_uri)[0]:
+                yield uri
+    for subresource in subresources:
+        if isinstance(subresource.contents, Mapping):
+            yield from _iter_resource_refs(subresource, base_uri)
@@ -0,0 +1,156 @@
+"""Instrumentation of schema resolution and validation."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+from typing import Literal
+from typing import Protocol
+
+__all__ = ["CacheEvent", "Observer", "PhaseEvent", "StatsCollector"]
+
+Phase = Literal["fetch", "read", "parse", "check", "validate"]
+Cache = Literal["validator", "schema", "http"]
+
+
+@dataclass(frozen=True)
+class PhaseEvent:
+    """Completed phase of schema resolution or validation."""
+
+    phase: Phase
+    """The phase.
+
+    - `"fetch"`: Retrieving a remote schema file, including the HTTP cache.
+    - `"read"`: Reading a local schema file via the Jinja2 loader.
+    - `"parse"`: Parsing a schema file.
+    - `"check"`: Checking a schema against its meta-schema.
+    - `"validate"`: Validating data against a schema.
+    """
+
+    uri: str | None
+    """The URI of the schema file or schema, or `None` for inline schemas."""
+
+    duration: float
+    """The duration of the phase in seconds."""
+
+    size: int | None = None
+    """The size of the fetched, read or parsed schema file in bytes."""
+
+
+@dataclass(frozen=True)
+class CacheEvent:
+    """Cache lookup."""
+
+    cache: Cache
+    """The cache.
+
+    - `"validator"`: The cache of compiled validators.
+    - `"schema"`: The retrieved schema files.
+    - `"http"`: The on-disk cache for remote schema files, if configured.
+    """
+
+    key: str
+    """The cache key, i.e. an URI or a fingerprint of an inline schema."""
+
+    hit: bool
+    """Whether the lookup was a hit."""
+
+
+class Observer(Protocol):
+    """Protocol for observers of schema resolution and validation.
+
+    Observers may be notified from multiple threads concurrently.
+    """
+
+    def on_phase(self, event: PhaseEvent) -> None:
+        """Handle a completed phase.
+
+        Args:
+            event:
+                The phase event.
+        """
+        ...
+
+    def on_cache(self, event: CacheEvent) -> None:
+        """Handle a cache lookup.
+
+        Args:
+            event:
+                The cache event.
+        """
+        ...
+
+
+class StatsCollector:
+    """Thread-safe observer which aggregates events in memory.
+
+    The aggregated statistics can be dumped, e.g. after rendering a template, for
+    exporting them to a metrics system.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._phases: dict[str, dict[str, float]] = {}
+        self._caches: dict[str, dict[str, int]] = {}
+
+    def on_phase(self, event: PhaseEvent) -> None:
+        """Handle a completed phase.
+
+        Args:
+            event:
+                The phase event.
+        """
+        with self._lock:
+            stats = self._phases.get(event.phase)
+            if stats is None:
+                stats = self._phases[event.phase] = {
+                    "count": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "bytes": 0,
+                }
+            stats["count"] += 1
+            stats["total_seconds"] += event.duration
+            stats["max_seconds"] = max(stats["max_seconds"], event.duration)
+            stats["bytes"] += event.size or 0
+
+    def on_cache(self, event: CacheEvent) -> None:
+        """Handle a cache lookup.
+
+        Args:
+            event:
+                The cache event.
+        """
+        with self._lock:
+            stats = self._caches.setdefault(event.cache, {"hits": 0, "misses": 0})
+            stats["hits" if event.hit else "misses"] += 1
+
+    def snapshot(self, *, reset: bool = False) -> dict[str, Any]:
+        """Dump the aggregated statistics.
+
+        Args:
+            reset:
+                Whether to reset the statistics afterwards.
+
+        Returns:
+            A JSON-serializable mapping with the keys `"phases"`, mapping each
+            observed phase to its count, total and maximum duration in seconds and
+            total size in bytes, and `"caches"`, mapping each observed cache to its
+            numbers of hits and misses.
+        """
+        with self._lock:
+            snapshot = {
+                "phases": {phase: dict(stats) for phase, stats in self._phases.items()},
+                "caches": {cache: dict(stats) for cache, stats in self._caches.items()},
+            }
+            if reset:
+                self._phases.clear()
+                self._caches.clear()
+        return snapshot
+
+    def reset(self) -> None:
+        """Reset the statistics."""
+        with self._lock:
+            self._phases.clear()
+            self._caches.clear()
@@ -0,0 +1,51 @@
+"""Reports of preloaded schemas."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+__all__ = ["PreloadReport", "PreloadedSchema"]
+
+
+@dataclass(frozen=True)
+class PreloadedSchema:
+    """Schema which was compiled ahead of validation."""
+
+    uri: str
+    """The URI of the schema."""
+
+    duration: float
+    """The duration of checking and compiling the schema in seconds."""
+
+    documents: tuple[str, ...]
+    """The URIs of the schema file and all schema files it references,
+    transitively."""
+
+
+@dataclass(frozen=True)
+class PreloadReport:
+    """Report of `JsonSchemaExtension.preload()`."""
+
+    schemas: tuple[PreloadedSchema, ...]
+    """The compiled schemas in the given order."""
+
+    documents: Mapping[str, float] = field(default_factory=dict)
+    """The durations of retrieving and parsing the schema files which were not
+    loaded before in seconds, keyed by their URIs."""
+
+    errors: Mapping[str, Exception] = field(default_factory=dict)
+    """The errors of schema files which could not be retrieved and of schemas
+    which could not be compiled, keyed by their URIs."""
+
+    duration: float = 0.0
+    """The total duration of preloading in seconds."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether all schemas and schema files were preloaded without errors."""
+        return not self.errors
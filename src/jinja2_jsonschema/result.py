@@ -0,0 +1,97 @@
+"""Compact validation results."""
+
+from __future__ import annotations
+
+import pprint
+from functools import cached_property
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import jsonschema
+
+__all__ = ["CompactError", "ErrorFormat"]
+
+ErrorFormat = Literal["full", "compact"]
+
+
+class CompactError:
+    """Compact, lazily formatted result of a failed validation.
+
+    Unlike a `jsonschema.ValidationError`, it renders as a short message with the
+    locations of the error in the data and the schema, without dumping the data
+    and the schema, and truncated to a maximum length. All details are formatted
+    only when accessed.
+    """
+
+    def __init__(self, error: jsonschema.ValidationError, max_length: int) -> None:
+        """Create a new compact error.
+
+        Args:
+            error:
+                The validation error.
+            max_length:
+                The maximum length of the rendered error.
+        """
+        self.error = error
+        """The underlying validation error."""
+
+        self.max_length = max_length
+        """The maximum length of the rendered error."""
+
+    @property
+    def message(self) -> str:
+        """The error message."""
+        return self.error.message
+
+    @property
+    def keyword(self) -> str:
+        """The failed schema keyword, e.g. `"minimum"`."""
+        return str(self.error.validator)
+
+    @cached_property
+    def path(self) -> str:
+        """The JSON pointer to the invalid part of the data, e.g. `"/items/0"`."""
+        return _json_pointer(self.error.absolute_path)
+
+    @cached_property
+    def schema_path(self) -> str:
+        """The JSON pointer to the failed schema keyword."""
+        return _json_pointer(self.error.absolute_schema_path)
+
+    @property
+    def instance(self) -> Any:  # noqa: ANN401
+        """The invalid part of the data."""
+        return self.error.instance
+
+    def format_instance(self) -> str:
+        """Format the whole invalid part of the data, which may be large.
+
+        Returns:
+            The pretty-printed invalid part of the data.
+        """
+        return pprint.pformat(self.error.instance, width=72, sort_dicts=False)
+
+    def __str__(self) -> str:
+        """Render the error, truncated to the maximum length."""
+        text = (
+            f"{self.message}\n\n"
+            f"Failed validating {self.keyword!r} at {self.schema_path or '/'} "
+            f"on instance at {self.path or '/'}"
+        )
+        if len(text) > self.max_length:
+            text = f"{text[: max(self.max_length - 3, 0)]}..."
+        return text
+
+    def __repr__(self) -> str:
+        """Represent the error compactly."""
+        return f"<{type(self).__name__}: {self.keyword!r} at {self.path or '/'}>"
+
+
+def _json_pointer(path: Iterable[str | int]) -> str:
+    return "".join(
+        f"/{str(part).replace('~', '~0').replace('/', '~1')}" for part in path
+    )
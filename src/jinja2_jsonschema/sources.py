@@ -0,0 +1,156 @@
+"""Sources of schema files for custom URI schemes.
+
+Sources are registered for a URI scheme via
+`JsonSchemaExtension.register_source()`, e.g. for loading schema files from
+package data, from memory or from a pre-built archive instead of via the Jinja2
+loader or HTTP.
+"""
+
+from __future__ import annotations
+
+import zipfile
+from importlib import resources
+from threading import Lock
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Protocol
+from urllib.parse import urlsplit
+
+from .errors import SchemaFileNotFoundError
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Mapping
+
+__all__ = ["MemorySource", "PackageSource", "SchemaSource", "ZipSource"]
+
+
+class SchemaSource(Protocol):
+    """Protocol for sources of schema files."""
+
+    def read(self, uri: str) -> str | bytes | Mapping[str, Any]:
+        """Read a schema file.
+
+        Args:
+            uri:
+                The URI of the schema file.
+
+        Returns:
+            The raw contents of the schema file, which are parsed according to
+            its file extension, or the parsed schema document.
+
+        Raises:
+            SchemaFileNotFoundError:
+                The schema file does not exist.
+        """
+        ...
+
+
+class PackageSource:
+    """Source of schema files in package data, e.g. `pkg://package/schema.json`.
+
+    The host of the URI is the name of the package, and the path of the URI is the
+    path of the schema file in the package, read via `importlib.resources`.
+    """
+
+    def read(self, uri: str) -> bytes:
+        """Read a schema file.
+
+        Args:
+            uri:
+                The URI of the schema file.
+
+        Returns:
+            The raw contents of the schema file.
+
+        Raises:
+            SchemaFileNotFoundError:
+                The package or the schema file does not exist.
+        """
+        parts = urlsplit(uri)
+        try:
+            resource = resources.files(parts.netloc).joinpath(parts.path.lstrip("/"))
+            return resource.read_bytes()
+        except (ModuleNotFoundError, OSError) as exc:
+            raise SchemaFileNotFoundError(uri) from exc
+
+
+class MemorySource:
+    """Source of schema documents in memory, e.g. `mem://schemas/person.json`.
+
+    The documents are keyed by their URIs without the scheme, e.g.
+    `schemas/person.json`.
+    """
+
+    def __init__(self, documents: Mapping[str, Any]) -> None:
+        """Create a new memory source.
+
+        Args:
+            documents:
+                A mapping from URIs without the scheme to schema documents.
+        """
+        self.documents = documents
+
+    def read(self, uri: str) -> Mapping[str, Any]:
+        """Read a schema document.
+
+        Args:
+            uri:
+                The URI of the schema document.
+
+        Returns:
+            The schema document.
+
+        Raises:
+            SchemaFileNotFoundError:
+                The schema document does not exist.
+        """
+        parts = urlsplit(uri)
+        try:
+            document: Mapping[str, Any] = self.documents[f"{parts.netloc}{parts.path}"]
+        except KeyError:
+            raise SchemaFileNotFoundError(uri) from None
+        return document
+
+
+class ZipSource:
+    """Source of schema files in a ZIP archive, e.g. `zip:///person.json`.
+
+    The path of the URI is the path of the schema file in the archive. The archive
+    is opened once and kept open until the source is closed.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open a ZIP archive.
+
+        Args:
+            path:
+                The path of the ZIP archive.
+        """
+        self._archive = zipfile.ZipFile(path)
+        self._lock = Lock()
+
+    def read(self, uri: str) -> bytes:
+        """Read a schema file.
+
+        Args:
+            uri:
+                The URI of the schema file.
+
+        Returns:
+            The raw contents of the schema file.
+
+        Raises:
+            SchemaFileNotFoundError:
+                The schema file does not exist in the archive.
+        """
+        name = urlsplit(uri).path.lstrip("/")
+        try:
+            with self._lock:
+                return self._archive.read(name)
+        except KeyError:
+            raise SchemaFileNotFoundError(uri) from None
+
+    def close(self) -> None:
+        """Close the ZIP archive."""
+        self._archive.close()
@@ -0,0 +1,181 @@
+"""Incremental parsing of large JSON documents.
+
+The items of a top-level JSON array or the members of a top-level JSON object are
+parsed one at a time from chunks of the document, so that memory is bounded by the
+largest item instead of the whole document.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NoReturn
+
+from .errors import InvalidStreamError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+__all__ = ["DEFAULT_CHUNK_SIZE", "iter_chunks", "iter_items"]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+_VALUE_START = frozenset('"-0123456789tfn[{')
+_NUMBER_TAIL = re.compile(r"[0-9+\-.eE]*")
+# The maximum length of an incomplete literal, number or escape sequence at the end
+# of the buffer at which decoding fails, e.g. `fals`, `1e+` or `\u00e`.
+_MAX_INCOMPLETE_TOKEN = 8
+
+
+def iter_chunks(file: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:  # noqa: ANN401
+    """Read a text or binary file in chunks.
+
+    Binary files are decoded as UTF-8.
+
+    Args:
+        file:
+            The file object.
+        chunk_size:
+            The size of the chunks to read.
+
+    Yields:
+        The decoded chunks.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while chunk := file.read(chunk_size):
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+    if tail := decoder.decode(b"", final=True):
+        yield tail
+
+
+def iter_items(chunks: Iterable[str]) -> Iterator[tuple[int | str, Any]]:
+    """Parse the items of a top-level JSON array or object incrementally.
+
+    Args:
+        chunks:
+            The chunks of the JSON document.
+
+    Yields:
+        For an array, pairs of the index and the value of each item, and for an
+        object, pairs of the name and the value of each member.
+    """
+    return _Parser(iter(chunks)).parse()
+
+
+class _Parser:
+    def __init__(self, chunks: Iterator[str]) -> None:
+        self._chunks = chunks
+        self._buffer = ""
+        self._pos = 0
+        # The number of characters before the buffer, for error positions.
+        self._consumed = 0
+        self._eof = False
+
+    def parse(self) -> Iterator[tuple[int | str, Any]]:
+        start = self._next_char()
+        if start not in ("[", "{"):
+            self._fail("expected an array or an object")
+        self._pos += 1
+        end = "]" if start == "[" else "}"
+
+        if self._next_char() == end:
+            self._pos += 1
+        else:
+            index = 0
+            while True:
+                if start == "[":
+                    key: int | str = index
+                else:
+                    key = self._decode()
+                    if not isinstance(key, str):
+                        self._fail("expected a member name")
+                    self._expect(":")
+                yield key, self._decode()
+                index += 1
+                separator = self._next_char()
+                self._pos += 1
+                if separator == end:
+                    break
+                if separator != ",":
+                    self._pos -= 1
+                    self._fail(f'expected "," or "{end}"')
+
+        if self._next_char() != "":
+            self._fail("unexpected data after the document")
+
+    def _next_char(self) -> str:
+        """Skip whitespace and peek at the next character, or "" at the end."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buffer) or not self._read(1):
+                return self._buffer[self._pos : self._pos + 1]
+
+    def _expect(self, char: str) -> None:
+        if self._next_char() != char:
+            self._fail(f'expected "{char}"')
+        self._pos += 1
+
+    def _decode(self) -> Any:  # noqa: ANN401
+        self._next_char()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as exc:
+                if self._eof or not self._is_incomplete(exc):
+                    self._pos = exc.pos
+                    self._fail(exc.msg)
+            else:
+                # A number at the end of the buffer may continue in the next chunk.
+                if (
+                    self._eof
+                    or type(value) not in (int, float)
+                    or _NUMBER_TAIL.match(self._buffer, end).end() < len(self._buffer)  # type: ignore[union-attr]
+                ):
+                    self._pos = end
+                    return value
+            # Read at least as much as is buffered, so that retrying to decode a
+            # large value takes linear time overall.
+            self._read(len(self._buffer) - self._pos)
+
+    def _is_incomplete(self, exc: json.JSONDecodeError) -> bool:
+        """Check whether decoding failed only because the value continues.
+
+        Malformed values fail right away instead of reading the rest of the
+        document in search of their end.
+        """
+        if (
+            # Values are never malformed at their start only because they are
+            # incomplete.
+            exc.pos == self._pos
+            and self._buffer[self._pos : self._pos + 1] not in _VALUE_START
+        ):
+            return False
+        return (
+            exc.msg.startswith("Unterminated string")
+            or len(self._buffer) - exc.pos <= _MAX_INCOMPLETE_TOKEN
+        )
+
+    def _read(self, size: int) -> bool:
+        """Read chunks of at least the given total size, returning whether any."""
+        parts = [self._buffer[self._pos :]]
+        read = 0
+        while read < size or read == 0:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                break
+            parts.append(chunk)
+            read += len(chunk)
+        self._buffer = "".join(parts)
+        self._consumed += self._pos
+        self._pos = 0
+        return read > 0
+
+    def _fail(self, reason: str) -> NoReturn:
+        raise InvalidStreamError(reason, self._consumed + self._pos)
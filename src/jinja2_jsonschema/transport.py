@@ -0,0 +1,276 @@
+"""HTTP transports for retrieving remote schema files."""
+
+from __future__ import annotations
+
+import http.client
+import socket
+from dataclasses import dataclass
+from dataclasses import field
+from http import HTTPStatus
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version
+from threading import Lock
+from typing import TYPE_CHECKING
+from typing import Protocol
+from urllib.error import HTTPError
+from urllib.parse import urljoin
+from urllib.parse import urlsplit
+from urllib.request import Request
+from urllib.request import getproxies
+from urllib.request import proxy_bypass
+from urllib.request import urlopen
+
+if TYPE_CHECKING:
+    import ssl
+    from collections.abc import Mapping
+    from email.message import Message
+    from urllib.parse import SplitResult
+
+__all__ = ["PooledTransport", "Response", "Transport", "UrllibTransport"]
+
+try:
+    _USER_AGENT = f"jinja2-jsonschema/{version('jinja2-jsonschema')}"
+except PackageNotFoundError:  # pragma: no cover
+    _USER_AGENT = "jinja2-jsonschema"
+
+_REDIRECT_STATUSES = frozenset(
+    {
+        HTTPStatus.MOVED_PERMANENTLY,
+        HTTPStatus.FOUND,
+        HTTPStatus.SEE_OTHER,
+        HTTPStatus.TEMPORARY_REDIRECT,
+        HTTPStatus.PERMANENT_REDIRECT,
+    },
+)
+
+
+@dataclass(frozen=True)
+class Response:
+    """HTTP response."""
+
+    status: int
+    """The response status code."""
+
+    headers: Mapping[str, str] = field(default_factory=dict)
+    """The response headers with lowercase names."""
+
+    body: bytes = b""
+    """The raw response body."""
+
+
+class Transport(Protocol):
+    """Protocol for HTTP transports.
+
+    A transport performs HTTP `GET` requests and returns responses of any status
+    code. Connection failures are signaled by raising an `OSError`.
+    """
+
+    def fetch(self, url: str, headers: Mapping[str, str]) -> Response:
+        """Perform an HTTP `GET` request.
+
+        Args:
+            url:
+                The request URL.
+            headers:
+                The request headers.
+
+        Returns:
+            The response after following redirects.
+        """
+        ...
+
+
+class UrllibTransport:
+    """HTTP transport using `urllib` which opens a new connection per request.
+
+    Requests have a `User-Agent` header of this library unless one is given.
+    """
+
+    def fetch(self, url: str, headers: Mapping[str, str]) -> Response:
+        """Perform an HTTP `GET` request.
+
+        Args:
+            url:
+                The request URL.
+            headers:
+                The request headers.
+
+        Returns:
+            The response after following redirects.
+        """
+        request = Request(url, headers=_with_user_agent(headers))  # noqa: S310
+        try:
+            with urlopen(request) as response:  # noqa: S310
+                return Response(
+                    response.status,
+                    _lowercase_headers(response.headers),
+                    response.read(),
+                )
+        except HTTPError as exc:
+            with exc:
+                return Response(exc.code, _lowercase_headers(exc.headers), exc.read())
+
+
+class PooledTransport:
+    """HTTP transport which keeps persistent connections per host.
+
+    Connections are reused across requests to the same host, so that schemas which
+    are split into many files on one host pay the TCP/TLS handshake cost only once.
+    Requests to hosts which must be reached via a proxy are delegated to
+    `UrllibTransport`. Requests have a `User-Agent` header of this library unless
+    one is given.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 4,
+        timeout: float | None = None,
+        context: ssl.SSLContext | None = None,
+        max_redirects: int = 10,
+    ) -> None:
+        """Create a new pooled HTTP transport.
+
+        Args:
+            maxsize:
+                The maximum number of idle connections kept per host.
+            timeout:
+                The timeout of blocking connection operations in seconds, or `None`
+                for the default timeout of new sockets, which is set via
+                `socket.setdefaulttimeout()` and disabled by default.
+            context:
+                The SSL context for HTTPS connections.
+            max_redirects:
+                The maximum number of redirects to follow per request.
+        """
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.context = context
+        self.max_redirects = max_redirects
+        self._lock = Lock()
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self._fallback = UrllibTransport()
+
+    def fetch(self, url: str, headers: Mapping[str, str]) -> Response:
+        """Perform an HTTP `GET` request.
+
+        Args:
+            url:
+                The request URL.
+            headers:
+                The request headers.
+
+        Returns:
+            The response after following redirects.
+
+        Raises:
+            http.client.HTTPException:
+                Too many redirects.
+        """
+        for _ in range(self.max_redirects + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or _is_proxied(
+                parts.scheme,
+                parts.hostname,
+            ):
+                return self._fallback.fetch(url, headers)
+
+            response = self._request(parts, headers)
+            location = response.headers.get("location")
+            if response.status not in _REDIRECT_STATUSES or location is None:
+                return response
+            url = urljoin(url, location)
+
+        msg = f"Too many redirects: {url}"
+        raise http.client.HTTPException(msg)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _request(self, parts: SplitResult, headers: Mapping[str, str]) -> Response:
+        scheme, netloc = parts.scheme, parts.netloc
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+
+        connection, reused = self._checkout(scheme, netloc)
+        try:
+            try:
+                response, body = self._send(connection, target, headers)
+            except (http.client.RemoteDisconnected, ConnectionError):
+                # The server may have closed an idle connection in the meantime.
+                if not reused:
+                    raise
+                connection.close()
+                response, body = self._send(connection, target, headers)
+        except BaseException:
+            connection.close()
+            raise
+
+        self._checkin(scheme, netloc, connection, reuse=not response.will_close)
+        return Response(response.status, _lowercase_headers(response.headers), body)
+
+    @staticmethod
+    def _send(
+        connection: http.client.HTTPConnection,
+        target: str,
+        headers: Mapping[str, str],
+    ) -> tuple[http.client.HTTPResponse, bytes]:
+        connection.request("GET", target, headers=_with_user_agent(headers))
+        response = connection.getresponse()
+        return response, response.read()
+
+    def _checkout(
+        self,
+        scheme: str,
+        netloc: str,
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        timeout = socket.getdefaulttimeout() if self.timeout is None else self.timeout
+        if scheme == "https":
+            connection: http.client.HTTPConnection = http.client.HTTPSConnection(
+                netloc,
+                timeout=timeout,
+                context=self.context,
+            )
+        else:
+            connection = http.client.HTTPConnection(netloc, timeout=timeout)
+        return connection, False
+
+    def _checkin(
+        self,
+        scheme: str,
+        netloc: str,
+        connection: http.client.HTTPConnection,
+        *,
+        reuse: bool,
+    ) -> None:
+        if reuse:
+            with self._lock:
+                idle = self._idle.setdefault((scheme, netloc), [])
+                if len(idle) < self.maxsize:
+                    idle.append(connection)
+                    return
+        connection.close()
+
+
+def _is_proxied(scheme: str, host: str | None) -> bool:
+    return scheme in getproxies() and not (host and proxy_bypass(host))
+
+
+def _with_user_agent(headers: Mapping[str, str]) -> dict[str, str]:
+    if any(name.lower() == "user-agent" for name in headers):
+        return dict(headers)
+    return {**headers, "User-Agent": _USER_AGENT}
+
+
+def _lowercase_headers(headers: Message) -> dict[str, str]:
+    return {name.lower(): value for name, value in headers.items()}
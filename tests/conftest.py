@@ -2,17 +2,16 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
 from contextlib import closing
 from functools import partial
 from http.server import SimpleHTTPRequestHandler
-from pathlib import Path
 from socket import SOCK_STREAM
 from socket import socket
-from socketserver import TCPServer
+from socketserver import ThreadingTCPServer
 from threading import Thread
 from time import sleep
 from typing import TYPE_CHECKING
+from typing import Protocol
 from typing import cast
 from urllib.error import URLError
 from urllib.request import Request
@@ -21,7 +20,9 @@ from urllib.request import urlopen
 import pytest
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from collections.abc import Iterator
+    from pathlib import Path
 
 
 def get_unused_tcp_port() -> int:
@@ -35,7 +36,25 @@ def get_unused_tcp_port() -> int:
         return cast("int", sock.getsockname()[1])
 
 
-HTTPServerFactory = Callable[[Path], str]
+class HTTPServerFactory(Protocol):
+    """A factory for local HTTP servers serving a directory."""
+
+    def __call__(
+        self,
+        directory: Path,
+        handler_class: type[SimpleHTTPRequestHandler] = ...,
+    ) -> str:
+        """Start a local HTTP server.
+
+        Args:
+            directory:
+                The directory to serve.
+            handler_class:
+                The request handler class.
+
+        Returns:
+            The server URL.
+        """
 
 
 @pytest.fixture
@@ -48,12 +67,16 @@ def http_server_factory() -> Iterator[HTTPServerFactory]:
     server_host = "127.0.0.1"
     server_disposers: list[Callable[[], None]] = []
 
-    def create(directory: Path) -> str:
+    def create(
+        directory: Path,
+        handler_class: type[SimpleHTTPRequestHandler] = SimpleHTTPRequestHandler,
+    ) -> str:
         server_port = get_unused_tcp_port()
-        server = TCPServer(
+        server = ThreadingTCPServer(
             (server_host, server_port),
-            partial(SimpleHTTPRequestHandler, directory=str(directory)),
+            partial(handler_class, directory=str(directory)),
         )
+        server.daemon_threads = True
         server_disposers.append(server.shutdown)
         server_thread = Thread(target=server.serve_forever)
         server_thread.daemon = True
@@ -0,0 +1,149 @@
+"""Tests for memory-mapped schema archives."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from jinja2_jsonschema.__main__ import main
+from jinja2_jsonschema.archive import SchemaArchive
+from jinja2_jsonschema.archive import build_archive
+from jinja2_jsonschema.errors import InvalidArchiveError
+from jinja2_jsonschema.errors import SchemaFileNotFoundError
+from tests.test.utils import TEST_CASES
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def schema_tree(tmp_path: Path) -> Path:
+    """Create a tree of schema files with references.
+
+    Args:
+        tmp_path:
+            The temporary directory.
+
+    Returns:
+        The root directory of the schema files.
+    """
+    root = tmp_path / "schemas"
+    build_file_tree(
+        {
+            (root / "schema.json"): serialize(
+                {
+                    "$schema": "http://json-schema.org/draft-07/schema#",
+                    "type": "object",
+                    "properties": {"age": {"$ref": "defs/age.yaml"}},
+                },
+                "json",
+            ),
+            (root / "defs" / "age.yaml"): serialize(
+                {"type": "integer", "minimum": 0},
+                "yaml",
+            ),
+            (root / "template.jinja"): "{{ data }}",
+        },
+    )
+    return root
+
+
+def test_archive(tmp_path: Path, schema_tree: Path) -> None:
+    """Test that schema files are read from an archive instead of the loader."""
+    archive_path = tmp_path / "schemas.jsa"
+    assert build_archive(schema_tree, archive_path) == 2  # noqa: PLR2004
+    archive = SchemaArchive(archive_path)
+    assert sorted(archive) == ["defs/age.yaml", "schema.json"]
+    assert "template.jinja" not in archive
+
+    env = create_env(tmp_path)
+    get_extension(env).configure(schema_archive=archive)
+    tpl = env.from_string("{{ data is jsonschema('schema.json') }}")
+    for data, message in TEST_CASES:
+        assert tpl.render(data=data) == message
+
+    with pytest.raises(SchemaFileNotFoundError):
+        env.from_string("{{ data is jsonschema('missing.json') }}").render(data={})
+    archive.close()
+
+
+def test_fallback_to_loader(tmp_path: Path, schema_tree: Path) -> None:
+    """Test that schema files missing from the archive are read via the loader."""
+    archive_path = tmp_path / "schemas.jsa"
+    build_archive(schema_tree, archive_path, ["schema.json"])
+    archive = SchemaArchive(archive_path)
+
+    env = create_env(schema_tree)
+    get_extension(env).configure(schema_archive=archive)
+    tpl = env.from_string("{{ data is jsonschema('schema.json') }}")
+    for data, message in TEST_CASES:
+        assert tpl.render(data=data) == message
+    archive.close()
+
+
+def test_read(tmp_path: Path, schema_tree: Path) -> None:
+    """Test that schema files are read as views of the archive."""
+    archive_path = tmp_path / "schemas.jsa"
+    build_archive(schema_tree, archive_path)
+    archive = SchemaArchive(archive_path)
+
+    view = archive.read("defs/age.yaml")
+    assert view is not None
+    with view:
+        assert view.readonly
+        assert bytes(view) == (schema_tree / "defs" / "age.yaml").read_bytes()
+    assert archive.read("missing.json") is None
+    assert len(archive) == 2  # noqa: PLR2004
+    archive.close()
+
+
+@pytest.mark.parametrize(
+    ("contents", "reason"),
+    [
+        (b"", "empty file"),
+        (b"JSSCHEMA", "truncated header"),
+        (b"NOT A SCHEMA ARCHIVE", "not a schema archive"),
+        (b"JSSCHEMA\x02\x00\x00\x00\x00\x00\x00\x00", "unsupported version 2"),
+        (b"JSSCHEMA\x01\x00\x00\x00\x02\x00\x00\x00{", "invalid index"),
+        (b'JSSCHEMA\x01\x00\x00\x00\x0e\x00\x00\x00{"a":[0,1000]}', "invalid index"),
+    ],
+)
+def test_invalid(tmp_path: Path, contents: bytes, reason: str) -> None:
+    """Test that invalid archives are rejected."""
+    archive_path = tmp_path / "schemas.jsa"
+    archive_path.write_bytes(contents)
+
+    with pytest.raises(InvalidArchiveError, match=reason):
+        SchemaArchive(archive_path)
+
+
+def test_cli(
+    tmp_path: Path,
+    schema_tree: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test building an archive via the CLI."""
+    archive_path = tmp_path / "schemas.jsa"
+    assert (
+        main(
+            [
+                "archive",
+                str(schema_tree),
+                "--pattern",
+                "*.json",
+                "--output",
+                str(archive_path),
+            ],
+        )
+        == 0
+    )
+    assert capsys.readouterr().err == "Archived 1 schema files\n"
+
+    archive = SchemaArchive(archive_path)
+    assert list(archive) == ["schema.json"]
+    archive.close()
@@ -0,0 +1,158 @@
+"""Tests for validation in Jinja2 environments with async mode."""
+
+from __future__ import annotations
+
+import asyncio
+from http.server import SimpleHTTPRequestHandler
+from threading import Lock
+from threading import get_ident
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import jsonschema
+import pytest
+
+from jinja2_jsonschema.errors import SchemaFileNotFoundError
+from jinja2_jsonschema.extension import _JsonSchemaFilter
+from tests.filter.utils import TEST_CASES as FILTER_TEST_CASES
+from tests.test.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+
+    from tests.conftest import HTTPServerFactory
+
+
+@pytest.mark.parametrize(("data", "message"), FILTER_TEST_CASES)
+def test_filter(tmp_path: Path, data: Any, message: str) -> None:
+    """Test the filter in an async environment."""
+    build_file_tree({(tmp_path / "schema.json"): serialize(SCHEMA, "json")})
+    env = create_env(tmp_path, enable_async=True)
+    tpl = env.from_string("{{ data | jsonschema('schema.json') }}")
+    assert asyncio.run(tpl.render_async(data=data)) == message
+
+
+def test_test_and_filter_all(tmp_path: Path) -> None:
+    """Test the test and the batch filter in an async environment."""
+    build_file_tree({(tmp_path / "schema.json"): serialize(SCHEMA, "json")})
+    env = create_env(tmp_path, enable_async=True)
+    tpl = env.from_string(
+        "{{ data is jsonschema('schema.json') }}"
+        "{{ [data, data] | jsonschema_all('schema.json') | reject | list | length }}",
+    )
+    for data, message in TEST_CASES:
+        expected = f"{message}{2 if message == 'True' else 0}"
+        assert asyncio.run(tpl.render_async(data=data)) == expected
+
+
+def test_missing_schema(tmp_path: Path) -> None:
+    """Test that errors are raised in an async environment."""
+    env = create_env(tmp_path, enable_async=True)
+    tpl = env.from_string("{{ {} | jsonschema('missing.json') }}")
+    with pytest.raises(SchemaFileNotFoundError):
+        asyncio.run(tpl.render_async())
+
+
+def test_failed_retrieval_off_loop(tmp_path: Path) -> None:
+    """Test that schema files which failed to load are not retried on the loop."""
+    threads: list[int] = []
+    resolve_schema = _JsonSchemaFilter._resolve_schema  # noqa: SLF001
+
+    def record_thread(*args: Any) -> Any:
+        threads.append(get_ident())
+        return resolve_schema(*args)
+
+    env = create_env(tmp_path, enable_async=True)
+    tpl = env.from_string("{{ {} | jsonschema('missing.json') }}")
+    with (
+        mock.patch.object(
+            _JsonSchemaFilter,
+            "_resolve_schema",
+            autospec=True,
+            side_effect=record_thread,
+        ),
+        pytest.raises(SchemaFileNotFoundError),
+    ):
+        asyncio.run(tpl.render_async())
+
+    assert threads
+    assert get_ident() not in threads
+
+
+def test_concurrent_retrieval(
+    tmp_path: Path,
+    http_server_factory: HTTPServerFactory,
+) -> None:
+    """Test that concurrent renders retrieve each schema file only once."""
+    width = 4
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize(
+                {"allOf": [{"$ref": f"a{i}.json"} for i in range(width)]},
+                "json",
+            ),
+            **{
+                (tmp_path / f"a{i}.json"): serialize(
+                    {"$ref": "#/definitions/person", "definitions": {"person": SCHEMA}},
+                    "json",
+                )
+                for i in range(width)
+            },
+        },
+    )
+    lock = Lock()
+    paths: list[str] = []
+
+    class _Handler(SimpleHTTPRequestHandler):
+        def send_head(self) -> Any:
+            with lock:
+                paths.append(self.path)
+            return super().send_head()
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    url = http_server_factory(tmp_path, _Handler)
+    paths.clear()
+
+    env = create_env(enable_async=True)
+    tpl = env.from_string("{{ data is jsonschema(url + '/schema.json') }}")
+
+    async def render_all() -> list[str]:
+        return await asyncio.gather(
+            *(
+                tpl.render_async(data=data, url=url)
+                for _ in range(8)
+                for data, _ in TEST_CASES
+            ),
+        )
+
+    assert asyncio.run(render_all()) == [message for data, message in TEST_CASES] * 8
+    assert sorted(paths) == sorted(
+        ["/schema.json", *(f"/a{i}.json" for i in range(width))],
+    )
+
+
+@pytest.mark.parametrize("validate_in_executor", [False, True])
+def test_validate_in_executor(validate_in_executor: bool) -> None:  # noqa: FBT001
+    """Test that schemas are compiled in the default executor if configured."""
+    threads: set[int] = set()
+    validator_for = jsonschema.validators.validator_for
+
+    def record_thread(*args: Any, **kwargs: Any) -> Any:
+        threads.add(get_ident())
+        return validator_for(*args, **kwargs)
+
+    env = create_env(enable_async=True)
+    get_extension(env).configure(validate_in_executor=validate_in_executor)
+    tpl = env.from_string("{{ data is jsonschema(schema) }}")
+    with mock.patch("jsonschema.validators.validator_for", side_effect=record_thread):
+        assert asyncio.run(tpl.render_async(data={"age": 30}, schema=SCHEMA)) == "True"
+
+    assert (threads == {get_ident()}) is not validate_in_executor
@@ -0,0 +1,169 @@
+"""Tests for bundling schema files."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import jsonschema
+import pytest
+
+from jinja2_jsonschema.__main__ import main
+from jinja2_jsonschema.bundle import dumps
+from jinja2_jsonschema.bundle import loads
+from jinja2_jsonschema.errors import InvalidBundleError
+from tests.test.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+
+    from tests.conftest import HTTPServerFactory
+
+
+@pytest.fixture
+def schema_tree(tmp_path: Path) -> Path:
+    """Create a tree of schema files with references.
+
+    Args:
+        tmp_path:
+            The temporary directory.
+
+    Returns:
+        The root directory of the schema files.
+    """
+    root = tmp_path / "schemas"
+    build_file_tree(
+        {
+            (root / "schema.json"): serialize(
+                {
+                    "$schema": "http://json-schema.org/draft-07/schema#",
+                    "type": "object",
+                    "properties": {"age": {"$ref": "defs/age.yaml"}},
+                },
+                "json",
+            ),
+            (root / "defs" / "age.yaml"): serialize(
+                {"allOf": [{"$ref": "integer.json"}], "minimum": 0},
+                "yaml",
+            ),
+            (root / "defs" / "integer.json"): serialize({"type": "integer"}, "json"),
+        },
+    )
+    return root
+
+
+@pytest.mark.parametrize("bundle_format", ["json", "marshal"])
+def test_cli(
+    tmp_path: Path,
+    schema_tree: Path,
+    bundle_format: str,
+) -> None:
+    """Test that a bundle created via the CLI replaces the schema files."""
+    bundle_path = tmp_path / "bundle"
+    assert (
+        main(
+            [
+                "bundle",
+                "schema.json",
+                "--root",
+                str(schema_tree),
+                "--format",
+                bundle_format,
+                "--output",
+                str(bundle_path),
+            ],
+        )
+        == 0
+    )
+
+    env = create_env()
+    assert get_extension(env).load_bundle(bundle_path) == "file:///schema.json"
+    tpl = env.from_string("{{ data is jsonschema('schema.json') }}")
+    for data, message in TEST_CASES:
+        assert tpl.render(data=data) == message
+
+
+def test_cli_error(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test that the CLI reports missing schema files."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(["bundle", "missing.json", "--root", str(tmp_path)])
+    assert exc_info.value.code == 1
+    assert 'Schema file "/missing.json" not found' in capsys.readouterr().err
+
+
+def test_self_contained(schema_tree: Path) -> None:
+    """Test that a bundle is a valid self-contained schema document."""
+    env = create_env(schema_tree)
+    bundle = get_extension(env).bundle("schema.json")
+
+    assert sorted(bundle["$defs"]) == [
+        "file:///defs/age.yaml",
+        "file:///defs/integer.json",
+        "file:///schema.json",
+    ]
+    jsonschema.Draft202012Validator.check_schema(bundle)
+    validator = jsonschema.Draft202012Validator(bundle)
+    for data, message in TEST_CASES:
+        assert str(validator.is_valid(data)) == message
+
+
+def test_remote(tmp_path: Path, http_server_factory: HTTPServerFactory) -> None:
+    """Test that remote schema files are bundled, but meta-schemas are not."""
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize(
+                {
+                    "$ref": "#/definitions/person",
+                    "definitions": {
+                        "person": SCHEMA,
+                        "meta": {"$ref": "http://json-schema.org/draft-07/schema#"},
+                    },
+                },
+                "json",
+            ),
+        },
+    )
+    url = http_server_factory(tmp_path)
+
+    env = create_env()
+    bundle = get_extension(env).bundle(f"{url}/schema.json")
+
+    assert bundle["$ref"] == f"{url}/schema.json"
+    assert list(bundle["$defs"]) == [f"{url}/schema.json"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"not json",
+        b"[]",
+        b'{"$ref": "file:///schema.json", "$defs": {}}',
+        dumps({"$ref": "file:///schema.json"}, "marshal")[:-1],
+    ],
+)
+def test_invalid_bundle(tmp_path: Path, data: bytes) -> None:
+    """Test that invalid bundles are rejected."""
+    bundle_path = tmp_path / "bundle"
+    bundle_path.write_bytes(data)
+
+    env = create_env()
+    with pytest.raises(InvalidBundleError, match="Invalid schema bundle"):
+        get_extension(env).load_bundle(bundle_path)
+
+
+def test_roundtrip() -> None:
+    """Test that bundles are serialized losslessly."""
+    bundle: dict[str, Any] = {
+        "$ref": "file:///schema.json",
+        "$defs": {"file:///schema.json": SCHEMA},
+    }
+    assert loads(dumps(bundle, "json")) == bundle
+    assert loads(dumps(bundle, "marshal")) == bundle
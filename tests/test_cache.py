@@ -0,0 +1,103 @@
+"""Tests for caching compiled validators."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import jsonschema
+import pytest
+from jsonschema import Draft7Validator
+
+from jinja2_jsonschema.cache import LRUCache
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_lru_cache_eviction() -> None:
+    """Test that the least recently used entry is evicted first."""
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+    cache.maxsize = 1
+    assert len(cache) == 1
+    assert "c" in cache
+
+
+def test_lru_cache_negative_maxsize() -> None:
+    """Test that a negative cache size is rejected."""
+    with pytest.raises(ValueError, match="maxsize must not be negative"):
+        LRUCache(-1)
+
+
+def test_inline_schema_compiled_once() -> None:
+    """Test that equal inline schemas share one compiled validator."""
+    env = create_env()
+    tpl = env.from_string("{{ data | jsonschema(schema) }}")
+
+    with patch.object(
+        Draft7Validator,
+        "check_schema",
+        wraps=Draft7Validator.check_schema,
+    ) as check_schema:
+        for age in range(5):
+            tpl.render(data={"age": age}, schema=dict(SCHEMA))
+
+    assert check_schema.call_count == 1
+
+
+def test_local_schema_compiled_once(tmp_path: Path) -> None:
+    """Test that equivalent schema URIs share one compiled validator."""
+    build_file_tree({(tmp_path / "schema.json"): serialize(SCHEMA, "json")})
+    env = create_env(tmp_path)
+    tpl = env.from_string("{{ data | jsonschema(schema) }}")
+
+    with patch.object(
+        Draft7Validator,
+        "check_schema",
+        wraps=Draft7Validator.check_schema,
+    ) as check_schema:
+        tpl.render(data={"age": 30}, schema="schema.json")
+        tpl.render(data={"age": -1}, schema="/schema.json")
+
+    assert check_schema.call_count == 1
+
+
+def test_cache_size_and_clear_cache() -> None:
+    """Test configuring the cache size and clearing the cache."""
+    env = create_env()
+    extension = get_extension(env)
+    extension.configure(cache_size=2, check_schema="never")
+    tpl = env.from_string("{{ data | jsonschema(schema) }}")
+    schemas = [{**SCHEMA, "minimum": minimum} for minimum in range(3)]
+
+    def count_compilations() -> int:
+        # `jsonschema` calls `validator_for` with a default validator class when
+        # evolving validators during validation.
+        return sum(
+            "default" not in call.kwargs for call in validator_for.call_args_list
+        )
+
+    with patch(
+        "jsonschema.validators.validator_for",
+        wraps=jsonschema.validators.validator_for,
+    ) as validator_for:
+        for schema in [*schemas, schemas[2], schemas[0]]:
+            tpl.render(data={"age": 30}, schema=schema)
+        assert count_compilations() == len(schemas) + 1
+
+        extension.clear_cache()
+        tpl.render(data={"age": 30}, schema=schemas[2])
+        assert count_compilations() == len(schemas) + 2
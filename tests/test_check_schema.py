@@ -0,0 +1,88 @@
+"""Tests for checking schemas against their meta-schema."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+from typing import Literal
+from unittest.mock import patch
+
+import pytest
+from jsonschema import Draft7Validator
+from jsonschema import SchemaError
+
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+INVALID_SCHEMA = {**SCHEMA, "title": 1}
+
+
+@pytest.mark.parametrize(
+    ("check_schema", "call_count"),
+    [("once", 2), ("always", 6), ("never", 0)],
+)
+def test_check_schema(
+    check_schema: Literal["once", "always", "never"],
+    call_count: int,
+) -> None:
+    """Test how often schemas are checked against their meta-schema."""
+    env = create_env()
+    get_extension(env).configure(cache_size=1, check_schema=check_schema)
+    tpl = env.from_string("{{ data | jsonschema(schema) }}")
+    schemas = [SCHEMA, {**SCHEMA, "minProperties": 1}]
+
+    with patch.object(
+        Draft7Validator,
+        "check_schema",
+        wraps=Draft7Validator.check_schema,
+    ) as mock:
+        for schema in schemas * 3:
+            tpl.render(data={"age": 30}, schema=schema)
+
+    assert mock.call_count == call_count
+
+
+@pytest.mark.parametrize("check_schema", ["once", "always"])
+def test_invalid_schema(check_schema: Literal["once", "always"]) -> None:
+    """Test that invalid schemas are rejected unless checking is disabled."""
+    env = create_env()
+    extension = get_extension(env)
+    extension.configure(check_schema=check_schema)
+    tpl = env.from_string("{{ data | jsonschema(schema) }}")
+
+    for _ in range(2):
+        with pytest.raises(SchemaError, match="1 is not of type 'string'"):
+            tpl.render(data={"age": 30}, schema=INVALID_SCHEMA)
+
+    extension.configure(check_schema="never")
+    assert tpl.render(data={"age": 30}, schema=INVALID_SCHEMA) == ""
+
+
+def test_invalid_schema_file(tmp_path: Path) -> None:
+    """Test that schema files are checked again after they have changed."""
+    path = tmp_path / "schema.json"
+    build_file_tree({path: serialize(SCHEMA, "json")})
+    env = create_env(tmp_path)
+    tpl = env.from_string("{{ data | jsonschema('schema.json') }}")
+    assert tpl.render(data={"age": 30}) == ""
+
+    path.write_text(serialize(INVALID_SCHEMA, "json"))
+    mtime = path.stat().st_mtime + 1
+    os.utime(path, (mtime, mtime))
+    for _ in range(2):
+        with pytest.raises(SchemaError, match="1 is not of type 'string'"):
+            tpl.render(data={"age": 30})
+
+
+def test_invalid_option() -> None:
+    """Test the error when an invalid option value is given."""
+    extension = get_extension(create_env())
+
+    with pytest.raises(ValueError, match='Invalid check_schema "sometimes"'):
+        extension.configure(check_schema="sometimes")  # type: ignore[arg-type]
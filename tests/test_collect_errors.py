@@ -0,0 +1,105 @@
+"""Tests for collecting all validation errors."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from jinja2_jsonschema.result import CompactError
+from tests.utils import create_env
+from tests.utils import get_extension
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "minLength": 2, "pattern": "^[a-z]+$"},
+        "age": {"type": "integer", "minimum": 0},
+    },
+    "required": ["email"],
+}
+
+DATA = {"name": "A", "age": -1}
+
+
+def test_filter() -> None:
+    """Test the `jsonschema_errors` filter."""
+    env = create_env()
+    tpl = env.from_string(
+        "{% for error in data | jsonschema_errors(schema) %}"
+        "{{ error.path }} {{ error.keyword }};"
+        "{% endfor %}",
+    )
+
+    assert tpl.render(data=DATA, schema=SCHEMA) == (
+        "/name minLength;/name pattern;/age minimum; required;"
+    )
+    assert tpl.render(data={"email": "a@b.c"}, schema=SCHEMA) == ""
+
+
+def test_filter_async() -> None:
+    """Test the `jsonschema_errors` filter in async mode."""
+    env = create_env(enable_async=True)
+    tpl = env.from_string(
+        "{{ data | jsonschema_errors(schema, unique_paths=true) | length }}",
+    )
+
+    assert asyncio.run(tpl.render_async(data=DATA, schema=SCHEMA)) == "3"
+
+
+def test_unique_paths() -> None:
+    """Test that only the first error per location is collected."""
+    extension = get_extension(create_env())
+
+    errors = extension.collect_errors(DATA, SCHEMA, unique_paths=True)
+    assert all(isinstance(error, CompactError) for error in errors)
+    assert [(error.path, error.keyword) for error in errors] == [
+        ("/name", "minLength"),
+        ("/age", "minimum"),
+        ("", "required"),
+    ]
+
+
+class CountingList(list[int]):
+    """List which counts how many of its items were iterated over."""
+
+    iterated = 0
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the items and count them."""
+        for item in super().__iter__():
+            self.iterated += 1
+            yield item
+
+
+@pytest.mark.parametrize("max_errors", [0, 1, 2])
+def test_max_errors(max_errors: int) -> None:
+    """Test that the traversal stops at the maximum number of errors."""
+    extension = get_extension(create_env())
+    data = CountingList(range(1000))
+
+    errors = extension.collect_errors(
+        data,
+        {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "array",
+            "items": {"type": "string"},
+        },
+        max_errors=max_errors,
+    )
+
+    assert [error.path for error in errors] == [f"/{i}" for i in range(max_errors)]
+    assert data.iterated == max_errors
+
+
+def test_invalid_max_errors() -> None:
+    """Test that a negative maximum number of errors is rejected."""
+    extension = get_extension(create_env())
+
+    with pytest.raises(ValueError, match="must not be negative"):
+        extension.collect_errors(DATA, SCHEMA, max_errors=-1)
@@ -0,0 +1,174 @@
+"""Tests for the on-disk cache for remote schema files."""
+
+from __future__ import annotations
+
+import os
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler
+from typing import TYPE_CHECKING
+
+import pytest
+
+from jinja2_jsonschema.cache import HTTPCache
+from jinja2_jsonschema.errors import SchemaNotCachedError
+from tests.filter.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from io import BytesIO
+    from pathlib import Path
+    from typing import BinaryIO
+
+    from tests.conftest import HTTPServerFactory
+
+ETAG = '"v1"'
+
+
+def recording_handler(
+    log: list[tuple[str, int]],
+    *,
+    etag: bool = False,
+) -> type[SimpleHTTPRequestHandler]:
+    """Create a request handler class which records the responses.
+
+    Args:
+        log:
+            The list to which pairs of request path and response status are appended.
+        etag:
+            Whether to send an `ETag` response header and evaluate `If-None-Match`
+            request headers.
+
+    Returns:
+        The request handler class.
+    """
+
+    class _Handler(SimpleHTTPRequestHandler):
+        def send_head(self) -> BytesIO | BinaryIO | None:
+            if etag and self.headers.get("If-None-Match") == ETAG:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.end_headers()
+                return None
+            return super().send_head()
+
+        def send_response(self, code: int, message: str | None = None) -> None:
+            log.append((self.path, code))
+            super().send_response(code, message)
+
+        def end_headers(self) -> None:
+            if etag:
+                self.send_header("ETag", ETAG)
+            super().end_headers()
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    return _Handler
+
+
+def render_twice(url: str, cache: HTTPCache) -> None:
+    """Render a template validating against a remote schema in two environments.
+
+    Args:
+        url:
+            The server URL.
+        cache:
+            The HTTP cache shared by both environments.
+    """
+    for _ in range(2):
+        env = create_env()
+        get_extension(env).configure(http_cache=cache)
+        tpl = env.from_string("{{ data | jsonschema(url + '/schema.json') }}")
+        for data, message in TEST_CASES:
+            assert tpl.render(data=data, url=url) == message
+
+
+def test_fresh_response(
+    tmp_path: Path,
+    http_server_factory: HTTPServerFactory,
+) -> None:
+    """Test that fresh responses are served without a request."""
+    log: list[tuple[str, int]] = []
+    build_file_tree({(tmp_path / "www" / "schema.json"): serialize(SCHEMA, "json")})
+    url = http_server_factory(tmp_path / "www", recording_handler(log))
+
+    render_twice(url, HTTPCache(tmp_path / "cache"))
+
+    assert [entry for entry in log if entry[0] == "/schema.json"] == [
+        ("/schema.json", HTTPStatus.OK),
+    ]
+
+
+@pytest.mark.parametrize("etag", [False, True])
+def test_revalidation(
+    tmp_path: Path,
+    http_server_factory: HTTPServerFactory,
+    etag: bool,  # noqa: FBT001
+) -> None:
+    """Test that stale responses are revalidated with conditional requests."""
+    log: list[tuple[str, int]] = []
+    build_file_tree({(tmp_path / "www" / "schema.json"): serialize(SCHEMA, "json")})
+    url = http_server_factory(tmp_path / "www", recording_handler(log, etag=etag))
+
+    render_twice(url, HTTPCache(tmp_path / "cache", ttl=0))
+
+    assert [entry for entry in log if entry[0] == "/schema.json"] == [
+        ("/schema.json", HTTPStatus.OK),
+        ("/schema.json", HTTPStatus.NOT_MODIFIED),
+    ]
+
+
+def test_offline(
+    tmp_path: Path,
+    http_server_factory: HTTPServerFactory,
+) -> None:
+    """Test that responses are served only from the cache in offline mode."""
+    log: list[tuple[str, int]] = []
+    build_file_tree({(tmp_path / "www" / "schema.json"): serialize(SCHEMA, "json")})
+    url = http_server_factory(tmp_path / "www", recording_handler(log))
+    cache = HTTPCache(tmp_path / "cache", ttl=0)
+
+    env = create_env()
+    get_extension(env).configure(http_cache=cache)
+    tpl = env.from_string("{{ data | jsonschema(url + schema_file) }}")
+    tpl.render(data={"age": 30}, url=url, schema_file="/schema.json")
+    log.clear()
+
+    cache.offline = True
+    env = create_env()
+    get_extension(env).configure(http_cache=cache)
+    tpl = env.from_string("{{ data | jsonschema(url + schema_file) }}")
+    for data, message in TEST_CASES:
+        output = tpl.render(data=data, url=url, schema_file="/schema.json")
+        assert output == message
+    with pytest.raises(SchemaNotCachedError, match="not cached in offline mode"):
+        tpl.render(data={"age": 30}, url=url, schema_file="/other.json")
+
+    assert log == []
+
+
+def test_eviction(tmp_path: Path) -> None:
+    """Test that the least recently used responses are evicted first."""
+    cache = HTTPCache(tmp_path, max_size=10)
+    cache.put("https://example.com/a.json", b"{}    ")
+    for path in tmp_path.glob("*.body"):
+        os.utime(path, (0, 0))
+    cache.put("https://example.com/b.json", b"{}    ")
+    assert cache.get("https://example.com/a.json") is None
+    assert cache.get("https://example.com/b.json") is not None
+
+    cache.put("https://example.com/c.json", b"{}")
+    body_files = sorted(tmp_path.glob("*.body"), key=lambda path: path.name)
+    for i, path in enumerate(body_files):
+        os.utime(path, (i, i))
+    cache.get("https://example.com/b.json")
+    cache.put("https://example.com/d.json", b"{}  ")
+    assert cache.get("https://example.com/b.json") is not None
+    assert cache.get("https://example.com/c.json") is None
+    assert cache.get("https://example.com/d.json") is not None
+
+    cache.clear()
+    assert list(tmp_path.iterdir()) == []
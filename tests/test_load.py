@@ -0,0 +1,97 @@
+"""Tests for parsing schema files."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from jinja2_jsonschema.transport import Response
+from tests.test.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+    from typing import Any
+    from typing import Literal
+
+
+def test_json_file_parsed_as_json(tmp_path: Path) -> None:
+    """Test that JSON files are parsed as JSON even if PyYAML is installed."""
+    # YAML 1.1 parses `1e3` as a string.
+    build_file_tree({(tmp_path / "schema.json"): '{"maximum": 1e3}'})
+    env = create_env(tmp_path)
+    tpl = env.from_string("{{ data is jsonschema('schema.json') }}")
+
+    assert tpl.render(data=1000) == "True"
+    assert tpl.render(data=1001) == "False"
+
+
+@pytest.mark.parametrize(("data", "message"), TEST_CASES)
+@pytest.mark.parametrize("data_format", ["json", "yaml"])
+def test_format_sniffing(
+    tmp_path: Path,
+    data_format: Literal["json", "yaml"],
+    data: Any,
+    message: str,
+) -> None:
+    """Test parsing schema files without a known file extension."""
+    build_file_tree(
+        {(tmp_path / "schema"): serialize(SCHEMA, data_format)},
+    )
+    env = create_env(tmp_path)
+    tpl = env.from_string("{{ data is jsonschema('schema') }}")
+
+    assert tpl.render(data=data) == message
+
+
+@pytest.mark.parametrize(("data", "message"), TEST_CASES)
+@pytest.mark.parametrize(
+    ("data_format", "content_type"),
+    [
+        ("json", "application/schema+json; charset=utf-8"),
+        ("yaml", "application/yaml"),
+    ],
+)
+def test_content_type(
+    data_format: Literal["json", "yaml"],
+    content_type: str,
+    data: Any,
+    message: str,
+) -> None:
+    """Test parsing remote schema files according to their media type."""
+
+    class _Transport:
+        def fetch(self, url: str, headers: Mapping[str, str]) -> Response:
+            assert url == "https://example.com/schema"
+            assert not headers
+            body = serialize(SCHEMA, data_format)
+            return Response(
+                HTTPStatus.OK,
+                {"content-type": content_type},
+                body.encode(),
+            )
+
+    env = create_env()
+    get_extension(env).configure(transport=_Transport())
+    tpl = env.from_string("{{ data is jsonschema('https://example.com/schema') }}")
+
+    assert tpl.render(data=data) == message
+
+
+@pytest.mark.parametrize(("data", "message"), TEST_CASES)
+def test_without_yaml(tmp_path: Path, data: Any, message: str) -> None:
+    """Test parsing YAML-suffixed JSON files if PyYAML is not installed."""
+    build_file_tree({(tmp_path / "schema.yaml"): serialize(SCHEMA, "json")})
+    env = create_env(tmp_path)
+    tpl = env.from_string("{{ data is jsonschema('schema.yaml') }}")
+
+    with patch("jinja2_jsonschema.extension._yaml_loader", return_value=None):
+        assert tpl.render(data=data) == message
@@ -0,0 +1,60 @@
+"""Tests for selecting the reported validation error."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import jsonschema
+import pytest
+
+from tests.utils import create_env
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "age": {"type": "integer", "minimum": 0},
+    },
+}
+DATA = {"name": 1, "age": -1}
+
+
+@pytest.mark.parametrize("mode", ["best", "first"])
+def test_mode(mode: str) -> None:
+    """Test reporting the best or the first validation error."""
+    env = create_env()
+    tpl = env.from_string("{{ (data | jsonschema(schema, mode=mode)).message }}")
+
+    with patch(
+        "jsonschema.exceptions.best_match",
+        wraps=jsonschema.exceptions.best_match,
+    ) as best_match:
+        output = tpl.render(data=DATA, schema=SCHEMA, mode=mode)
+        assert output == "1 is not of type 'string'"
+        assert tpl.render(data={"name": "", "age": 0}, schema=SCHEMA, mode=mode) == ""
+
+    assert best_match.called == (mode == "best")
+
+
+def test_invalid_mode() -> None:
+    """Test the error when an invalid mode is given."""
+    env = create_env()
+    tpl = env.from_string("{{ data | jsonschema(schema, mode='all') }}")
+
+    with pytest.raises(ValueError, match='Invalid mode "all"'):
+        tpl.render(data=DATA, schema=SCHEMA)
+
+
+def test_test_stops_at_first_error() -> None:
+    """Test that the test does not look for the best validation error."""
+    env = create_env()
+    tpl = env.from_string("{{ data is jsonschema(schema) }}")
+
+    with patch(
+        "jsonschema.exceptions.best_match",
+        wraps=jsonschema.exceptions.best_match,
+    ) as best_match:
+        assert tpl.render(data=DATA, schema=SCHEMA) == "False"
+        assert tpl.render(data={"name": "", "age": 0}, schema=SCHEMA) == "True"
+
+    best_match.assert_not_called()
@@ -0,0 +1,153 @@
+"""Tests for instrumenting schema resolution and validation."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from jinja2_jsonschema.cache import HTTPCache
+from jinja2_jsonschema.observer import PhaseEvent
+from jinja2_jsonschema.observer import StatsCollector
+from tests.test.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from jinja2_jsonschema.observer import CacheEvent
+    from tests.conftest import HTTPServerFactory
+
+
+class RecordingObserver:
+    """Observer which records all events."""
+
+    def __init__(self) -> None:
+        self.events: list[PhaseEvent | CacheEvent] = []
+
+    def on_phase(self, event: PhaseEvent) -> None:
+        """Record a phase event."""
+        self.events.append(event)
+
+    def on_cache(self, event: CacheEvent) -> None:
+        """Record a cache event."""
+        self.events.append(event)
+
+
+def test_events(tmp_path: Path) -> None:
+    """Test that events are emitted for each phase and cache lookup."""
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize({"$ref": "person.yaml"}, "json"),
+            (tmp_path / "person.yaml"): serialize(SCHEMA, "yaml"),
+        },
+    )
+    observer = RecordingObserver()
+    env = create_env(tmp_path)
+    get_extension(env).configure(observer=observer, precompile_literals=False)
+    tpl = env.from_string("{{ data is jsonschema('schema.json') }}")
+    tpl.render(data={"age": 30})
+
+    assert [
+        (event.phase, event.uri, event.size)
+        if isinstance(event, PhaseEvent)
+        else (event.cache, event.key, event.hit)
+        for event in observer.events
+    ] == [
+        ("validator", "file:///schema.json", False),
+        ("schema", "file:///schema.json", False),
+        (
+            "read",
+            "file:///schema.json",
+            len(serialize({"$ref": "person.yaml"}, "json")),
+        ),
+        (
+            "parse",
+            "file:///schema.json",
+            len(serialize({"$ref": "person.yaml"}, "json")),
+        ),
+        ("schema", "file:///person.yaml", False),
+        ("read", "file:///person.yaml", len(serialize(SCHEMA, "yaml"))),
+        ("parse", "file:///person.yaml", len(serialize(SCHEMA, "yaml"))),
+        ("check", "file:///schema.json", None),
+        ("validate", "file:///schema.json", None),
+    ]
+    assert all(
+        event.duration >= 0
+        for event in observer.events
+        if isinstance(event, PhaseEvent)
+    )
+
+
+def test_stats_collector(
+    tmp_path: Path,
+    http_server_factory: HTTPServerFactory,
+) -> None:
+    """Test that the stats collector aggregates events."""
+    build_file_tree({(tmp_path / "www" / "schema.json"): serialize(SCHEMA, "json")})
+    url = http_server_factory(tmp_path / "www")
+    cache = HTTPCache(tmp_path / "cache")
+    stats = StatsCollector()
+
+    for _ in range(2):
+        env = create_env()
+        get_extension(env).configure(http_cache=cache, observer=stats)
+        tpl = env.from_string("{{ data is jsonschema(url + '/schema.json') }}")
+        for data, message in TEST_CASES:
+            assert tpl.render(data=data, url=url) == message
+
+    snapshot = stats.snapshot(reset=True)
+    # The snapshot can be exported as JSON.
+    assert json.loads(json.dumps(snapshot)) == snapshot
+    size = len(serialize(SCHEMA, "json"))
+    assert {
+        phase: (phase_stats["count"], phase_stats["bytes"])
+        for phase, phase_stats in snapshot["phases"].items()
+    } == {
+        "check": (2, 0),
+        "fetch": (2, 2 * size),
+        "parse": (2, 2 * size),
+        "validate": (4, 0),
+    }
+    assert all(
+        0 <= phase_stats["max_seconds"] <= phase_stats["total_seconds"]
+        for phase_stats in snapshot["phases"].values()
+    )
+    assert snapshot["caches"] == {
+        "validator": {"hits": 2, "misses": 2},
+        "schema": {"hits": 0, "misses": 2},
+        "http": {"hits": 1, "misses": 1},
+    }
+    assert stats.snapshot() == {"phases": {}, "caches": {}}
+
+
+def test_warm_schema_lookups(tmp_path: Path) -> None:
+    """Test that warm validations do not look up referenced schema files."""
+    depth = 5
+    build_file_tree(
+        {
+            **{
+                (tmp_path / f"schema{i}.json"): serialize(
+                    {"$ref": f"schema{i + 1}.json"},
+                    "json",
+                )
+                for i in range(depth)
+            },
+            (tmp_path / f"schema{depth}.json"): serialize(SCHEMA, "json"),
+        },
+    )
+    stats = StatsCollector()
+    env = create_env(tmp_path)
+    get_extension(env).configure(observer=stats)
+    tpl = env.from_string("{{ data is jsonschema('schema0.json') }}")
+    stats.reset()
+
+    for data, message in TEST_CASES:
+        assert tpl.render(data=data) == message
+
+    caches = stats.snapshot()["caches"]
+    assert caches["validator"] == {"hits": len(TEST_CASES), "misses": 0}
+    assert "schema" not in caches
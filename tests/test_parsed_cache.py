@@ -0,0 +1,150 @@
+"""Tests for sharing parsed schema files across environments."""
+
+from __future__ import annotations
+
+import copy
+import json
+import pickle
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+
+from jinja2_jsonschema.bundle import dumps
+from jinja2_jsonschema.bundle import loads
+from jinja2_jsonschema.cache import FrozenDict
+from jinja2_jsonschema.cache import FrozenList
+from jinja2_jsonschema.cache import ParsedSchemaCache
+from jinja2_jsonschema.cache import freeze
+from jinja2_jsonschema.cache import thaw
+from jinja2_jsonschema.extension import _parse
+from tests.test.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+    from typing import Any
+    from typing import Literal
+
+DOCUMENT = {**SCHEMA, "required": ["age"]}
+
+
+@pytest.mark.parametrize("schema_format", ["json", "yaml"])
+def test_shared(tmp_path: Path, schema_format: Literal["json", "yaml"]) -> None:
+    """Test that environments share one copy of a parsed schema file."""
+    build_file_tree(
+        {
+            (tmp_path / "a" / f"schema.{schema_format}"): serialize(
+                SCHEMA,
+                schema_format,
+            ),
+            (tmp_path / "b" / f"schema.{schema_format}"): serialize(
+                SCHEMA,
+                schema_format,
+            ),
+        },
+    )
+    cache = ParsedSchemaCache()
+
+    with patch(
+        "jinja2_jsonschema.extension._parse",
+        wraps=_parse,
+    ) as parse:
+        for directory in ("a", "b"):
+            env = create_env(tmp_path / directory)
+            get_extension(env).configure(parsed_schema_cache=cache)
+            tpl = env.from_string(
+                f"{{{{ data is jsonschema('schema.{schema_format}') }}}}",
+            )
+            for data, message in TEST_CASES:
+                assert tpl.render(data=data) == message
+
+    assert parse.call_count == 1
+    assert len(cache) == 1
+    assert cache.size == len(serialize(SCHEMA, schema_format))
+
+
+def test_format_namespace() -> None:
+    """Test that the same source text parsed differently is cached separately."""
+    cache = ParsedSchemaCache()
+    json_document = cache.get_or_parse("{}", lambda _: {}, namespace="json")
+    yaml_document = cache.get_or_parse("{}", lambda _: {"yaml": True}, namespace="yaml")
+
+    assert json_document == {}
+    assert yaml_document == {"yaml": True}
+    assert len(cache) == 2  # noqa: PLR2004
+
+
+def test_eviction() -> None:
+    """Test that the least recently used documents are evicted beyond the size."""
+    parse = Mock(side_effect=json.loads)
+    cache = ParsedSchemaCache(max_size=10)
+    cache.get_or_parse('{"a": 1}', parse)
+    cache.get_or_parse('{"b": 2}', parse)
+    assert len(cache) == 1
+    assert cache.size == len('{"b": 2}')
+
+    cache.get_or_parse('{"b": 2}', parse)
+    assert parse.call_count == 2  # noqa: PLR2004
+    cache.get_or_parse('{"a": 1}', parse)
+    assert parse.call_count == 3  # noqa: PLR2004
+
+    # Documents larger than the maximum size are not cached at all.
+    assert cache.get_or_parse('{"abc": 123}', parse) == {"abc": 123}
+    assert len(cache) == 1
+
+    cache.max_size = 0
+    assert len(cache) == 0
+    assert cache.size == 0
+
+    with pytest.raises(ValueError, match="must not be negative"):
+        ParsedSchemaCache(max_size=-1)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda document: document.__setitem__("type", "string"),
+        lambda document: document.__delitem__("type"),
+        lambda document: document.update(type="string"),
+        lambda document: document.setdefault("title", "Person"),
+        lambda document: document.pop("type"),
+        lambda document: document.popitem(),
+        lambda document: document.clear(),
+        lambda document: document["required"].append("age"),
+        lambda document: document["required"].extend(["age"]),
+        lambda document: document["required"].insert(0, "age"),
+        lambda document: document["required"].__setitem__(0, "age"),
+        lambda document: document["required"].sort(),
+        lambda document: document["required"].clear(),
+    ],
+)
+def test_immutable(mutate: Callable[[Any], object]) -> None:
+    """Test that frozen documents cannot be mutated."""
+    document = freeze(DOCUMENT)
+    with pytest.raises(TypeError, match="is immutable"):
+        mutate(document)
+    assert document == DOCUMENT
+
+
+def test_frozen_copies() -> None:
+    """Test that frozen documents can be copied, pickled, serialized and thawed."""
+    document = freeze(DOCUMENT)
+    assert isinstance(document["required"], FrozenList)
+
+    for clone in (copy.deepcopy(document), pickle.loads(pickle.dumps(document))):  # noqa: S301
+        assert clone == DOCUMENT
+        assert isinstance(clone, FrozenDict)
+        assert isinstance(clone["required"], FrozenList)
+
+    assert json.loads(json.dumps(document)) == DOCUMENT
+    thawed = thaw(document)
+    assert type(thawed) is dict
+    assert type(thawed["required"]) is list
+    assert loads(dumps({"document": document}, "marshal")) == {"document": DOCUMENT}
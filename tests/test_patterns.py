@@ -0,0 +1,137 @@
+"""Tests for the pattern cache and format checking."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pytest
+from jsonschema import Draft4Validator
+from jsonschema import Draft202012Validator
+from jsonschema import FormatChecker
+from jsonschema import ValidationError
+
+from jinja2_jsonschema.cache import PatternCache
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"name": {"type": "string", "pattern": "^[a-z]+$"}},
+    "patternProperties": {
+        "^x-": {"type": "string"},
+        "^n[0-9]+$": {"type": "integer"},
+    },
+}
+
+
+@pytest.mark.parametrize("dialect", [Draft4Validator, Draft202012Validator])
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"name": "alice", "x-tag": "a", "n1": 1},
+        {"name": "Alice"},
+        {"name": 1},
+        {"x-tag": 1},
+        {"n1": "1", "n2": 2},
+        {"nx": "1"},
+        "alice",
+    ],
+)
+def test_same_errors(dialect: type[Any], data: Any) -> None:
+    """Test that the errors are the same as without the pattern cache."""
+    schema = {**SCHEMA, "$schema": dialect.META_SCHEMA["$schema"]}
+    extension = get_extension(create_env())
+
+    results = extension.validate_all([data], schema)
+    assert isinstance(results, list)
+    error = results[0]
+    expected = list(dialect(schema).iter_errors(data))
+    if not expected:
+        assert error == ""
+    else:
+        assert isinstance(error, ValidationError)
+        assert (error.message, list(error.path), list(error.schema_path)) in [
+            (
+                expected_error.message,
+                list(expected_error.path),
+                list(expected_error.schema_path),
+            )
+            for expected_error in expected
+        ]
+
+
+def test_shared_cache() -> None:
+    """Test that environments can share a pattern cache."""
+    patterns = PatternCache()
+    for _ in range(2):
+        env = create_env()
+        get_extension(env).configure(pattern_cache=patterns)
+        tpl = env.from_string("{{ data is jsonschema(schema) }}")
+        assert tpl.render(data={"name": "alice", "x-tag": "a"}, schema=SCHEMA) == "True"
+
+    assert len(patterns) == 3  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("schema", ["schema.json", "root.json"])
+def test_schema_file(tmp_path: Path, schema: str) -> None:
+    """Test that schema files declaring `$schema` use the pattern cache."""
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize(
+                {**SCHEMA, "$schema": "http://json-schema.org/draft-07/schema#"},
+                "json",
+            ),
+            (tmp_path / "root.json"): serialize(
+                {
+                    "$schema": "https://json-schema.org/draft/2020-12/schema",
+                    "$ref": "schema.json",
+                },
+                "json",
+            ),
+        },
+    )
+    patterns = PatternCache()
+    env = create_env(tmp_path)
+    get_extension(env).configure(pattern_cache=patterns)
+    tpl = env.from_string("{{ data is jsonschema(schema) }}")
+
+    assert tpl.render(data={"name": "alice", "n1": 1}, schema=schema) == "True"
+    assert tpl.render(data={"name": "Alice"}, schema=schema) == "False"
+    assert "^[a-z]+$" in patterns
+    assert "^n[0-9]+$" in patterns
+
+
+def test_eviction() -> None:
+    """Test that the least recently compiled patterns are evicted."""
+    patterns = PatternCache(maxsize=2)
+    patterns.compile("a")
+    patterns.compile("b")
+    patterns.compile("a")
+    patterns.compile("c")
+    assert len(patterns) == 2  # noqa: PLR2004
+    assert "a" not in patterns
+    assert "b" in patterns
+    assert "c" in patterns
+
+    patterns.maxsize = 0
+    assert len(patterns) == 0
+    with pytest.raises(ValueError, match="must not be negative"):
+        PatternCache(maxsize=-1)
+
+
+def test_format_checker() -> None:
+    """Test that formats are validated with a configured format checker."""
+    env = create_env()
+    tpl = env.from_string("{{ data is jsonschema(schema) }}")
+    schema = {"type": "string", "format": "ipv4"}
+
+    assert tpl.render(data="invalid", schema=schema) == "True"
+    get_extension(env).configure(format_checker=FormatChecker())
+    assert tpl.render(data="invalid", schema=schema) == "False"
+    assert tpl.render(data="127.0.0.1", schema=schema) == "True"
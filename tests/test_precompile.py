@@ -0,0 +1,121 @@
+"""Tests for precompiling schemas given as string literals."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import jsonschema
+import pytest
+from jinja2 import FileSystemLoader
+
+from jinja2_jsonschema.errors import SchemaFileNotFoundError
+from tests.test.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import count_resolutions
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+    from unittest.mock import MagicMock
+
+
+@pytest.fixture
+def get_source(tmp_path: Path) -> Iterator[MagicMock]:
+    """Create schema files and count how often they are read.
+
+    Args:
+        tmp_path:
+            The temporary directory.
+
+    Yields:
+        The mock of the loader's `get_source` method.
+    """
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize({"$ref": "person.json"}, "json"),
+            (tmp_path / "person.json"): serialize(SCHEMA, "json"),
+        },
+    )
+    with patch.object(
+        FileSystemLoader,
+        "get_source",
+        autospec=True,
+        side_effect=FileSystemLoader.get_source,
+    ) as get_source:
+        yield get_source
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{{ data is jsonschema('schema.json') }}",
+        "{{ data is jsonschema 'schema.json' }}",
+        "{{ not (data is not jsonschema('schema.json')) }}",
+        "{{ data | jsonschema('schema.json', mode='first') == '' }}",
+        "{{ [data] | jsonschema_all('schema.json') | first == '' }}",
+    ],
+)
+def test_precompiled(tmp_path: Path, get_source: MagicMock, source: str) -> None:
+    """Test that schema literals are resolved and compiled with the template."""
+    env = create_env(tmp_path)
+    tpl = env.from_string(source)
+    assert get_source.call_count == 2  # noqa: PLR2004
+
+    with (
+        patch(
+            "jsonschema.validators.validator_for",
+            wraps=jsonschema.validators.validator_for,
+        ) as validator_for,
+        count_resolutions() as resolve_schema,
+    ):
+        for data, message in TEST_CASES:
+            assert tpl.render(data=data) == message
+
+    assert get_source.call_count == 2  # noqa: PLR2004
+    resolve_schema.assert_not_called()
+    # `jsonschema` calls `validator_for` with a default validator class when
+    # resolving references, which is not compiling a schema.
+    assert all("default" in call.kwargs for call in validator_for.call_args_list)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{{ data is jsonschema(schema) }}",
+        "{{ data is jsonschema('schema' ~ '.json') }}",
+        "{{ data is jsonschema('schema.json' if true else '') }}",
+        "{{ data is defined(jsonschema('schema.json')) }}",
+    ],
+)
+def test_not_precompiled(tmp_path: Path, get_source: MagicMock, source: str) -> None:
+    """Test that schema arguments which are not plain literals are ignored."""
+    env = create_env(tmp_path)
+    env.globals["schema"] = "schema.json"
+    env.from_string(source)
+
+    assert get_source.call_count == 0
+
+
+def test_disabled(tmp_path: Path, get_source: MagicMock) -> None:
+    """Test that precompiling schema literals can be disabled."""
+    env = create_env(tmp_path)
+    get_extension(env).configure(precompile_literals=False)
+    tpl = env.from_string("{{ data is jsonschema('schema.json') }}")
+    assert get_source.call_count == 0
+
+    for data, message in TEST_CASES:
+        assert tpl.render(data=data) == message
+
+
+def test_error_deferred(tmp_path: Path) -> None:
+    """Test that errors are raised when rendering instead of compiling."""
+    env = create_env(tmp_path)
+    tpl = env.from_string("{{ data | jsonschema('missing.json') }}")
+
+    with pytest.raises(SchemaFileNotFoundError):
+        tpl.render(data={})
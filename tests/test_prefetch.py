@@ -0,0 +1,86 @@
+"""Tests for prefetching referenced schema files."""
+
+from __future__ import annotations
+
+from http.server import SimpleHTTPRequestHandler
+from threading import Lock
+from time import sleep
+from typing import TYPE_CHECKING
+
+from tests.test.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+
+    from tests.conftest import HTTPServerFactory
+
+
+def test_prefetch(tmp_path: Path, http_server_factory: HTTPServerFactory) -> None:
+    """Test that the closure of referenced schema files is retrieved concurrently."""
+    width = 8
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize(
+                {
+                    "allOf": [{"$ref": f"a{i}.json"} for i in range(width)],
+                    "definitions": {"unused": {"$ref": "missing.json"}},
+                },
+                "json",
+            ),
+            **{
+                (tmp_path / f"a{i}.json"): serialize({"$ref": f"b{i}.json"}, "json")
+                for i in range(width)
+            },
+            **{
+                (tmp_path / f"b{i}.json"): serialize(
+                    {"$ref": "#/definitions/person", "definitions": {"person": SCHEMA}},
+                    "json",
+                )
+                for i in range(width)
+            },
+        },
+    )
+    lock = Lock()
+    in_flight = 0
+    max_in_flight = 0
+    paths: list[str] = []
+
+    class _Handler(SimpleHTTPRequestHandler):
+        def send_head(self) -> Any:
+            nonlocal in_flight, max_in_flight
+            with lock:
+                paths.append(self.path)
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return super().send_head()
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    url = http_server_factory(tmp_path, _Handler)
+    paths.clear()
+
+    env = create_env()
+    get_extension(env).configure(prefetch_concurrency=width)
+    tpl = env.from_string("{{ data is jsonschema(url + '/schema.json') }}")
+    for data, message in TEST_CASES:
+        assert tpl.render(data=data, url=url) == message
+
+    assert sorted(paths) == sorted(
+        [
+            "/schema.json",
+            "/missing.json",
+            *(f"/a{i}.json" for i in range(width)),
+            *(f"/b{i}.json" for i in range(width)),
+        ],
+    )
+    assert max_in_flight > 1
@@ -0,0 +1,133 @@
+"""Tests for preloading schemas."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from jinja2_jsonschema.errors import SchemaFileNotFoundError
+from jinja2_jsonschema.observer import StatsCollector
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def schema_tree(tmp_path: Path) -> Path:
+    """Create a tree of schema files with references.
+
+    Args:
+        tmp_path:
+            The temporary directory.
+
+    Returns:
+        The root directory of the schema files.
+    """
+    build_file_tree(
+        {
+            (tmp_path / "schemas" / "person.json"): serialize(
+                {
+                    "$schema": "http://json-schema.org/draft-07/schema#",
+                    "type": "object",
+                    "properties": {"age": {"$ref": "../defs/age.json"}},
+                },
+                "json",
+            ),
+            (tmp_path / "schemas" / "adult.yaml"): serialize(
+                {
+                    "allOf": [
+                        {"$ref": "person.json"},
+                        {"properties": {"age": {"minimum": 18}}},
+                    ],
+                },
+                "yaml",
+            ),
+            (tmp_path / "defs" / "age.json"): serialize(
+                {"type": "integer", "minimum": 0},
+                "json",
+            ),
+        },
+    )
+    return tmp_path
+
+
+def test_preload(schema_tree: Path) -> None:
+    """Test that preloaded schemas are validated without loading or compiling."""
+    env = create_env(schema_tree)
+    extension = get_extension(env)
+    stats = StatsCollector()
+    extension.configure(observer=stats)
+
+    report = extension.preload(["schemas/person.json", "schemas/adult.yaml"])
+    assert report.ok
+    assert [schema.uri for schema in report.schemas] == [
+        "file:///schemas/person.json",
+        "file:///schemas/adult.yaml",
+    ]
+    assert report.schemas[1].documents == (
+        "file:///defs/age.json",
+        "file:///schemas/adult.yaml",
+        "file:///schemas/person.json",
+    )
+    assert sorted(report.documents) == [
+        "file:///defs/age.json",
+        "file:///schemas/adult.yaml",
+        "file:///schemas/person.json",
+    ]
+    assert all(duration >= 0 for duration in report.documents.values())
+    assert report.duration >= 0
+
+    stats.reset()
+    tpl = env.from_string("{{ data is jsonschema('schemas/adult.yaml') }}")
+    assert tpl.render(data={"age": 30}) == "True"
+    assert tpl.render(data={"age": 17}) == "False"
+    assert tpl.render(data={"age": -1}) == "False"
+    snapshot = stats.snapshot()
+    assert set(snapshot["phases"]) == {"validate"}
+    assert snapshot["caches"]["validator"]["misses"] == 0
+
+
+def test_glob(schema_tree: Path) -> None:
+    """Test that glob patterns are expanded to the matching local schema files."""
+    env = create_env(schema_tree)
+
+    report = get_extension(env).preload("schemas/*", concurrency=2)
+    assert [schema.uri for schema in report.schemas] == [
+        "file:///schemas/adult.yaml",
+        "file:///schemas/person.json",
+    ]
+    assert "file:///defs/age.json" in report.documents
+
+
+def test_errors(tmp_path: Path) -> None:
+    """Test that errors are collected in the report instead of being raised."""
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize(SCHEMA, "json"),
+            (tmp_path / "broken.json"): serialize({"$ref": "missing.json"}, "json"),
+        },
+    )
+    env = create_env(tmp_path)
+
+    report = get_extension(env).preload(["schema.json", "missing.json", "broken.json"])
+    assert not report.ok
+    assert [schema.uri for schema in report.schemas] == [
+        "file:///schema.json",
+        "file:///broken.json",
+    ]
+    assert set(report.errors) == {"file:///missing.json"}
+    assert isinstance(report.errors["file:///missing.json"], SchemaFileNotFoundError)
+
+
+def test_invalid_concurrency() -> None:
+    """Test that a non-positive concurrency is rejected."""
+    extension = get_extension(create_env())
+
+    with pytest.raises(ValueError, match="must be positive"):
+        extension.preload("schema.json", concurrency=0)
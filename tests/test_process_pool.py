@@ -0,0 +1,133 @@
+"""Tests for validating large data in a process pool."""
+
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pytest
+from jsonschema import ValidationError
+
+from tests.filter.utils import TEST_CASES as FILTER_TEST_CASES
+from tests.test.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+    from concurrent.futures import Future
+    from pathlib import Path
+
+    from jinja2 import Environment
+
+
+class CountingProcessPool(ProcessPoolExecutor):
+    """Process pool which counts the submitted tasks."""
+
+    def __init__(self) -> None:
+        super().__init__(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        self.submitted = 0
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Future[Any]:
+        """Count and submit a task."""
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def process_pool() -> Iterator[CountingProcessPool]:
+    """A process pool with one worker process.
+
+    Yields:
+        The process pool.
+    """
+    with CountingProcessPool() as process_pool:
+        yield process_pool
+
+
+@pytest.fixture
+def env(tmp_path: Path, process_pool: CountingProcessPool) -> Environment:
+    """An environment validating data with more than one JSON value in the pool.
+
+    Returns:
+        The environment.
+    """
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize({"$ref": "person.yaml"}, "json"),
+            (tmp_path / "person.yaml"): serialize(SCHEMA, "yaml"),
+        },
+    )
+    env = create_env(tmp_path)
+    get_extension(env).configure(process_pool=process_pool, offload_threshold=1)
+    process_pool.submitted = 0
+    return env
+
+
+@pytest.mark.parametrize(("data", "message"), FILTER_TEST_CASES)
+def test_filter(
+    env: Environment,
+    process_pool: CountingProcessPool,
+    data: Any,
+    message: str,
+) -> None:
+    """Test that the filter validates large data in the process pool."""
+    tpl = env.from_string("{{ data | jsonschema('schema.json') }}")
+
+    # The validator is sent to the worker process with the first task only.
+    for submitted in (1, 2):
+        assert tpl.render(data=data) == message
+        assert process_pool.submitted == submitted
+
+
+def test_test(env: Environment, process_pool: CountingProcessPool) -> None:
+    """Test that the test validates large data in the process pool."""
+    tpl = env.from_string("{{ data is jsonschema('schema.json') }}")
+
+    for data, message in TEST_CASES:
+        assert tpl.render(data=data) == message
+    assert process_pool.submitted == len(TEST_CASES)
+
+
+def test_new_worker_process(env: Environment) -> None:
+    """Test that data is sent once to worker processes without the validator."""
+    tpl = env.from_string("{{ data | jsonschema('schema.json') }}")
+    assert tpl.render(data={"age": 30}) == ""
+
+    with CountingProcessPool() as process_pool:
+        get_extension(env).configure(process_pool=process_pool)
+        assert tpl.render(data={"age": -1}) != ""
+        assert process_pool.submitted == 1
+
+
+def test_error(env: Environment) -> None:
+    """Test that errors of the worker processes have the same details."""
+    error = get_extension(env).validate_stream([{"age": -1}], "schema.json")
+
+    assert isinstance(error, ValidationError)
+    assert error.json_path == "$[0].age"
+    assert error.validator == "minimum"
+    assert error.instance == -1
+
+
+def test_threshold(env: Environment, process_pool: CountingProcessPool) -> None:
+    """Test that small data is validated in the calling process."""
+    get_extension(env).configure(offload_threshold=2)
+    tpl = env.from_string("{{ data | jsonschema('schema.json') }}")
+
+    assert tpl.render(data={"age": 30}) == ""
+    assert process_pool.submitted == 0
+    assert tpl.render(data={"age": 30, "name": "Alice"}) == ""
+    assert process_pool.submitted == 1
@@ -0,0 +1,109 @@
+"""Tests for the persistent schema registry."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from jinja2 import FileSystemLoader
+
+from tests.filter.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import count_resolutions
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+
+
+def test_ref_chain_resolved_once(tmp_path: Path) -> None:
+    """Test that each schema file of a `$ref` chain is loaded only once."""
+    depth = 5
+    build_file_tree(
+        {
+            **{
+                (tmp_path / f"schema{i}.json"): serialize(
+                    {"$ref": f"schema{i + 1}.json"},
+                    "json",
+                )
+                for i in range(depth)
+            },
+            (tmp_path / f"schema{depth}.json"): serialize(SCHEMA, "json"),
+        },
+    )
+    env = create_env(tmp_path)
+
+    with patch.object(
+        FileSystemLoader,
+        "get_source",
+        autospec=True,
+        side_effect=FileSystemLoader.get_source,
+    ) as get_source:
+        tpl = env.from_string("{{ data | jsonschema('schema0.json') }}")
+        for _ in range(3):
+            for data, message in TEST_CASES:
+                assert tpl.render(data=data) == message
+
+    assert get_source.call_count == depth + 1
+
+    # Warm validations do not resolve any schema file again.
+    with count_resolutions() as resolve_schema:
+        for data, message in TEST_CASES:
+            assert tpl.render(data=data) == message
+    resolve_schema.assert_not_called()
+
+
+def test_refs_of_subschemas_only(tmp_path: Path) -> None:
+    """Test that only references of subschemas are retrieved before compiling."""
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize(
+                {
+                    "$schema": "http://json-schema.org/draft-04/schema#",
+                    "definitions": {
+                        "age": {"id": "defs/", "allOf": [{"$ref": "age.json"}]},
+                    },
+                    "properties": {"age": {"$ref": "#/definitions/age"}},
+                    "default": {"$ref": "missing.json"},
+                },
+                "json",
+            ),
+            (tmp_path / "defs" / "age.json"): serialize(
+                {"type": "integer", "minimum": 0},
+                "json",
+            ),
+        },
+    )
+    env = create_env(tmp_path)
+    with count_resolutions() as resolve_schema:
+        tpl = env.from_string("{{ data is jsonschema('schema.json') }}")
+        assert tpl.render(data={"age": 30}) == "True"
+        assert tpl.render(data={"age": -1}) == "False"
+    assert {call.args[1] for call in resolve_schema.call_args_list} == {
+        "file:///schema.json",
+        "file:///defs/age.json",
+    }
+
+
+@pytest.mark.parametrize(("data", "message"), TEST_CASES)
+def test_seed(data: Any, message: str) -> None:
+    """Test validation against seeded schemas without a loader."""
+    env = create_env()
+    extension = get_extension(env)
+    extension.seed(
+        {
+            "schema.json": {"$ref": "sub/schema.json"},
+            "/sub/schema.json": SCHEMA,
+        },
+    )
+    tpl = env.from_string("{{ data | jsonschema('schema.json') }}")
+
+    assert tpl.render(data=data) == message
+
+    extension.clear_cache()
+    assert tpl.render(data=data) == message
@@ -0,0 +1,145 @@
+"""Tests for reloading changed local schema files."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from jinja2 import FileSystemLoader
+
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from jinja2 import Environment
+
+
+def write_schema(path: Path, minimum: int, mtime: int) -> None:
+    """Write a schema file with a distinct modification time.
+
+    Args:
+        path:
+            The path of the schema file.
+        minimum:
+            The minimum of the integer schema.
+        mtime:
+            The modification time of the schema file.
+    """
+    build_file_tree({path: serialize({"type": "integer", "minimum": minimum}, "json")})
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.mark.parametrize("auto_reload", [True, False])
+def test_reload(tmp_path: Path, auto_reload: bool) -> None:  # noqa: FBT001
+    """Test that changed schema files are reloaded only if auto-reload is enabled."""
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize(
+                {"type": "object", "properties": {"age": {"$ref": "age.json"}}},
+                "json",
+            ),
+        },
+    )
+    write_schema(tmp_path / "age.json", 0, 1)
+    env = create_env(tmp_path)
+    env.auto_reload = auto_reload
+    tpl = env.from_string("{{ data is jsonschema('schema.json') }}")
+
+    assert tpl.render(data={"age": -1}) == "False"
+
+    write_schema(tmp_path / "age.json", -10, 2)
+    assert tpl.render(data={"age": -1}) == str(auto_reload)
+
+
+def test_unchanged_not_reread(tmp_path: Path) -> None:
+    """Test that unchanged schema files are not read again."""
+    write_schema(tmp_path / "age.json", 0, 1)
+    env = create_env(tmp_path)
+
+    with patch.object(
+        FileSystemLoader,
+        "get_source",
+        autospec=True,
+        side_effect=FileSystemLoader.get_source,
+    ) as get_source:
+        tpl = env.from_string("{{ data is jsonschema('age.json') }}")
+        for _ in range(3):
+            assert tpl.render(data=-1) == "False"
+        assert get_source.call_count == 1
+
+        write_schema(tmp_path / "age.json", -10, 2)
+        for _ in range(3):
+            assert tpl.render(data=-1) == "True"
+        assert get_source.call_count == 2  # noqa: PLR2004
+
+
+def test_only_dependencies_checked(tmp_path: Path) -> None:
+    """Test that only the schema files a validator depends on are checked."""
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize({"$ref": "age.json"}, "json"),
+            (tmp_path / "unrelated.json"): serialize({"type": "string"}, "json"),
+        },
+    )
+    write_schema(tmp_path / "age.json", 0, 1)
+    checked: list[str] = []
+    original_get_source = FileSystemLoader.get_source
+
+    def get_source(
+        loader: FileSystemLoader,
+        environment: Environment,
+        template: str,
+    ) -> tuple[str, str | None, Callable[[], bool] | None]:
+        source, filename, uptodate = original_get_source(
+            loader,
+            environment,
+            template,
+        )
+        assert uptodate is not None
+
+        def counting_uptodate() -> bool:
+            checked.append(template)
+            return uptodate()
+
+        return source, filename, counting_uptodate
+
+    env = create_env(tmp_path)
+    with patch.object(
+        FileSystemLoader,
+        "get_source",
+        autospec=True,
+        side_effect=get_source,
+    ):
+        tpl = env.from_string("{{ data is jsonschema(schema) }}")
+        assert tpl.render(data=-1, schema="schema.json") == "False"
+        assert tpl.render(data="a", schema="unrelated.json") == "True"
+        checked.clear()
+
+        for _ in range(3):
+            assert tpl.render(data="a", schema="unrelated.json") == "True"
+        assert checked == ["/unrelated.json"] * 3
+
+
+def test_shared_dependency_reloaded(tmp_path: Path) -> None:
+    """Test that a changed schema file is reloaded for all validators using it."""
+    build_file_tree(
+        {
+            (tmp_path / "a.json"): serialize({"$ref": "age.json"}, "json"),
+            (tmp_path / "b.json"): serialize({"$ref": "age.json"}, "json"),
+        },
+    )
+    write_schema(tmp_path / "age.json", 0, 1)
+    env = create_env(tmp_path)
+    tpl = env.from_string("{{ data is jsonschema(schema) }}")
+    assert tpl.render(data=-1, schema="a.json") == "False"
+    assert tpl.render(data=-1, schema="b.json") == "False"
+
+    write_schema(tmp_path / "age.json", -10, 2)
+    assert tpl.render(data=-1, schema="a.json") == "True"
+    assert tpl.render(data=-1, schema="b.json") == "True"
@@ -0,0 +1,70 @@
+"""Tests for compact validation errors."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from jinja2_jsonschema.result import CompactError
+from tests.utils import SCHEMA
+from tests.utils import create_env
+from tests.utils import get_extension
+
+LARGE_DATA = {"age": -1, "padding": ["x" * 100] * 1000}
+
+
+def test_compact() -> None:
+    """Test that compact errors render without the data and the schema."""
+    env = create_env()
+    get_extension(env).configure(error_format="compact")
+    tpl = env.from_string("{{ data | jsonschema(schema) }}")
+
+    assert tpl.render(data={"age": 30}, schema=SCHEMA) == ""
+    with patch("pprint.pformat") as pformat:
+        output = tpl.render(data=LARGE_DATA, schema=SCHEMA)
+    assert output == (
+        "-1 is less than the minimum of 0\n\n"
+        "Failed validating 'minimum' at /properties/age/minimum "
+        "on instance at /age"
+    )
+    pformat.assert_not_called()
+
+
+def test_attributes() -> None:
+    """Test the attributes of compact errors."""
+    env = create_env()
+    extension = get_extension(env)
+    extension.configure(error_format="compact")
+    schema = {"properties": {"a/b~c": {"items": {"type": "string"}}}}
+
+    error = extension.validate_stream([{"a/b~c": ["x", 1]}], schema)
+    assert isinstance(error, CompactError)
+    assert error.message == "1 is not of type 'string'"
+    assert error.keyword == "type"
+    assert error.path == "/0/a~1b~0c/1"
+    assert error.schema_path == "/properties/a~1b~0c/items/type"
+    assert error.instance == 1
+    assert error.format_instance() == "1"
+    assert repr(error) == "<CompactError: 'type' at /0/a~1b~0c/1>"
+    assert error.error.validator_value == "string"
+
+
+def test_truncated() -> None:
+    """Test that compact errors are truncated to the maximum length."""
+    env = create_env()
+    extension = get_extension(env)
+    extension.configure(error_format="compact", error_max_length=20)
+
+    results = extension.validate_all([{"age": 30}, {"age": -1}], SCHEMA)
+    assert isinstance(results, list)
+    assert results[0] == ""
+    assert str(results[1]) == "-1 is less than t..."
+
+
+def test_invalid_error_format() -> None:
+    """Test that an invalid error format is rejected."""
+    extension = get_extension(create_env())
+
+    with pytest.raises(ValueError, match='Invalid error_format "short"'):
+        extension.configure(error_format="short")  # type: ignore[arg-type]
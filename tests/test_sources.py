@@ -0,0 +1,94 @@
+"""Tests for schema sources of custom URI schemes."""
+
+from __future__ import annotations
+
+import json
+import zipfile
+from typing import TYPE_CHECKING
+
+import pytest
+
+from jinja2_jsonschema.errors import SchemaFileNotFoundError
+from jinja2_jsonschema.sources import MemorySource
+from jinja2_jsonschema.sources import PackageSource
+from jinja2_jsonschema.sources import ZipSource
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PERSON = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {"age": {"$ref": "defs/age.json"}},
+}
+
+AGE = {"type": "integer", "minimum": 0}
+
+
+def test_memory_source() -> None:
+    """Test loading schema documents from memory."""
+    env = create_env()
+    get_extension(env).register_source(
+        "mem",
+        MemorySource(
+            {"schemas/person.json": PERSON, "schemas/defs/age.json": AGE},
+        ),
+    )
+    tpl = env.from_string("{{ data is jsonschema('mem://schemas/person.json') }}")
+
+    assert tpl.render(data={"age": 30}) == "True"
+    assert tpl.render(data={"age": -1}) == "False"
+
+
+def test_zip_source(tmp_path: Path) -> None:
+    """Test loading schema files from a ZIP archive."""
+    archive = tmp_path / "schemas.zip"
+    with zipfile.ZipFile(archive, "w") as f:
+        f.writestr("person.json", json.dumps(PERSON))
+        f.writestr("defs/age.json", json.dumps(AGE))
+    source = ZipSource(archive)
+    env = create_env()
+    get_extension(env).register_source("zip", source)
+    tpl = env.from_string("{{ data is jsonschema('zip:///person.json') }}")
+
+    try:
+        assert tpl.render(data={"age": 30}) == "True"
+        assert tpl.render(data={"age": -1}) == "False"
+    finally:
+        source.close()
+
+
+def test_package_source(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test loading schema files from package data."""
+    build_file_tree(
+        {
+            (tmp_path / "schemapkg" / "__init__.py"): "",
+            (tmp_path / "schemapkg" / "schema.yaml"): json.dumps(SCHEMA),
+        },
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    env = create_env()
+    get_extension(env).register_source("pkg", PackageSource())
+    tpl = env.from_string("{{ data is jsonschema('pkg://schemapkg/schema.yaml') }}")
+
+    assert tpl.render(data={"age": 30}) == "True"
+    assert tpl.render(data={"age": -1}) == "False"
+
+
+@pytest.mark.parametrize(
+    "uri",
+    ["mem://schemas/missing.json", "pkg://schemapkg_missing/schema.json"],
+)
+def test_missing_schema(uri: str) -> None:
+    """Test that a missing schema file of a source is reported."""
+    env = create_env()
+    get_extension(env).register_source("mem", MemorySource({}))
+    get_extension(env).register_source("pkg", PackageSource())
+    tpl = env.from_string("{{ data is jsonschema(uri) }}")
+
+    with pytest.raises(SchemaFileNotFoundError):
+        tpl.render(data={}, uri=uri)
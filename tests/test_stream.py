@@ -0,0 +1,173 @@
+"""Tests for validating the items of large JSON documents incrementally."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pytest
+from jsonschema import ValidationError
+
+from jinja2_jsonschema.errors import InvalidStreamError
+from jinja2_jsonschema.stream import iter_items
+from tests.utils import SCHEMA
+from tests.utils import create_env
+from tests.utils import get_extension
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+ARRAY = [{"age": 30}, {"age": 0}, {"age": -1}, {"age": 40}]
+OBJECT = {"alice": {"age": 30}, "bob": {"age": -1}, "carol": {"age": 40}}
+
+
+def chunked(text: str, chunk_size: int) -> list[str]:
+    """Split a text into chunks."""
+    return [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1024])
+@pytest.mark.parametrize(
+    "document",
+    [
+        [],
+        {},
+        [1, -2.5e-10, 12345678901234567890, 'a"b,]', None, True, [[]], {"a": {}}],
+        {"a": 1, "": [1, 2], "é": {"b": None}, "c": "}"},
+    ],
+)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_items(document: Any, chunk_size: int, indent: int | None) -> None:
+    """Test that items are parsed across chunk boundaries."""
+    text = json.dumps(document, indent=indent)
+    expected = (
+        list(document.items())
+        if isinstance(document, dict)
+        else list(enumerate(document))
+    )
+    assert list(iter_items(chunked(text, chunk_size))) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1024])
+@pytest.mark.parametrize(
+    ("text", "reason", "position"),
+    [
+        ("", "expected an array or an object", 0),
+        ("1", "expected an array or an object", 0),
+        ("[1,]", "Expecting value", 3),
+        ("[1 2]", 'expected "," or "]"', 3),
+        ("[1", 'expected "," or "]"', 2),
+        ('["a', "Unterminated string", 1),
+        ("{1: 2}", "expected a member name", 2),
+        ('{"a" 1}', 'expected ":"', 5),
+        ("[] []", "unexpected data after the document", 3),
+    ],
+)
+def test_iter_items_invalid(
+    text: str,
+    reason: str,
+    position: int,
+    chunk_size: int,
+) -> None:
+    """Test that invalid documents raise an error with the position."""
+    with pytest.raises(InvalidStreamError, match=reason) as exc_info:
+        list(iter_items(chunked(text, chunk_size)))
+    assert exc_info.value.position == position
+
+
+def test_iter_items_lazy() -> None:
+    """Test that items are parsed without reading ahead of them."""
+    chunks = iter(['[{"age": 30}', ", ", '{"age": -1}', ", ", "invalid"])
+    items = iter_items(chunks)
+
+    assert next(items) == (0, {"age": 30})
+    assert next(items) == (1, {"age": -1})
+    assert next(chunks) == ", "
+
+
+@pytest.mark.parametrize(
+    "item", ["nope", '{"age": 3x}', '{"age" 30}', "[1 2]", '"a\nb"']
+)
+def test_iter_items_malformed(item: str) -> None:
+    """Test that a malformed item fails without reading the rest of the document."""
+    text = f"[{item}, " + ", ".join(['{"age": 30}'] * 100_000) + "]"
+    chunks = iter(chunked(text, 1024))
+
+    with pytest.raises(InvalidStreamError):
+        list(iter_items(chunks))
+    assert len(list(chunks)) > len(text) // 1024 - 2
+
+
+def test_filter(tmp_path: Path) -> None:
+    """Test the `jsonschema_stream` filter with a file."""
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(ARRAY))
+    env = create_env()
+    tpl = env.from_string(
+        "{% set error = data | jsonschema_stream(schema) %}"
+        "{{ error.json_path if error else 'valid' }}",
+    )
+
+    assert tpl.render(data=path, schema=SCHEMA) == "$[2].age"
+    with path.open("rb") as f:
+        assert tpl.render(data=f, schema=SCHEMA) == "$[2].age"
+    with path.open(encoding="utf-8") as f:
+        assert tpl.render(data=f, schema=SCHEMA) == "$[2].age"
+    assert tpl.render(data=ARRAY[:2], schema=SCHEMA) == "valid"
+
+
+def test_filter_async(tmp_path: Path) -> None:
+    """Test the `jsonschema_stream` filter in async mode."""
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(ARRAY))
+    env = create_env(enable_async=True)
+    tpl = env.from_string(
+        "{% set error = data | jsonschema_stream(schema) %}"
+        "{{ error.json_path if error else 'valid' }}",
+    )
+
+    assert asyncio.run(tpl.render_async(data=path, schema=SCHEMA)) == "$[2].age"
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        lambda: io.StringIO(json.dumps(OBJECT)),
+        lambda: io.BytesIO(json.dumps(OBJECT).encode()),
+        lambda: OBJECT,
+    ],
+)
+def test_api_object(source: Any) -> None:
+    """Test validating the members of an object."""
+    extension = get_extension(create_env())
+
+    error = extension.validate_stream(source(), SCHEMA, mode="first")
+    assert isinstance(error, ValidationError)
+    assert list(error.path) == ["bob", "age"]
+    assert error.instance == -1
+
+
+def test_api_iterator() -> None:
+    """Test that validation stops at the first invalid item of an iterator."""
+    extension = get_extension(create_env())
+    items = iter(ARRAY)
+
+    error = extension.validate_stream(items, SCHEMA)
+    assert isinstance(error, ValidationError)
+    assert list(error.path) == [2, "age"]
+    assert isinstance(items, Iterator)
+    assert next(items) == {"age": 40}
+
+
+def test_api_invalid() -> None:
+    """Test that invalid sources raise errors."""
+    extension = get_extension(create_env())
+
+    with pytest.raises(InvalidStreamError):
+        extension.validate_stream(io.StringIO('[{"age": 30}, x]'), SCHEMA)
+    with pytest.raises(TypeError, match="Cannot stream data of type int"):
+        extension.validate_stream(1, SCHEMA)
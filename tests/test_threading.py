@@ -0,0 +1,139 @@
+"""Tests for rendering from many threads at once."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import SimpleHTTPRequestHandler
+from threading import Barrier
+from threading import Lock
+from time import sleep
+from typing import TYPE_CHECKING
+
+from jinja2_jsonschema.cache import LRUCache
+from tests.test.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+
+    from tests.conftest import HTTPServerFactory
+
+THREADS = 32
+
+
+def test_single_flight(
+    tmp_path: Path,
+    http_server_factory: HTTPServerFactory,
+) -> None:
+    """Test that concurrent first uses of a schema retrieve each file only once."""
+    width = 4
+    build_file_tree(
+        {
+            (tmp_path / "schema.json"): serialize(
+                {"allOf": [{"$ref": f"a{i}.json"} for i in range(width)]},
+                "json",
+            ),
+            **{
+                (tmp_path / f"a{i}.json"): serialize(
+                    {"$ref": "#/definitions/person", "definitions": {"person": SCHEMA}},
+                    "json",
+                )
+                for i in range(width)
+            },
+        },
+    )
+    lock = Lock()
+    paths: list[str] = []
+
+    class _Handler(SimpleHTTPRequestHandler):
+        def send_head(self) -> Any:
+            with lock:
+                paths.append(self.path)
+            # Widen the window in which concurrent retrievals overlap.
+            sleep(0.05)
+            return super().send_head()
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    url = http_server_factory(tmp_path, _Handler)
+    paths.clear()
+
+    env = create_env()
+    tpl = env.from_string("{{ data is jsonschema(url + '/schema.json') }}")
+    barrier = Barrier(THREADS)
+
+    def render(i: int) -> tuple[str, str]:
+        data, message = TEST_CASES[i % len(TEST_CASES)]
+        barrier.wait()
+        return tpl.render(data=data, url=url), message
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(render, range(THREADS)))
+
+    assert all(output == message for output, message in results)
+    assert sorted(paths) == sorted(
+        ["/schema.json", *(f"/a{i}.json" for i in range(width))],
+    )
+
+
+def test_stress(tmp_path: Path) -> None:
+    """Test that all caches stay consistent when rendering from many threads."""
+    build_file_tree(
+        {
+            **{
+                (tmp_path / f"schema{i}.json"): serialize(
+                    {"$ref": "person.json", "title": f"Schema {i}"},
+                    "json",
+                )
+                for i in range(8)
+            },
+            (tmp_path / "person.json"): serialize(SCHEMA, "json"),
+        },
+    )
+    env = create_env(tmp_path)
+    # Force evictions from the validator cache while other threads use it.
+    get_extension(env).configure(cache_size=3)
+    tpl = env.from_string(
+        "{{ data is jsonschema(schema) }}"
+        "{{ data is jsonschema({'$ref': 'file:///' ~ schema, 'title': schema}) }}",
+    )
+    barrier = Barrier(THREADS)
+
+    def render(i: int) -> bool:
+        barrier.wait()
+        for j in range(50):
+            data, message = TEST_CASES[(i + j) % len(TEST_CASES)]
+            schema = f"schema{(i * j) % 8}.json"
+            if tpl.render(data=data, schema=schema) != message * 2:
+                return False
+            if j % 10 == 0:
+                get_extension(env).clear_cache()
+        return True
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        assert all(executor.map(render, range(THREADS)))
+
+
+def test_lru_cache() -> None:
+    """Test that the LRU cache stays bounded under concurrent use."""
+    cache: LRUCache[int, int] = LRUCache(16)
+    barrier = Barrier(THREADS)
+
+    def use(i: int) -> None:
+        barrier.wait()
+        for j in range(1000):
+            key = (i * 1000 + j) % 64
+            cache.set(key, key)
+            assert cache.get(key, key) == key
+            cache.pop((key + 1) % 64)
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        list(executor.map(use, range(THREADS)))
+
+    assert len(cache) <= cache.maxsize
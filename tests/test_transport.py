@@ -0,0 +1,165 @@
+"""Tests for the HTTP transports for retrieving remote schema files."""
+
+from __future__ import annotations
+
+import socket
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler
+from typing import TYPE_CHECKING
+from urllib.error import HTTPError
+
+import pytest
+from referencing.exceptions import Unresolvable
+
+from jinja2_jsonschema.transport import PooledTransport
+from jinja2_jsonschema.transport import Response
+from jinja2_jsonschema.transport import UrllibTransport
+from tests.filter.utils import TEST_CASES
+from tests.utils import SCHEMA
+from tests.utils import build_file_tree
+from tests.utils import create_env
+from tests.utils import get_extension
+from tests.utils import serialize
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+    from typing import Any
+
+    from jinja2_jsonschema.transport import Transport
+    from tests.conftest import HTTPServerFactory
+
+
+class _KeepAliveHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: list[tuple[str, int]]
+
+    def setup(self) -> None:
+        super().setup()
+        self.connections.append(self.client_address)
+
+    def send_head(self) -> Any:
+        if self.path == "/redirect.json":
+            self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+            self.send_header("Location", "/schema0.json")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        return super().send_head()
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.mark.parametrize("schema_file", ["schema0.json", "redirect.json"])
+def test_connection_reuse(
+    tmp_path: Path,
+    http_server_factory: HTTPServerFactory,
+    schema_file: str,
+) -> None:
+    """Test that one connection is reused across resolutions and filter calls."""
+    depth = 5
+    build_file_tree(
+        {
+            **{
+                (tmp_path / f"schema{i}.json"): serialize(
+                    {"$ref": f"schema{i + 1}.json"},
+                    "json",
+                )
+                for i in range(depth)
+            },
+            (tmp_path / f"schema{depth}.json"): serialize(SCHEMA, "json"),
+        },
+    )
+    connections: list[tuple[str, int]] = []
+    handler_class = type(
+        "_Handler",
+        (_KeepAliveHandler,),
+        {"connections": connections},
+    )
+    url = http_server_factory(tmp_path, handler_class)
+    connections.clear()
+
+    transport = PooledTransport()
+    for _ in range(2):
+        env = create_env()
+        get_extension(env).configure(transport=transport)
+        tpl = env.from_string("{{ data | jsonschema(url + '/' + schema_file) }}")
+        for data, message in TEST_CASES:
+            assert tpl.render(data=data, url=url, schema_file=schema_file) == message
+    transport.close()
+
+    assert len(connections) == 1
+
+
+def test_custom_transport() -> None:
+    """Test retrieving remote schema files via a custom transport."""
+    requests: list[tuple[str, Mapping[str, str]]] = []
+
+    class _Transport:
+        def fetch(self, url: str, headers: Mapping[str, str]) -> Response:
+            requests.append((url, headers))
+            if url == "https://example.com/schema.json":
+                return Response(HTTPStatus.OK, {}, serialize(SCHEMA, "json").encode())
+            return Response(HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    env = create_env()
+    get_extension(env).configure(transport=_Transport())
+    tpl = env.from_string("{{ data | jsonschema('https://example.com/schema.json') }}")
+
+    for data, message in TEST_CASES:
+        assert tpl.render(data=data) == message
+    assert requests == [("https://example.com/schema.json", {})]
+
+    tpl = env.from_string("{{ data | jsonschema('https://example.com/error.json') }}")
+    with pytest.raises(Unresolvable) as exc_info:
+        tpl.render(data={"age": 30})
+    exc: BaseException | None = exc_info.value
+    while exc is not None and not isinstance(exc, HTTPError):
+        exc = exc.__context__
+    assert isinstance(exc, HTTPError)
+    assert exc.code == HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@pytest.mark.parametrize("transport", [PooledTransport(), UrllibTransport()])
+def test_user_agent(
+    tmp_path: Path,
+    http_server_factory: HTTPServerFactory,
+    transport: Transport,
+) -> None:
+    """Test that requests have a default `User-Agent` header."""
+    build_file_tree({(tmp_path / "schema.json"): serialize(SCHEMA, "json")})
+    user_agents: list[str | None] = []
+
+    class _Handler(SimpleHTTPRequestHandler):
+        def send_head(self) -> Any:
+            user_agents.append(self.headers.get("User-Agent"))
+            return super().send_head()
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    url = http_server_factory(tmp_path, _Handler)
+    user_agents.clear()
+
+    assert transport.fetch(f"{url}/schema.json", {}).status == HTTPStatus.OK
+    assert (
+        transport.fetch(
+            f"{url}/schema.json",
+            {"user-agent": "custom"},
+        ).status
+        == HTTPStatus.OK
+    )
+    assert user_agents[0] is not None
+    assert user_agents[0].startswith("jinja2-jsonschema")
+    assert user_agents[1] == "custom"
+
+
+def test_default_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the default timeout of new sockets applies unless one is given."""
+    monkeypatch.setattr(socket, "getdefaulttimeout", lambda: 5.0)
+
+    connection, _ = PooledTransport()._checkout("http", "example.com")  # noqa: SLF001
+    assert connection.timeout == 5.0  # noqa: PLR2004
+    connection, _ = PooledTransport(timeout=1.0)._checkout("http", "example.com")  # noqa: SLF001
+    assert connection.timeout == 1.0
@@ -0,0 +1,62 @@
+"""Tests for validating many data items against one schema."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from unittest.mock import patch
+
+from jsonschema import Draft7Validator
+from jsonschema import ValidationError
+
+from tests.utils import SCHEMA
+from tests.utils import create_env
+from tests.utils import get_extension
+
+DATA = [{"age": 30}, {"age": -1}, {"age": 40}, {"age": -2}]
+
+
+def test_filter() -> None:
+    """Test the `jsonschema_all` filter."""
+    env = create_env()
+    tpl = env.from_string(
+        "{% for result in data | jsonschema_all(schema) %}"
+        "{{ 'invalid' if result else 'valid' }},"
+        "{% endfor %}",
+    )
+
+    with patch.object(
+        Draft7Validator,
+        "check_schema",
+        wraps=Draft7Validator.check_schema,
+    ) as check_schema:
+        assert tpl.render(data=DATA, schema=SCHEMA) == "valid,invalid,valid,invalid,"
+
+    assert check_schema.call_count == 1
+
+
+def test_filter_fail_fast() -> None:
+    """Test the `jsonschema_all` filter stopping at the first failure."""
+    env = create_env()
+    tpl = env.from_string(
+        "{% for result in data | jsonschema_all(schema, fail_fast=true) %}"
+        "{{ 'invalid' if result else 'valid' }},"
+        "{% endfor %}",
+    )
+
+    assert tpl.render(data=DATA, schema=SCHEMA) == "valid,invalid,"
+
+
+def test_api() -> None:
+    """Test the Python API for validating many data items."""
+    extension = get_extension(create_env())
+
+    results = extension.validate_all(DATA, SCHEMA)
+    assert isinstance(results, list)
+    assert [bool(result) for result in results] == [False, True, False, True]
+    assert all(isinstance(result, ValidationError) for result in results[1::2])
+
+    results = extension.validate_all(iter(DATA), SCHEMA, lazy=True, fail_fast=True)
+    assert isinstance(results, Iterator)
+    assert next(results) == ""
+    assert isinstance(next(results), ValidationError)
+    assert next(results, None) is None
@@ -3,20 +3,25 @@
 from __future__ import annotations
 
 import json
+from contextlib import contextmanager
 from textwrap import dedent
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Literal
+from unittest.mock import patch
 
 import yaml
 from jinja2 import Environment
 from jinja2 import FileSystemLoader
 
 from jinja2_jsonschema import JsonSchemaExtension
+from jinja2_jsonschema.extension import _JsonSchemaFilter
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from collections.abc import Mapping
     from pathlib import Path
+    from unittest.mock import MagicMock
 
 SCHEMA = {
     "$schema": "http://json-schema.org/draft-07/schema#",
@@ -55,7 +60,11 @@ def serialize(
     )
 
 
-def create_env(templates_root: Path | None = None) -> Environment:
+def create_env(
+    templates_root: Path | None = None,
+    *,
+    enable_async: bool = False,
+) -> Environment:
     """Create a new Jinja2 test environment.
 
     The Jinja2 environment is pre-configured with the JSON Schema extension and
@@ -64,6 +73,8 @@ def create_env(templates_root: Path | None = None) -> Environment:
     Args:
         templates_root:
             The root path of the templates for the filesystem loader.
+        enable_async:
+            Whether to enable async mode.
 
     Returns:
         The Jinja2 environment.
@@ -71,9 +82,25 @@ def create_env(templates_root: Path | None = None) -> Environment:
     return Environment(
         loader=None if templates_root is None else FileSystemLoader(templates_root),
         extensions=[JsonSchemaExtension],
+        enable_async=enable_async,
     )
 
 
+def get_extension(env: Environment) -> JsonSchemaExtension:
+    """Get the JSON Schema extension of a Jinja2 environment.
+
+    Args:
+        env:
+            The Jinja2 environment.
+
+    Returns:
+        The JSON Schema extension.
+    """
+    extension = env.extensions[JsonSchemaExtension.identifier]
+    assert isinstance(extension, JsonSchemaExtension)
+    return extension
+
+
 def build_file_tree(spec: Mapping[Path, str]) -> None:
     """Build a file tree based on a specification.
 
@@ -85,3 +112,19 @@ def build_file_tree(spec: Mapping[Path, str]) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
         with path.open("w") as f:
             f.write(dedent(contents))
+
+
+@contextmanager
+def count_resolutions() -> Iterator[MagicMock]:
+    """Count how often schema files are resolved, whether retrieved or not.
+
+    Yields:
+        The mock of the filter's method resolving schema files.
+    """
+    with patch.object(
+        _JsonSchemaFilter,
+        "_resolve_schema",
+        autospec=True,
+        side_effect=_JsonSchemaFilter._resolve_schema,  # noqa: SLF001
+    ) as resolve_schema:
+        yield resolve_schema